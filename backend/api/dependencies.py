@@ -0,0 +1,37 @@
+"""
+Shared endpoint dependencies
+"""
+import math
+from fastapi import HTTPException, Request
+from services.admission import rate_limiter
+from config import settings
+
+
+def rate_limit(endpoint: str):
+    """
+    Build a dependency applying the per-client token bucket for an endpoint.
+
+    Clients are identified by their address. Request parameters such as
+    user_id are chosen by the caller, so keying on them would let a client
+    bypass the limit by rotating values. Behind a reverse proxy, run the
+    server with forwarded-header support so the address is the real client's.
+    """
+    async def dependency(request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        client = request.client.host if request.client else "unknown"
+        retry_after = rate_limiter.check(endpoint, client)
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "success": False,
+                    "error": {
+                        "code": "RATE_LIMITED",
+                        "message": f"Too many requests, retry in {math.ceil(retry_after)}s"
+                    }
+                },
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    return dependency
@@ -0,0 +1,170 @@
+"""
+Admin endpoints: sampling profiler control, startup report, search index refresh and recording storage
+"""
+import os
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from db.session import get_db
+from services.ml_base import MLInferenceService
+from services.ml_factory import get_ml_service
+from services.profiler import profiler
+from services.startup import startup_report
+from config import settings
+
+router = APIRouter()
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject requests without the configured admin token; disabled when unset"""
+    if not settings.ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(
+        x_admin_token, settings.ADMIN_TOKEN
+    ):
+        raise HTTPException(
+            status_code=403,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "FORBIDDEN",
+                    "message": "Admin token required"
+                }
+            }
+        )
+
+
+@router.post("/admin/profiler/start", response_model=dict, dependencies=[Depends(require_admin)])
+async def start_profiler(
+    interval_ms: int = Query(10, ge=1, le=1000),
+    duration_s: int = Query(30, ge=1)
+):
+    """
+    Start the sampling profiler.
+
+    Only the worker that handles this request is sampled; the returned
+    worker_pid identifies it. With several serve.py workers behind one
+    port, status, stop and download requests may land on another worker,
+    so repeat them until worker_pid matches.
+
+    Sampling stops automatically after duration_s, capped at
+    PROFILER_MAX_DURATION_SECONDS, so a forgotten run cannot linger.
+    """
+    duration = min(duration_s, settings.PROFILER_MAX_DURATION_SECONDS)
+    try:
+        profiler.start(interval=interval_ms / 1000, duration=duration)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "PROFILER_RUNNING",
+                    "message": str(e)
+                }
+            }
+        )
+
+    return {
+        "success": True,
+        "data": profiler.status(),
+        "message": f"Profiler started for up to {duration}s"
+    }
+
+
+@router.post("/admin/profiler/stop", response_model=dict, dependencies=[Depends(require_admin)])
+async def stop_profiler():
+    """Stop the sampling profiler of the worker handling this request"""
+    profiler.stop()
+
+    return {
+        "success": True,
+        "data": profiler.status(),
+        "message": "Profiler stopped"
+    }
+
+
+@router.get("/admin/profiler", response_model=dict, dependencies=[Depends(require_admin)])
+async def get_profiler_status():
+    """Get sampling profiler status of the worker handling this request"""
+    return {
+        "success": True,
+        "data": profiler.status()
+    }
+
+
+@router.get("/admin/profiler/profile", dependencies=[Depends(require_admin)])
+async def download_profile():
+    """
+    Download the collected profile in collapsed stack (flamegraph) format.
+
+    The profile covers only the worker handling this request, named in
+    the X-Profiler-Worker header and the file name.
+    """
+    pid = os.getpid()
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{pid}.folded"',
+            "X-Profiler-Worker": str(pid)
+        }
+    )
+
+
+@router.get("/admin/startup", response_model=dict, dependencies=[Depends(require_admin)])
+async def get_startup_report():
+    """
+    Get startup timings: import, warm-up steps and first request latency.
+
+    Per-module import costs are included when the server was started
+    with STARTUP_IMPORT_TIMING=1.
+    """
+    return {
+        "success": True,
+        "data": startup_report.as_dict()
+    }
+
+
+@router.post("/admin/embeddings/refresh", response_model=dict, dependencies=[Depends(require_admin)])
+async def refresh_embedding_index(
+    db: Session = Depends(get_db),
+    ml_service: MLInferenceService = Depends(get_ml_service)
+):
+    """Embed new and changed lessons now instead of waiting for the periodic refresh"""
+    from services.embedding_index import embedding_index
+
+    counts = await embedding_index.refresh(db, ml_service)
+
+    return {
+        "success": True,
+        "data": {**counts, "passages": len(embedding_index)},
+        "message": "Embedding index refreshed"
+    }
+
+
+@router.get("/admin/storage", response_model=dict, dependencies=[Depends(require_admin)])
+def get_recording_storage(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Recording storage per tier, with the users storing the most bytes"""
+    from services.recording_store import recording_store
+
+    return {
+        "success": True,
+        "data": recording_store.totals(db, limit)
+    }
+
+
+@router.post("/admin/storage/maintain", response_model=dict, dependencies=[Depends(require_admin)])
+def maintain_recording_storage(db: Session = Depends(get_db)):
+    """Run a recording transcode/purge cycle now instead of waiting for the periodic one"""
+    from services.recording_store import recording_store
+
+    counts = recording_store.maintain(db)
+
+    return {
+        "success": True,
+        "data": counts,
+        "message": "Recording maintenance finished"
+    }
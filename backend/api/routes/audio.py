@@ -0,0 +1,72 @@
+"""
+Audio endpoints
+"""
+from typing import Optional
+from urllib.parse import quote
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
+from services.audio_store import audio_store
+from config import settings
+
+router = APIRouter()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+@router.api_route("/audio/{audio_path:path}", methods=["GET", "HEAD"])
+def get_audio(
+    audio_path: str,
+    request: Request,
+    v: Optional[str] = Query(None, description="Content hash from the audio URL")
+):
+    """
+    Stream an audio file.
+
+    Supports Range requests (206 Partial Content) for seeking and
+    conditional requests via the content-hash ETag. URLs carrying the
+    current hash (?v=...) are cacheable for AUDIO_CACHE_MAX_AGE.
+
+    The file is never read into memory: it is sent with the server's
+    pathsend extension where available, in fixed-size chunks otherwise,
+    or by nginx (sendfile) when AUDIO_ACCEL_REDIRECT_PREFIX is set.
+    """
+    path = audio_store.resolve(audio_path)
+    if path is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "AUDIO_NOT_FOUND",
+                    "message": f"Audio file {audio_path} not found"
+                }
+            }
+        )
+
+    stat_result = path.stat()
+    content_hash = audio_store.content_hash(path, stat_result)
+    etag = f'"{content_hash}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": (
+            f"public, max-age={settings.AUDIO_CACHE_MAX_AGE}, immutable"
+            if v == content_hash else "public, no-cache"
+        ),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    media_type = audio_store.media_type(path)
+
+    if settings.AUDIO_ACCEL_REDIRECT_PREFIX:
+        relative = path.relative_to(audio_store.root).as_posix()
+        headers["X-Accel-Redirect"] = settings.AUDIO_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(relative)
+        return Response(headers=headers, media_type=media_type)
+
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
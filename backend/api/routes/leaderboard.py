@@ -0,0 +1,104 @@
+"""
+Leaderboard and cohort stats endpoints
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy.orm import Session
+from db.session import get_db
+from models.database import User
+from models.schemas import (
+    LeaderboardEntry,
+    LeaderboardResponse,
+    LeaderboardRankResponse,
+    CohortStatsResponse,
+)
+from services.leaderboard import leaderboards, METRICS
+
+router = APIRouter()
+
+METRIC_PATTERN = "^(" + "|".join(METRICS) + ")$"
+COHORT_PATTERN = "^(beginner|intermediate|advanced)$"
+
+
+@router.get("/leaderboards/{metric}", response_model=dict)
+def get_leaderboard(
+    metric: str = Path(..., pattern=METRIC_PATTERN),
+    cohort: Optional[str] = Query(None, pattern=COHORT_PATTERN),
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Top-N users for a metric, globally or within a level cohort"""
+    board = leaderboards.board(metric, cohort)
+    top = board.top(limit, offset)
+
+    usernames = dict(
+        db.query(User.id, User.username)
+        .filter(User.id.in_([user_id for user_id, _ in top]))
+        .all()
+    ) if top else {}
+
+    entries = [
+        LeaderboardEntry(
+            rank=board.rank(user_id),
+            user_id=user_id,
+            username=usernames.get(user_id),
+            value=value
+        )
+        for user_id, value in top
+    ]
+
+    return {
+        "success": True,
+        "data": LeaderboardResponse(
+            metric=metric, cohort=cohort, total=len(board), entries=entries
+        ).model_dump()
+    }
+
+
+@router.get("/leaderboards/{metric}/rank", response_model=dict)
+async def get_user_rank(
+    metric: str = Path(..., pattern=METRIC_PATTERN),
+    user_id: int = Query(...),
+    cohort: Optional[str] = Query(None, pattern=COHORT_PATTERN)
+):
+    """A user's rank and value for a metric"""
+    board = leaderboards.board(metric, cohort)
+    rank = board.rank(user_id)
+    if rank is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "USER_NOT_RANKED",
+                    "message": f"User with ID {user_id} has no leaderboard entry"
+                }
+            }
+        )
+
+    return {
+        "success": True,
+        "data": LeaderboardRankResponse(
+            metric=metric,
+            cohort=cohort,
+            user_id=user_id,
+            rank=rank,
+            value=board.score(user_id),
+            total=len(board)
+        ).model_dump()
+    }
+
+
+@router.get("/leaderboards/{metric}/stats", response_model=dict)
+async def get_cohort_stats(
+    metric: str = Path(..., pattern=METRIC_PATTERN),
+    cohort: Optional[str] = Query(None, pattern=COHORT_PATTERN)
+):
+    """Distribution of a metric across all users or a level cohort"""
+    summary = leaderboards.board(metric, cohort).summary()
+
+    return {
+        "success": True,
+        "data": CohortStatsResponse(metric=metric, cohort=cohort, **summary).model_dump()
+    }
@@ -0,0 +1,137 @@
+"""
+Progress and library endpoints
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from db.session import get_db
+from models.database import User
+from models.schemas import (
+    UserProgressCreate,
+    UserProgressResponse,
+    UserStatsResponse,
+    LessonResponse,
+    LibraryBookResponse,
+    LibraryResponse,
+)
+from services.progress_service import ProgressService
+
+router = APIRouter()
+
+
+@router.get("/progress/current", response_model=dict)
+def get_current_book(
+    user_id: int = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Get the book user is currently reading"""
+    service = ProgressService(db)
+    progress = service.get_current_progress(user_id)
+
+    if not progress:
+        return {
+            "success": True,
+            "data": None,
+            "message": "No book in progress"
+        }
+
+    return {
+        "success": True,
+        "data": UserProgressResponse.model_validate(progress).model_dump()
+    }
+
+
+@router.post("/progress", response_model=dict)
+def update_progress(
+    progress: UserProgressCreate,
+    db: Session = Depends(get_db)
+):
+    """Create or update reading progress (upsert)"""
+    service = ProgressService(db)
+    updated_progress = service.upsert_progress(progress)
+
+    return {
+        "success": True,
+        "data": UserProgressResponse.model_validate(updated_progress).model_dump(),
+        "message": "Progress updated successfully"
+    }
+
+
+@router.get("/progress/summary", response_model=dict)
+def get_progress_summary(
+    user_id: int = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Get precomputed totals: books completed, time spent, words mastered, streaks"""
+    if db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "USER_NOT_FOUND",
+                    "message": f"User with ID {user_id} not found"
+                }
+            }
+        )
+
+    service = ProgressService(db)
+    stats = service.get_summary(user_id)
+
+    return {
+        "success": True,
+        "data": UserStatsResponse.model_validate(stats).model_dump()
+    }
+
+
+@router.get("/library", response_model=dict)
+def get_library(
+    user_id: int = Query(...),
+    level: Optional[str] = Query(None, pattern="^(beginner|intermediate|advanced)$"),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the library with the user's progress on each book.
+
+    Returns everything the library screen needs in one round-trip:
+    books with progress, the current book and the user's summary.
+    """
+    if db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "USER_NOT_FOUND",
+                    "message": f"User with ID {user_id} not found"
+                }
+            }
+        )
+
+    service = ProgressService(db)
+    rows = service.get_library(user_id, level=level, limit=limit, offset=offset)
+
+    books = []
+    current = None
+    for lesson, progress in rows:
+        book = LibraryBookResponse(
+            **LessonResponse.model_validate(lesson).model_dump(),
+            progress=UserProgressResponse.model_validate(progress) if progress else None
+        )
+        books.append(book)
+        if progress and progress.status == "in_progress":
+            if current is None or progress.last_accessed > current.last_accessed:
+                current = progress
+
+    library = LibraryResponse(
+        books=books,
+        current_lesson_id=current.lesson_id if current else None,
+        summary=UserStatsResponse.model_validate(service.get_summary(user_id))
+    )
+
+    return {
+        "success": True,
+        "data": library.model_dump()
+    }
@@ -0,0 +1,44 @@
+"""
+Book recommendation endpoints
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from db.session import get_db
+from models.database import User
+from models.schemas import RecommendationEntry, RecommendationsResponse
+from services.recommender import recommender
+
+router = APIRouter()
+
+
+@router.get("/recommendations", response_model=dict)
+def get_recommendations(
+    user_id: int = Query(...),
+    limit: int = Query(10, ge=1, le=50),
+    level: Optional[str] = Query(None, pattern="^(beginner|intermediate|advanced)$"),
+    db: Session = Depends(get_db)
+):
+    """Next books for a user, closest to the target share of already-known words first"""
+    if db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "USER_NOT_FOUND",
+                    "message": f"User with ID {user_id} not found"
+                }
+            }
+        )
+
+    results = recommender.recommend(db, user_id, limit, level)
+
+    return {
+        "success": True,
+        "data": RecommendationsResponse(
+            user_id=user_id,
+            target_coverage=recommender.target_coverage,
+            recommendations=[RecommendationEntry(**entry) for entry in results]
+        ).model_dump()
+    }
@@ -0,0 +1,207 @@
+"""
+Pronunciation recording endpoints
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from db.session import get_db
+from models.database import PronunciationRecording, User, VocabularyItem
+from models.schemas import RecordingResponse, RecordingUsageResponse
+from services.audio_store import audio_store, MEDIA_TYPES
+from services.recording_store import recording_store, TIER_HOT, TIER_MISSING, TIER_PURGED
+from config import settings
+
+router = APIRouter()
+
+EXTENSIONS = {
+    **{media_type: extension for extension, media_type in MEDIA_TYPES.items()},
+    "audio/x-wav": ".wav",
+    "audio/wave": ".wav",
+    "audio/mp3": ".mp3",
+    "audio/x-m4a": ".m4a",
+    "audio/opus": ".ogg",
+}
+
+
+def _audio_url(recording: PronunciationRecording) -> Optional[str]:
+    """Versioned URL from the hash stored with the file; never touches the disk"""
+    storage = recording.storage
+    if storage is None:
+        # Not adopted yet: no hash, so the URL is served uncached
+        path = recording.audio_path
+        return path if not path or "://" in path or path.startswith("/") else audio_store.url(path)
+    if storage.tier in (TIER_PURGED, TIER_MISSING):
+        return None
+    return audio_store.url(recording.audio_path, storage.content_hash)
+
+
+def _to_response(recording: PronunciationRecording) -> RecordingResponse:
+    storage = recording.storage
+    tier = storage.tier if storage else TIER_HOT
+    return RecordingResponse(
+        id=recording.id,
+        user_id=recording.user_id,
+        vocabulary_id=recording.vocabulary_id,
+        audio_url=_audio_url(recording),
+        storage_tier=tier,
+        size_bytes=storage.size_bytes if storage else 0,
+        transcription=recording.transcription,
+        accuracy_score=recording.accuracy_score,
+        created_at=recording.created_at
+    )
+
+
+def _check_owner(db: Session, user_id: int, vocabulary_id: Optional[int]):
+    """Raise 404 if the user or vocabulary item does not exist"""
+    if db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "USER_NOT_FOUND",
+                    "message": f"User with ID {user_id} not found"
+                }
+            }
+        )
+    if vocabulary_id is not None and db.get(VocabularyItem, vocabulary_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "VOCABULARY_NOT_FOUND",
+                    "message": f"Vocabulary item with ID {vocabulary_id} not found"
+                }
+            }
+        )
+
+
+@router.post("/recordings", response_model=dict, status_code=201)
+async def upload_recording(
+    request: Request,
+    user_id: int = Query(...),
+    vocabulary_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload a pronunciation recording.
+
+    The request body is the raw audio, with its format in Content-Type
+    (audio/wav, audio/mpeg, audio/mp4 or audio/ogg). It is streamed to
+    disk, so uploads up to MAX_UPLOAD_SIZE are never held in memory.
+    Database work and file writes run in the threadpool.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    extension = EXTENSIONS.get(content_type)
+    if extension is None or extension not in recording_store.allowed_formats:
+        raise HTTPException(
+            status_code=415,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "UNSUPPORTED_AUDIO_FORMAT",
+                    "message": f"Unsupported audio format: {content_type or 'none'}"
+                }
+            }
+        )
+
+    declared_size = request.headers.get("content-length")
+    too_large = HTTPException(
+        status_code=413,
+        detail={
+            "success": False,
+            "error": {
+                "code": "UPLOAD_TOO_LARGE",
+                "message": f"Recordings are limited to {settings.MAX_UPLOAD_SIZE} bytes"
+            }
+        }
+    )
+    if declared_size and declared_size.isdigit() and int(declared_size) > settings.MAX_UPLOAD_SIZE:
+        raise too_large
+
+    await run_in_threadpool(_check_owner, db, user_id, vocabulary_id)
+
+    upload = await run_in_threadpool(recording_store.incoming_path)
+    try:
+        size = 0
+        f = await run_in_threadpool(open, upload, "wb")
+        try:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > settings.MAX_UPLOAD_SIZE:
+                    raise too_large
+                await run_in_threadpool(f.write, chunk)
+        finally:
+            await run_in_threadpool(f.close)
+        if size == 0:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "success": False,
+                    "error": {
+                        "code": "EMPTY_UPLOAD",
+                        "message": "The request body is empty"
+                    }
+                }
+            )
+        recording = await run_in_threadpool(recording_store.save, db, user_id, upload, extension, vocabulary_id)
+        response = await run_in_threadpool(_to_response, recording)
+    finally:
+        await run_in_threadpool(upload.unlink, missing_ok=True)
+
+    return {
+        "success": True,
+        "data": response.model_dump(),
+        "message": "Recording uploaded"
+    }
+
+
+@router.get("/recordings/usage", response_model=dict)
+def get_recording_usage(
+    user_id: int = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Recordings and bytes a user has stored, per storage tier"""
+    if db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "USER_NOT_FOUND",
+                    "message": f"User with ID {user_id} not found"
+                }
+            }
+        )
+
+    return {
+        "success": True,
+        "data": RecordingUsageResponse(user_id=user_id, **recording_store.usage(db, user_id)).model_dump()
+    }
+
+
+@router.get("/recordings/{recording_id}", response_model=dict)
+def get_recording(
+    recording_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get a recording with its audio URL, storage tier and analysis"""
+    recording = db.get(PronunciationRecording, recording_id)
+    if recording is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "RECORDING_NOT_FOUND",
+                    "message": f"Recording with ID {recording_id} not found"
+                }
+            }
+        )
+
+    return {
+        "success": True,
+        "data": _to_response(recording).model_dump()
+    }
@@ -0,0 +1,125 @@
+"""
+Semantic search endpoints
+"""
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from api.dependencies import rate_limit
+from db.session import get_db
+from models.database import Lesson, VocabularyItem
+from models.schemas import PassageMatch, PassageSearchResponse
+from services.embedding_index import embedding_index, lesson_text, source_version, KINDS, KIND_LESSON
+from services.ml_base import MLInferenceService
+from services.ml_factory import get_ml_service
+
+router = APIRouter()
+
+
+def _hydrate(db: Session, hits):
+    """
+    Attach titles and passage text.
+
+    Hits whose source is gone, or was edited after it was embedded (so
+    the stored offsets no longer fit its text), are dropped.
+    """
+    lesson_ids = [hit["source_id"] for hit in hits if hit["kind"] == "lesson"]
+    item_ids = [hit["source_id"] for hit in hits if hit["kind"] == "vocabulary"]
+    lessons = {
+        lesson.id: (lesson.title, lesson_text(lesson.title, lesson.description, lesson.content), source_version(lesson.updated_at))
+        for lesson in db.query(Lesson).filter(Lesson.id.in_(lesson_ids))
+    } if lesson_ids else {}
+    items = {
+        item.id: (item.word, item.example_sentence or "", source_version(item.example_sentence or ""))
+        for item in db.query(VocabularyItem).filter(VocabularyItem.id.in_(item_ids))
+    } if item_ids else {}
+
+    matches = []
+    for hit in hits:
+        source = (lessons if hit["kind"] == "lesson" else items).get(hit["source_id"])
+        if source is None:
+            continue
+        title, text, version = source
+        hit = dict(hit)
+        if hit.pop("version") != version:
+            continue
+        matches.append(PassageMatch(title=title, text=text[hit["start"]:hit["end"]], **hit))
+    return matches
+
+
+@router.get("/search/passages", response_model=dict, dependencies=[Depends(rate_limit("search_passages"))])
+async def search_passages(
+    q: Optional[str] = Query(None, min_length=1, max_length=2000),
+    lesson_id: Optional[int] = Query(None),
+    kind: Optional[str] = Query(None, pattern="^(lesson|vocabulary)$"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    ml_service: MLInferenceService = Depends(get_ml_service)
+):
+    """
+    Find passages similar to a text (q) or to a whole lesson (lesson_id).
+
+    Lesson passages and vocabulary example sentences are ranked by
+    cosine similarity of their embeddings; lesson_id queries skip the
+    lesson's own passages.
+    """
+    if (q is None) == (lesson_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "INVALID_QUERY",
+                    "message": "Pass exactly one of q or lesson_id"
+                }
+            }
+        )
+
+    hits = None
+    unavailable = "The search index has not been built yet"
+    try:
+        await asyncio.to_thread(embedding_index.load)
+        if embedding_index.is_built:
+            exclude = None
+            if q is not None:
+                result = await ml_service.embed([q])
+                query = result["embeddings"][0]
+            else:
+                query = embedding_index.source_vector(KIND_LESSON, lesson_id)
+                if query is None:
+                    raise HTTPException(
+                        status_code=404,
+                        detail={
+                            "success": False,
+                            "error": {
+                                "code": "LESSON_NOT_INDEXED",
+                                "message": f"Lesson with ID {lesson_id} is not in the search index"
+                            }
+                        }
+                    )
+                exclude = (KIND_LESSON, lesson_id)
+            hits = await asyncio.to_thread(
+                embedding_index.search, query, limit, KINDS.index(kind) if kind else None, exclude
+            )
+    except ValueError as e:
+        # The index was built with a different text model and is being rebuilt
+        unavailable = str(e)
+
+    if hits is None:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "SEARCH_INDEX_UNAVAILABLE",
+                    "message": unavailable
+                }
+            }
+        )
+
+    return {
+        "success": True,
+        "data": PassageSearchResponse(
+            query=q, lesson_id=lesson_id, results=await asyncio.to_thread(_hydrate, db, hits)
+        ).model_dump()
+    }
@@ -0,0 +1,92 @@
+"""
+Delta sync endpoints for offline-capable clients
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from db.session import get_db
+from models.schemas import (
+    LessonResponse,
+    VocabularyItemResponse,
+    UserProgressResponse,
+    VocabularyPracticeResponse,
+    SyncResponse,
+    ProgressUploadRequest,
+    ProgressUploadResponse,
+)
+from services.progress_service import ProgressService
+from services.sync_service import SyncService
+
+router = APIRouter()
+
+
+@router.get("/sync", response_model=dict)
+def sync(
+    user_id: int = Query(...),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous sync"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get lessons, vocabulary and the user's progress changed since a cursor.
+
+    Without a cursor everything is returned (full sync). Store the
+    returned cursor and send it on the next call to receive only changes;
+    lessons deactivated in between are listed in deleted_lesson_ids.
+
+    Large syncs are split into pages of up to SYNC_PAGE_SIZE rows per
+    kind: while has_more is true, call again with the returned cursor.
+    """
+    service = SyncService(db)
+    try:
+        changes = service.changes(user_id, cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "INVALID_CURSOR",
+                    "message": str(e)
+                }
+            }
+        )
+
+    response = SyncResponse(
+        cursor=changes["cursor"],
+        full=changes["full"],
+        has_more=changes["has_more"],
+        lessons=[LessonResponse.model_validate(lesson) for lesson in changes["lessons"]],
+        deleted_lesson_ids=changes["deleted_lesson_ids"],
+        vocabulary=[VocabularyItemResponse.model_validate(item) for item in changes["vocabulary"]],
+        progress=[UserProgressResponse.model_validate(progress) for progress in changes["progress"]],
+        practice=[VocabularyPracticeResponse.model_validate(practice) for practice in changes["practice"]],
+    )
+
+    return {
+        "success": True,
+        "data": response.model_dump()
+    }
+
+
+@router.post("/sync/progress", response_model=dict)
+def upload_progress(
+    upload: ProgressUploadRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Upload progress recorded while offline, in one batch.
+
+    Each update carries the device time it was made; updates older than
+    the server's copy are skipped (last writer wins).
+    """
+    service = ProgressService(db)
+    applied, skipped = service.upload_offline_progress(upload.user_id, upload.progress)
+
+    return {
+        "success": True,
+        "data": ProgressUploadResponse(
+            applied=[UserProgressResponse.model_validate(progress) for progress in applied],
+            skipped_lesson_ids=skipped
+        ).model_dump(),
+        "message": f"Applied {len(applied)} of {len(upload.progress)} progress updates"
+    }
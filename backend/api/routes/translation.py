@@ -0,0 +1,49 @@
+"""
+Translation endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from api.dependencies import rate_limit
+from db.session import get_db
+from models.schemas import ChapterTranslationRequest, ChapterTranslationResponse
+from services.document_translation import DocumentTranslationService
+from services.ml_base import MLInferenceService
+from services.ml_factory import get_ml_service
+from services.translation_router import UnsupportedLanguagePairError
+
+router = APIRouter()
+
+
+@router.post("/translation/chapter", response_model=dict, dependencies=[Depends(rate_limit("translate_chapter"))])
+async def translate_chapter(
+    request: ChapterTranslationRequest,
+    db: Session = Depends(get_db),
+    ml_service: MLInferenceService = Depends(get_ml_service)
+):
+    """
+    Translate a whole chapter for parallel-text reading.
+
+    The text is translated sentence by sentence; each segment maps a
+    source sentence to its translation by character offsets. Sentences
+    translated before (in any chapter) are served from the cache, so
+    re-translating an edited chapter only translates what changed.
+    """
+    service = DocumentTranslationService(db)
+    try:
+        result = await service.translate(request.text, ml_service, request.source_lang, request.target_lang)
+    except UnsupportedLanguagePairError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "UNSUPPORTED_LANGUAGE_PAIR",
+                    "message": str(e)
+                }
+            }
+        )
+
+    return {
+        "success": True,
+        "data": ChapterTranslationResponse(**result).model_dump()
+    }
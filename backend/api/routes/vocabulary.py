@@ -0,0 +1,67 @@
+"""
+Vocabulary endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from api.dependencies import rate_limit
+from db.session import get_db
+from models.schemas import VocabularyLookupResponse, VocabularyPracticeCreate, VocabularyPracticeResponse
+from services.ml_base import MLInferenceService
+from services.ml_factory import get_ml_service
+from services.translation_router import UnsupportedLanguagePairError
+from services.vocabulary_service import VocabularyService
+from config import settings
+
+router = APIRouter()
+
+
+@router.get("/vocabulary/lookup", response_model=dict, dependencies=[Depends(rate_limit("vocabulary_lookup"))])
+async def lookup_word(
+    word: str = Query(..., min_length=1, max_length=100),
+    source_lang: str = Query(settings.VOCABULARY_SOURCE_LANG, min_length=2, max_length=10),
+    target_lang: str = Query(settings.VOCABULARY_TRANSLATION_LANG, min_length=2, max_length=10),
+    db: Session = Depends(get_db),
+    ml_service: MLInferenceService = Depends(get_ml_service)
+):
+    """
+    Translate a word tapped while reading.
+
+    Served from the in-memory vocabulary index when possible, falling
+    back to the translation cache and then the ML service. Rate limited
+    per client address; 503 with Retry-After when the translation model is overloaded.
+    """
+    service = VocabularyService(db)
+    try:
+        result = await service.lookup(word, ml_service, source_lang, target_lang)
+    except UnsupportedLanguagePairError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "UNSUPPORTED_LANGUAGE_PAIR",
+                    "message": str(e)
+                }
+            }
+        )
+
+    return {
+        "success": True,
+        "data": VocabularyLookupResponse(**result).model_dump()
+    }
+
+
+@router.post("/vocabulary/practice", response_model=dict)
+def record_practice(
+    practice: VocabularyPracticeCreate,
+    db: Session = Depends(get_db)
+):
+    """Record a vocabulary practice attempt"""
+    service = VocabularyService(db)
+    result = service.record_practice(practice)
+
+    return {
+        "success": True,
+        "data": VocabularyPracticeResponse.model_validate(result).model_dump(),
+        "message": "Practice recorded successfully"
+    }
@@ -2,7 +2,7 @@
 Application configuration management
 """
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -26,17 +26,100 @@ class Settings(BaseSettings):
     HF_HOME: str = "./data/models"
     HF_OFFLINE: bool = False
     HF_API_TOKEN: Optional[str] = None  # Optional: for private models or higher rate limits
-    INFERENCE_MODE: str = "api"  # "api" or "local"
+    INFERENCE_MODE: str = "api"  # "api", "local" or "stub" (canned results, for load tests)
+    STUB_LATENCY_MS: int = 50  # Simulated model latency in stub mode
 
     # Models
     WHISPER_MODEL: str = "openai/whisper-base"
     TRANSLATION_MODEL_PREFIX: str = "Helsinki-NLP/opus-mt"
     TEXT_MODEL: str = "distilbert-base-uncased"
 
+    # Translation routing (see services/translation_router.py)
+    TRANSLATION_DIRECT_PAIRS: List[str] = [
+        "en-pl", "pl-en", "en-de", "de-en", "en-es", "es-en", "en-fr", "fr-en",
+        "en-it", "it-en", "en-ru", "ru-en", "en-uk", "uk-en", "en-zh", "zh-en",
+    ]
+    TRANSLATION_MODEL_OVERRIDES: Dict[str, str] = {}  # "src-tgt" -> model name outside the prefix scheme
+    TRANSLATION_PIVOT_LANG: str = "en"
+    TRANSLATION_MULTILINGUAL_MODEL: Optional[str] = None  # e.g. facebook/m2m100_418M
+    TRANSLATION_MULTILINGUAL_LANGS: List[str] = []  # Languages it covers; empty means all
+    MAX_LOADED_TRANSLATION_MODELS: int = 4  # Local mode: least recently used models are unloaded
+
+    # Vocabulary lookup
+    VOCABULARY_SOURCE_LANG: str = "en"  # Language of VocabularyItem.word
+    VOCABULARY_TRANSLATION_LANG: str = "pl"  # Language of VocabularyItem.translation
+    VOCAB_INDEX_REFRESH_SECONDS: int = 60  # Incremental index refresh interval; 0 disables the periodic refresh
+    TRANSLATION_CACHE_SIZE: int = 10000  # Max cached translations kept in memory
+
+    # Chapter translation
+    DOC_TRANSLATION_BATCH_SIZE: int = 16  # Sentences per model call
+    DOC_TRANSLATION_CONCURRENCY: int = 4  # Concurrent API calls within a batch
+    DOC_MAX_SENTENCE_CHARS: int = 400  # Longer sentences are split to stay under the model's input limit
+    SENTENCE_CACHE_SIZE: int = 20000  # Sentence translations kept in memory (all are also stored in the DB)
+
+    # Book recommendations
+    RECOMMEND_TARGET_COVERAGE: float = 0.7  # Share of a book's words the learner should already know
+    RECOMMEND_CACHE_SIZE: int = 10000  # Max users with cached recommendations
+    RECOMMEND_CACHE_SECONDS: int = 300  # Max age of cached recommendations
+    RECOMMEND_INDEX_REFRESH_SECONDS: int = 300  # Background check for changed lessons/vocabulary; 0 disables
+
+    # Semantic search (embeddings of lesson passages and example sentences from TEXT_MODEL)
+    EMBEDDING_INDEX_DIR: str = "./data/embeddings"
+    EMBEDDING_BATCH_SIZE: int = 32  # Texts per embed call
+    EMBEDDING_CONCURRENCY: int = 4  # Concurrent API calls within a batch
+    EMBEDDING_PASSAGE_CHARS: int = 600  # Lesson content is split into passages of about this size
+    EMBEDDING_REFRESH_SECONDS: int = 300  # Interval for embedding new/changed lessons; 0 disables
+    EMBEDDING_ANN_MIN_ROWS: int = 50000  # Use the approximate (IVF) index from this many passages
+    EMBEDDING_ANN_LISTS: int = 0  # IVF clusters; 0 means sqrt(passages)
+    EMBEDDING_ANN_PROBES: int = 8  # Clusters searched per query
+
+    # Admission control for inference
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 60  # Sustained requests per client address per inference endpoint
+    RATE_LIMIT_BURST: int = 20  # Requests allowed at once before limiting kicks in
+    RATE_LIMIT_ENDPOINTS: Dict[str, int] = {}  # Per-endpoint per-minute overrides, e.g. {"vocabulary_lookup": 120}; 0 blocks
+    RATE_LIMIT_MAX_KEYS: int = 100000  # Max tracked (endpoint, client address) buckets per worker
+    ADMISSION_CONTROL_ENABLED: bool = True
+    MODEL_MAX_CONCURRENCY: int = 4  # Concurrent inference calls per model
+    MODEL_MAX_QUEUE: int = 32  # Calls allowed to wait per model
+    MODEL_QUEUE_TARGET_MS: int = 2000  # Shed load once the expected queue wait exceeds this
+
+    # Observability
+    METRICS_ENABLED: bool = False  # Expose /metrics and install instrumentation
+    TRACING_ENABLED: bool = False  # Log span breakdowns for slow requests
+    SLOW_REQUEST_THRESHOLD_MS: int = 500
+    PROFILER_MAX_DURATION_SECONDS: int = 120  # Sampling profiler auto-stops after this
+    ADMIN_TOKEN: Optional[str] = None  # Required in X-Admin-Token for /admin endpoints; unset disables them
+
+    # Startup
+    WARMUP_ML_SERVICE: bool = True  # Create the ML service in the background warm-up
+    WARMUP_RETRY_MAX_SECONDS: int = 60  # Longest wait between retries of a failed warm-up step
+
+    # Serving (see serve.py)
+    WORKERS: int = 1
+    PRELOAD_MODELS: List[str] = []  # "task:model" pipelines loaded once before forking workers
+    TORCH_THREADS_PER_WORKER: int = 1
+    MEMORY_REPORT_SECONDS: int = 300  # Interval for logging per-worker memory; 0 disables
+    LEADERBOARD_SYNC_SECONDS: int = 30  # Apply other workers' stats changes; 0 disables
+
+    # Sync
+    SYNC_CURSOR_OVERLAP_SECONDS: int = 5  # Re-send rows this close to the cursor to cover in-flight commits
+    SYNC_PAGE_SIZE: int = 1000  # Rows per kind in one sync response; larger syncs continue with has_more
+
     # File Storage
     UPLOAD_DIR: str = "./data/audio"
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
     ALLOWED_AUDIO_FORMATS: List[str] = [".wav", ".mp3", ".m4a", ".ogg"]
+    AUDIO_CACHE_MAX_AGE: int = 31536000  # Cache lifetime for content-hashed audio URLs (1 year)
+    AUDIO_ACCEL_REDIRECT_PREFIX: Optional[str] = None  # e.g. "/protected-audio/" to let nginx send files
+
+    # Pronunciation recordings (see services/recording_store.py)
+    RECORDING_COLD_AFTER_DAYS: int = 30  # Transcode recordings to Opus after this many days; 0 disables
+    RECORDING_COLD_BITRATE: str = "24k"  # Opus bitrate for cold recordings (speech stays intelligible at 16k+)
+    RECORDING_RETENTION_DAYS: int = 365  # Delete audio older than this, keeping transcription and scores; 0 keeps forever
+    RECORDING_MAINTENANCE_SECONDS: int = 3600  # Interval for transcoding and purging; 0 disables
+    RECORDING_MAINTENANCE_BATCH: int = 200  # Recordings handled per step and cycle
+    FFMPEG_PATH: str = "ffmpeg"  # Transcoding is skipped when not found
 
     class Config:
         env_file = ".env"
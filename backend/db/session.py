@@ -1,7 +1,7 @@
 """
 Database session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from config import settings
 
@@ -25,5 +25,46 @@ Base = declarative_base()
 
 def init_db():
     """Initialize database - create all tables"""
-    from models.database import User, Lesson, VocabularyItem, UserProgress, VocabularyPractice, PronunciationRecording
+    from models.database import User, Lesson, VocabularyItem, UserProgress, VocabularyPractice, PronunciationRecording, RecordingStorage, UserStats, SentenceTranslation
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    with engine.begin() as conn:
+        # Vocabulary rows from before updated_at existed count as changed when created
+        conn.execute(text("UPDATE vocabulary_items SET updated_at = created_at WHERE updated_at IS NULL"))
+
+    # create_all skips indexes on tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _add_missing_columns():
+    """
+    Add columns introduced after a table was created.
+
+    create_all never alters existing tables. New columns must be nullable
+    or have a constant default, which fills the existing rows.
+    """
+    existing_tables = inspect(engine).get_table_names()
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    definition = f"{column.name} {column.type.compile(dialect=engine.dialect)}"
+                    if column.default is not None and column.default.is_scalar:
+                        definition += f" DEFAULT {int(column.default.arg) if isinstance(column.default.arg, bool) else repr(column.default.arg)}"
+                        if not column.nullable:
+                            definition += " NOT NULL"
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {definition}"))
+
+
+def get_db():
+    """FastAPI dependency that yields a database session"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,9 +1,174 @@
 """
 FastAPI application entry point
 """
-from fastapi import FastAPI
+from services.startup import startup_report, FirstRequestMiddleware  # First, so import timing covers everything
+import asyncio
+import logging
+import math
+import threading
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from config import settings
+from db.session import SessionLocal, engine, init_db
+from services.admission import OverloadedError
+from services.leaderboard import leaderboards
+from services.tracing import TracedJSONResponse
+from services.vocabulary_index import vocabulary_index
+
+logger = logging.getLogger(__name__)
+
+# Set on shutdown to stop a warm-up that is waiting to retry
+_warm_up_stopped = threading.Event()
+
+
+def warm_up():
+    """
+    Load everything that is not needed to answer /health.
+
+    Runs in a background thread after the server starts accepting
+    connections; /health/ready reports 503 until it finishes. A failing
+    step (e.g. the database is not reachable yet) is retried with
+    exponential backoff up to WARMUP_RETRY_MAX_SECONDS apart.
+    """
+    steps = [
+        ("init_db", init_db),
+        ("vocabulary_index", lambda: _with_session(vocabulary_index.build)),
+        ("leaderboards", lambda: _with_session(leaderboards.load)),
+    ]
+    from services.recommender import recommender
+    from services.embedding_index import embedding_index
+    steps.append(("recommender", lambda: _with_session(recommender.build)))
+    steps.append(("embedding_index", embedding_index.load))
+    if settings.WARMUP_ML_SERVICE:
+        from services.ml_factory import get_ml_service
+        steps.append(("ml_service", get_ml_service))
+
+    delay = 1.0
+    for name, step in steps:
+        while True:
+            start = time.perf_counter()
+            try:
+                step()
+                break
+            except Exception:
+                logger.exception(f"Warm-up step {name} failed, retrying in {delay:.0f}s")
+                if _warm_up_stopped.wait(delay):
+                    return
+                delay = min(delay * 2, max(settings.WARMUP_RETRY_MAX_SECONDS, 1))
+        startup_report.record_step(name, time.perf_counter() - start)
+
+    startup_report.warm = True
+    startup_report.mark("warm")
+    logger.info(f"Warm-up finished in {sum(startup_report.warmup_steps.values()):.2f}s")
+
+
+def _with_session(func):
+    db = SessionLocal()
+    try:
+        func(db)
+    finally:
+        db.close()
+
+
+async def sync_leaderboards():
+    """Periodically pick up stats written by other worker processes"""
+    while True:
+        await asyncio.sleep(settings.LEADERBOARD_SYNC_SECONDS)
+        try:
+            await asyncio.to_thread(_with_session, leaderboards.sync)
+        except Exception:
+            logger.exception("Leaderboard sync failed")
+
+
+async def refresh_vocabulary_index():
+    """Periodically pick up added, edited and deleted vocabulary items"""
+    while True:
+        await asyncio.sleep(settings.VOCAB_INDEX_REFRESH_SECONDS)
+        if not vocabulary_index.is_built:
+            continue  # Warm-up builds it
+        try:
+            await asyncio.to_thread(_with_session, vocabulary_index.refresh)
+        except Exception:
+            logger.exception("Vocabulary index refresh failed")
+
+
+async def refresh_recommender():
+    """Periodically rebuild the recommendation matrix when lessons or vocabulary change"""
+    from services.recommender import recommender
+
+    while True:
+        await asyncio.sleep(settings.RECOMMEND_INDEX_REFRESH_SECONDS)
+        if not recommender.is_built:
+            continue  # Warm-up builds it
+        try:
+            await asyncio.to_thread(_with_session, recommender.refresh)
+        except Exception:
+            logger.exception("Recommendation matrix refresh failed")
+
+
+async def refresh_embeddings():
+    """Periodically embed new and changed lessons for semantic search"""
+    from services.embedding_index import embedding_index
+    from services.ml_factory import get_ml_service
+
+    while True:
+        await asyncio.sleep(settings.EMBEDDING_REFRESH_SECONDS)
+        db = SessionLocal()
+        try:
+            await embedding_index.refresh(db, await asyncio.to_thread(get_ml_service))
+        except Exception:
+            logger.exception("Embedding index refresh failed")
+        finally:
+            db.close()
+
+
+async def maintain_recordings():
+    """Periodically transcode aging recordings and purge expired ones"""
+    from services.recording_store import recording_store
+
+    while True:
+        await asyncio.sleep(settings.RECORDING_MAINTENANCE_SECONDS)
+        try:
+            await asyncio.to_thread(_with_session, recording_store.maintain)
+        except Exception:
+            logger.exception("Recording maintenance failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start warm-up in the background so the server accepts requests immediately"""
+    startup_report.mark("lifespan_start")
+    # Workers forked by serve.py inherit an already warm state
+    warm_task = None if startup_report.warm else asyncio.create_task(asyncio.to_thread(warm_up))
+    sync_task = asyncio.create_task(sync_leaderboards()) if settings.LEADERBOARD_SYNC_SECONDS > 0 else None
+    vocab_task = (
+        asyncio.create_task(refresh_vocabulary_index()) if settings.VOCAB_INDEX_REFRESH_SECONDS > 0 else None
+    )
+    recommend_task = (
+        asyncio.create_task(refresh_recommender()) if settings.RECOMMEND_INDEX_REFRESH_SECONDS > 0 else None
+    )
+    embed_task = asyncio.create_task(refresh_embeddings()) if settings.EMBEDDING_REFRESH_SECONDS > 0 else None
+    recording_task = (
+        asyncio.create_task(maintain_recordings()) if settings.RECORDING_MAINTENANCE_SECONDS > 0 else None
+    )
+    yield
+    if sync_task:
+        sync_task.cancel()
+    if vocab_task:
+        vocab_task.cancel()
+    if recommend_task:
+        recommend_task.cancel()
+    if embed_task:
+        embed_task.cancel()
+    if recording_task:
+        recording_task.cancel()
+    if warm_task:
+        _warm_up_stopped.set()
+        await warm_task
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -12,8 +177,12 @@ app = FastAPI(
     debug=settings.DEBUG,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=TracedJSONResponse if settings.TRACING_ENABLED else JSONResponse,
 )
 
+app.add_middleware(FirstRequestMiddleware, report=startup_report)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +192,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics instrumentation is only installed when enabled
+if settings.METRICS_ENABLED:
+    from services import metrics
+    from services.translation_cache import translation_cache
+
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument_engine(engine)
+    metrics.registry.register(metrics.Gauge(
+        "translation_cache_hits", "Translation cache hits since start",
+        callback=lambda: translation_cache.hits
+    ))
+    metrics.registry.register(metrics.Gauge(
+        "translation_cache_misses", "Translation cache misses since start",
+        callback=lambda: translation_cache.misses
+    ))
+    metrics.registry.register(metrics.Gauge(
+        "translation_cache_entries", "Translations currently cached",
+        callback=lambda: len(translation_cache)
+    ))
+    metrics.registry.register(metrics.Gauge(
+        "vocabulary_index_keys", "Distinct words in the vocabulary index",
+        callback=lambda: len(vocabulary_index)
+    ))
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Prometheus scrape endpoint"""
+        return PlainTextResponse(
+            metrics.registry.expose(),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+# Slow-request tracing is only installed when enabled
+if settings.TRACING_ENABLED:
+    from services import tracing
+
+    app.add_middleware(tracing.TracingMiddleware, threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS)
+    tracing.instrument_engine(engine)
+
 
 @app.get("/")
 async def root():
@@ -36,20 +244,58 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (liveness)"""
     return {
         "status": "healthy",
-        "environment": settings.ENV
+        "environment": settings.ENV,
+        "warm": startup_report.warm
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness endpoint: 503 until background warm-up has finished"""
+    if not startup_report.warm:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+
+@app.exception_handler(OverloadedError)
+async def overloaded_handler(request: Request, exc: OverloadedError):
+    """Shed inference load fast with 503 and a Retry-After hint"""
+    retry_after = math.ceil(exc.retry_after)
+    return JSONResponse(
+        status_code=503,
+        content={
+            "detail": {
+                "success": False,
+                "error": {
+                    "code": "OVERLOADED",
+                    "message": str(exc)
+                }
+            }
+        },
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
 # Import and include routers
-# from api.routes import lessons, vocabulary, pronunciation, translation, progress
+from api.routes import vocabulary, progress, sync, leaderboard, recommendations, search, audio, recordings, translation, admin
+app.include_router(vocabulary.router, prefix=settings.API_V1_PREFIX, tags=["vocabulary"])
+app.include_router(progress.router, prefix=settings.API_V1_PREFIX, tags=["progress"])
+app.include_router(sync.router, prefix=settings.API_V1_PREFIX, tags=["sync"])
+app.include_router(leaderboard.router, prefix=settings.API_V1_PREFIX, tags=["leaderboards"])
+app.include_router(recommendations.router, prefix=settings.API_V1_PREFIX, tags=["recommendations"])
+app.include_router(search.router, prefix=settings.API_V1_PREFIX, tags=["search"])
+app.include_router(audio.router, prefix=settings.API_V1_PREFIX, tags=["audio"])
+app.include_router(recordings.router, prefix=settings.API_V1_PREFIX, tags=["recordings"])
+app.include_router(translation.router, prefix=settings.API_V1_PREFIX, tags=["translation"])
+app.include_router(admin.router, prefix=settings.API_V1_PREFIX, tags=["admin"])
+# from api.routes import lessons, pronunciation
 # app.include_router(lessons.router, prefix=settings.API_V1_PREFIX, tags=["lessons"])
-# app.include_router(vocabulary.router, prefix=settings.API_V1_PREFIX, tags=["vocabulary"])
 # app.include_router(pronunciation.router, prefix=settings.API_V1_PREFIX, tags=["pronunciation"])
-# app.include_router(translation.router, prefix=settings.API_V1_PREFIX, tags=["translation"])
-# app.include_router(progress.router, prefix=settings.API_V1_PREFIX, tags=["progress"])
+
+startup_report.mark("app_imported")
 
 
 if __name__ == "__main__":
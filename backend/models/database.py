@@ -1,7 +1,7 @@
 """
 SQLAlchemy database models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Float, Boolean
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, JSON, Float, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from db.session import Base
@@ -23,6 +23,7 @@ class User(Base):
     progress = relationship("UserProgress", back_populates="user", cascade="all, delete-orphan")
     vocabulary_practice = relationship("VocabularyPractice", back_populates="user", cascade="all, delete-orphan")
     pronunciation_recordings = relationship("PronunciationRecording", back_populates="user", cascade="all, delete-orphan")
+    stats = relationship("UserStats", back_populates="user", uselist=False, cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}')>"
@@ -41,7 +42,7 @@ class Lesson(Base):
     estimated_duration = Column(Integer)  # Duration in minutes
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     vocabulary_items = relationship("VocabularyItem", back_populates="lesson", cascade="all, delete-orphan")
@@ -64,7 +65,8 @@ class VocabularyItem(Base):
     example_sentence = Column(Text)
     audio_url = Column(String(500))  # Path to audio file
     lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     lesson = relationship("Lesson", back_populates="vocabulary_items")
@@ -78,6 +80,10 @@ class VocabularyItem(Base):
 class UserProgress(Base):
     """User progress tracking model"""
     __tablename__ = "user_progress"
+    __table_args__ = (
+        Index("ix_user_progress_user_lesson", "user_id", "lesson_id", unique=True),
+        Index("ix_user_progress_user_last_accessed", "user_id", "last_accessed"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -88,7 +94,8 @@ class UserProgress(Base):
     time_spent = Column(Integer, default=0)  # Time in seconds
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
-    last_accessed = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_accessed = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Server time of the last write
+    client_updated_at = Column(DateTime, nullable=True)  # When the last applied change was made (device time for offline uploads)
 
     # Relationships
     user = relationship("User", back_populates="progress")
@@ -101,6 +108,10 @@ class UserProgress(Base):
 class VocabularyPractice(Base):
     """Vocabulary practice tracking model"""
     __tablename__ = "vocabulary_practice"
+    __table_args__ = (
+        Index("ix_vocabulary_practice_user_vocabulary", "user_id", "vocabulary_id", unique=True),
+        Index("ix_vocabulary_practice_user_last_practiced", "user_id", "last_practiced"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -136,6 +147,91 @@ class PronunciationRecording(Base):
     # Relationships
     user = relationship("User", back_populates="pronunciation_recordings")
     vocabulary = relationship("VocabularyItem", back_populates="pronunciation_recordings")
+    storage = relationship("RecordingStorage", back_populates="recording", uselist=False, cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<PronunciationRecording(id={self.id}, user_id={self.user_id}, score={self.accuracy_score})>"
+
+
+class RecordingStorage(Base):
+    """
+    Storage tier and size of a recording's audio file.
+
+    Kept apart from PronunciationRecording so background maintenance and
+    per-user usage reports query a narrow indexed table; the file itself
+    is at PronunciationRecording.audio_path.
+    """
+    __tablename__ = "recording_storage"
+    __table_args__ = (
+        Index("ix_recording_storage_tier_stored_at", "tier", "stored_at"),
+    )
+
+    recording_id = Column(Integer, ForeignKey("pronunciation_recordings.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    tier = Column(String(10), nullable=False)  # hot, cold, purged or missing
+    size_bytes = Column(Integer, default=0, nullable=False)  # Current size on disk
+    content_hash = Column(String(16), nullable=True)  # Of the current file, for versioned audio URLs
+    original_size_bytes = Column(Integer, default=0, nullable=False)  # Size as uploaded
+    stored_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    transcoded_at = Column(DateTime, nullable=True)  # When the cold copy replaced the original
+    transcode_attempts = Column(Integer, default=0, nullable=False)  # Transcodes that did not replace the original
+    transcode_error = Column(String(200), nullable=True)  # Why the last attempt did not
+    purged_at = Column(DateTime, nullable=True)
+    checked_at = Column(DateTime, nullable=True)  # Last time a missing file was looked for
+
+    # Relationships
+    recording = relationship("PronunciationRecording", back_populates="storage")
+
+    def __repr__(self):
+        return f"<RecordingStorage(recording_id={self.recording_id}, tier={self.tier}, size={self.size_bytes})>"
+
+
+class UserStats(Base):
+    """
+    Per-user progress rollups.
+
+    Maintained incrementally on progress and practice writes so summary
+    views never have to scan UserProgress or VocabularyPractice.
+    """
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    books_started = Column(Integer, default=0, nullable=False)
+    books_completed = Column(Integer, default=0, nullable=False)
+    total_time_spent = Column(Integer, default=0, nullable=False)  # Time in seconds
+    total_score = Column(Integer, default=0, index=True, nullable=False)  # Sum of UserProgress.score
+    words_practiced = Column(Integer, default=0, nullable=False)
+    words_mastered = Column(Integer, default=0, nullable=False)  # mastery_level >= MASTERED_LEVEL
+    mastery_counts = Column(JSON, default=lambda: [0] * 6, nullable=False)  # Words per mastery_level 0-5
+    current_streak = Column(Integer, default=0, nullable=False)  # Consecutive active days
+    longest_streak = Column(Integer, default=0, nullable=False)
+    last_active_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    # Relationships
+    user = relationship("User", back_populates="stats")
+
+    def __repr__(self):
+        return f"<UserStats(user_id={self.user_id}, completed={self.books_completed}, mastered={self.words_mastered})>"
+
+
+class SentenceTranslation(Base):
+    """
+    Per-sentence translation cache.
+
+    Keyed by a hash of (source_lang, target_lang, sentence) so chapter
+    re-translations only send new or edited sentences to the model.
+    """
+    __tablename__ = "sentence_translations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_hash = Column(String(64), unique=True, nullable=False, index=True)
+    source_lang = Column(String(10), nullable=False)
+    target_lang = Column(String(10), nullable=False)
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+    model = Column(String(200))
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SentenceTranslation(id={self.id}, {self.source_lang}->{self.target_lang})>"
@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation
 """
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 
 
 # ===== User Schemas =====
@@ -85,6 +85,17 @@ class VocabularyItemResponse(VocabularyItemBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class VocabularyLookupResponse(BaseModel):
+    word: str
+    lemma: Optional[str] = None
+    translation: str
+    pronunciation: Optional[str] = None
+    part_of_speech: Optional[str] = None
+    audio_url: Optional[str] = None
+    vocabulary_id: Optional[int] = None
+    source: str  # index, cache, model
+
+
 # ===== Progress Schemas =====
 
 class UserProgressBase(BaseModel):
@@ -96,7 +107,7 @@ class UserProgressBase(BaseModel):
 
 
 class UserProgressCreate(UserProgressBase):
-    pass
+    score: Optional[int] = Field(None, ge=0, le=100)
 
 
 class UserProgressUpdate(BaseModel):
@@ -128,6 +139,10 @@ class VocabularyPracticeUpdate(BaseModel):
     mastery_level: Optional[int] = Field(None, ge=0, le=5)
 
 
+class VocabularyPracticeCreate(VocabularyPracticeBase, VocabularyPracticeUpdate):
+    pass
+
+
 class VocabularyPracticeResponse(VocabularyPracticeBase):
     id: int
     correct_count: int
@@ -139,6 +154,138 @@ class VocabularyPracticeResponse(VocabularyPracticeBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# ===== Stats & Library Schemas =====
+
+class UserStatsResponse(BaseModel):
+    user_id: int
+    books_started: int
+    books_completed: int
+    total_time_spent: int
+    total_score: int
+    words_practiced: int
+    words_mastered: int
+    mastery_counts: List[int]
+    current_streak: int
+    longest_streak: int
+    last_active_date: Optional[date] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LibraryBookResponse(LessonResponse):
+    progress: Optional[UserProgressResponse] = None
+
+
+class LibraryResponse(BaseModel):
+    books: List[LibraryBookResponse]
+    current_lesson_id: Optional[int] = None
+    summary: UserStatsResponse
+
+
+# ===== Leaderboard Schemas =====
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    username: Optional[str] = None
+    value: int
+
+
+class LeaderboardResponse(BaseModel):
+    metric: str
+    cohort: Optional[str] = None
+    total: int
+    entries: List[LeaderboardEntry]
+
+
+class LeaderboardRankResponse(BaseModel):
+    metric: str
+    cohort: Optional[str] = None
+    user_id: int
+    rank: Optional[int] = None
+    value: Optional[int] = None
+    total: int
+
+
+class CohortStatsResponse(BaseModel):
+    metric: str
+    cohort: Optional[str] = None
+    count: int
+    mean: float
+    min: int
+    median: int
+    p90: int
+    max: int
+
+
+# ===== Sync Schemas =====
+
+class SyncResponse(BaseModel):
+    cursor: str  # Opaque; pass back as ?cursor= on the next sync
+    full: bool  # True on the first page of a full sync (no cursor given); drop local state
+    has_more: bool  # More pages follow; call again with this cursor
+    lessons: List[LessonResponse]
+    deleted_lesson_ids: List[int]  # Lessons deactivated since the cursor
+    vocabulary: List[VocabularyItemResponse]
+    progress: List[UserProgressResponse]
+    practice: List[VocabularyPracticeResponse]
+
+
+class OfflineProgressUpdate(BaseModel):
+    lesson_id: int
+    status: Optional[str] = Field(None, pattern="^(not_started|in_progress|completed)$")
+    progress_percentage: Optional[int] = Field(None, ge=0, le=100)
+    score: Optional[int] = Field(None, ge=0, le=100)
+    time_spent: Optional[int] = Field(None, ge=0)
+    updated_at: datetime  # When the change was made on the device (UTC)
+
+
+class ProgressUploadRequest(BaseModel):
+    user_id: int
+    progress: List[OfflineProgressUpdate] = Field(..., min_length=1, max_length=500)
+
+
+class ProgressUploadResponse(BaseModel):
+    applied: List[UserProgressResponse]
+    skipped_lesson_ids: List[int]  # Older than the server's copy
+
+
+# ===== Recommendation Schemas =====
+
+class RecommendationEntry(BaseModel):
+    lesson_id: int
+    title: str
+    level: Optional[str] = None
+    score: float
+    coverage: float  # Share of the book's words the user knows, weighted by mastery
+    total_words: int
+    new_words: int
+
+
+class RecommendationsResponse(BaseModel):
+    user_id: int
+    target_coverage: float
+    recommendations: List[RecommendationEntry]
+
+
+# ===== Search Schemas =====
+
+class PassageMatch(BaseModel):
+    kind: str  # lesson or vocabulary
+    source_id: int  # Lesson or vocabulary item ID
+    title: str  # Lesson title or vocabulary word
+    text: str  # The matching passage
+    start: int  # Passage offsets into the source text
+    end: int
+    score: float  # Cosine similarity
+
+
+class PassageSearchResponse(BaseModel):
+    query: Optional[str] = None
+    lesson_id: Optional[int] = None
+    results: List[PassageMatch]
+
+
 # ===== Pronunciation Schemas =====
 
 class PronunciationAnalysisRequest(BaseModel):
@@ -157,6 +304,31 @@ class PronunciationAnalysisResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RecordingResponse(BaseModel):
+    id: int
+    user_id: int
+    vocabulary_id: Optional[int] = None
+    audio_url: Optional[str] = None  # None once the audio has been purged or while it is missing
+    storage_tier: str  # hot, cold, purged or missing
+    size_bytes: int
+    transcription: Optional[str] = None
+    accuracy_score: Optional[float] = Field(None, ge=0.0, le=1.0)
+    created_at: datetime
+
+
+class TierUsage(BaseModel):
+    recordings: int
+    bytes: int
+
+
+class RecordingUsageResponse(BaseModel):
+    user_id: int
+    recordings: int
+    stored_bytes: int  # Currently on disk
+    uploaded_bytes: int  # As uploaded, before transcoding and purging
+    tiers: Dict[str, TierUsage]
+
+
 # ===== Translation Schemas =====
 
 class TranslationRequest(BaseModel):
@@ -173,6 +345,31 @@ class TranslationResponse(BaseModel):
     model: str
 
 
+class ChapterTranslationRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=200000)
+    source_lang: str = Field(default="en", min_length=2, max_length=10)
+    target_lang: str = Field(..., min_length=2, max_length=10)
+
+
+class AlignedSegment(BaseModel):
+    source_start: int  # Character offsets into the request text
+    source_end: int
+    target_start: int  # Character offsets into translated_text
+    target_end: int
+    cached: bool
+
+
+class ChapterTranslationResponse(BaseModel):
+    translated_text: str
+    source_lang: str
+    target_lang: str
+    model: Optional[str] = None  # None when every sentence came from the cache
+    segments: List[AlignedSegment]
+    sentences: int
+    unique_sentences: int
+    translated_sentences: int  # Sent to the model; the rest were cached
+
+
 # ===== API Response Wrapper =====
 
 class APIResponse(BaseModel):
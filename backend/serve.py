@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Preload-then-fork server.
+
+Loads the app, warms it up and loads PRELOAD_MODELS once in a master
+process, then forks WORKERS uvicorn workers that share the model weights
+copy-on-write. `uvicorn main:app --workers N` instead spawns fresh
+interpreters, so every worker would load its own copy of each model.
+
+Usage:
+    python serve.py --workers 4 --port 8000
+
+Sharing safeguards:
+    - OpenMP/MKL thread pools are capped before torch is imported and
+      torch is never run in the master, so no pool exists at fork time
+      (forking with a live OpenMP pool can deadlock the children).
+    - gc.freeze() moves everything loaded so far into a permanent
+      generation, so collections in the workers never write to the GC
+      headers of shared objects and dirty their pages.
+    - Tensor data lives outside Python objects; refcount changes only
+      touch small object headers, never the weight buffers. Inference
+      runs under eval mode and does not write to the weights.
+    - The DB connection pool is disposed before forking so workers never
+      share a SQLite connection.
+    - CUDA contexts cannot cross fork(); on GPU hosts models are not
+      preloaded and each worker loads its own copy on first use.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+# Must be set before torch (or numpy's BLAS) is imported anywhere
+for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(var, "1")
+
+logger = logging.getLogger("serve")
+
+
+def preload_models(specs):
+    """Create the ML service and load each "task:model" pipeline"""
+    from services.ml_factory import get_ml_service
+
+    service = get_ml_service()
+    if not hasattr(service, "preload"):
+        logger.info("Inference mode has no local models to preload")
+        return
+    if getattr(service, "device", "cpu") != "cpu":
+        logger.warning(f"Not preloading models on {service.device}: device contexts cannot be shared across fork()")
+        return
+
+    for spec in specs:
+        task, _, model = spec.partition(":")
+        start = time.perf_counter()
+        service.preload(task, model)
+        logger.info(f"Preloaded {model} ({task}) in {time.perf_counter() - start:.1f}s")
+
+
+def run_worker(app, sock: socket.socket, log_level: str, torch_threads: int):
+    """Worker process body: serve the inherited socket until told to stop"""
+    import uvicorn
+
+    gc.enable()
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(torch_threads)
+
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def report_memory(workers):
+    from services.memory import read_memory, format_bytes
+
+    for index, pid in sorted((index, pid) for pid, index in workers.items()):
+        memory = read_memory(pid)
+        if memory:
+            logger.info(
+                f"Worker {index} (pid {pid}): unique {format_bytes(memory['uss'])}, "
+                f"proportional {format_bytes(memory['pss'])}, shared {format_bytes(memory['shared'])}, "
+                f"rss {format_bytes(memory['rss'])}"
+            )
+
+
+def main():
+    from config import settings
+
+    parser = argparse.ArgumentParser(description="Preload models once and fork uvicorn workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS)
+    parser.add_argument("--log-level", default=settings.LOG_LEVEL.lower())
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    # Load the app, its in-memory indexes and the models in the master
+    gc.disable()
+    from main import app, warm_up
+    from db.session import engine
+
+    warm_up()
+    if settings.PRELOAD_MODELS:
+        preload_models(settings.PRELOAD_MODELS)
+    engine.dispose()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    gc.freeze()
+    logger.info(f"Master {os.getpid()} listening on {args.host}:{args.port}, forking {args.workers} workers")
+
+    workers = {}  # pid -> worker index
+    stopping = False
+
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                if settings.METRICS_ENABLED:
+                    from services import metrics
+                    metrics.set_worker(index)
+                run_worker(app, sock, args.log_level, settings.TORCH_THREADS_PER_WORKER)
+            finally:
+                os._exit(0)
+        workers[pid] = index
+        logger.info(f"Started worker {index} (pid {pid})")
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for index in range(args.workers):
+        spawn(index)
+
+    next_report = time.monotonic() + 10 if settings.MEMORY_REPORT_SECONDS > 0 else None
+    while workers:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid:
+            index = workers.pop(pid)
+            if not stopping:
+                logger.warning(f"Worker {index} (pid {pid}) exited with status {status}, restarting")
+                spawn(index)
+            continue
+        if next_report is not None and time.monotonic() >= next_report:
+            report_memory(workers)
+            next_report = time.monotonic() + settings.MEMORY_REPORT_SECONDS
+        time.sleep(0.5)
+
+    sock.close()
+    logger.info(f"Master {os.getpid()} stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+In-process admission control for ML inference.
+
+- RateLimiter: token bucket per (endpoint, client) so one client cannot
+  monopolise inference or the HF API quota.
+- ConcurrencyGate: caps concurrent calls per model with a bounded wait
+  queue, and sheds load (OverloadedError) as soon as the expected queue
+  wait exceeds a latency target instead of letting requests pile up.
+- AdmissionControlledMLService: applies a gate per model to any
+  MLInferenceService.
+
+State is per worker process; no external store is needed.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from services.metrics import ADMISSION_REJECTED, INFERENCE_QUEUE_DEPTH
+from services.ml_base import MLInferenceService
+from services.translation_router import translation_router
+from config import settings
+
+BLOCKED_RETRY_AFTER = 60.0  # Retry hint for endpoints limited to 0 requests per minute
+
+
+class OverloadedError(Exception):
+    """Raised when a call is shed; retry_after is a hint in seconds"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _record_rejection(reason: str):
+    if settings.METRICS_ENABLED:
+        ADMISSION_REJECTED.labels(reason).inc()
+
+
+class TokenBucket:
+    """Refills at rate tokens/second up to capacity"""
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> float:
+        """
+        Take one token.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets keyed by (endpoint, client), bounded by LRU eviction"""
+
+    def __init__(self, per_minute: int, burst: int, overrides: Optional[Dict[str, int]] = None,
+                 max_keys: int = 100000):
+        """
+        Initialize rate limiter.
+
+        Args:
+            per_minute: Sustained requests per minute per client and endpoint
+            burst: Requests a client may make at once before being limited
+            overrides: Per-endpoint per_minute values; 0 or less blocks the endpoint
+            max_keys: Max buckets kept; evicted clients start with a full bucket
+        """
+        self.per_minute = per_minute
+        self.burst = burst
+        self.overrides = overrides or {}
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self._lock = Lock()
+
+    def check(self, endpoint: str, client: str) -> float:
+        """
+        Consume one request for a client.
+
+        Returns:
+            0 if allowed, otherwise seconds to wait before retrying
+        """
+        per_minute = self.overrides.get(endpoint, self.per_minute)
+        if per_minute <= 0:
+            # A bucket that never refills: always limited
+            _record_rejection("rate_limited")
+            return BLOCKED_RETRY_AFTER
+
+        key = (endpoint, client)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(per_minute / 60, max(self.burst, 1))
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            wait = bucket.take(now)
+
+        if wait:
+            _record_rejection("rate_limited")
+        return wait
+
+
+class ConcurrencyGate:
+    """
+    Limits concurrent calls with a bounded FIFO wait queue.
+
+    A call is rejected immediately when the queue is full or when the
+    expected wait (queue length x average call time / concurrency) is
+    already over the target, and a queued call gives up once it has
+    waited for the target. Either way the caller fails fast instead of
+    timing out later.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, target_wait: float):
+        """
+        Args:
+            name: Label for metrics and errors (the model name)
+            max_concurrency: Calls allowed to run at once
+            max_queue: Calls allowed to wait for a slot
+            target_wait: Max seconds a call should wait in the queue
+        """
+        self.name = name
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_queue = max_queue
+        self.target_wait = target_wait
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._avg_duration = 0.0  # EWMA of call durations in seconds
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self) -> float:
+        return self._avg_duration * (len(self._waiters) + 1) / self.max_concurrency
+
+    def _retry_after(self) -> float:
+        return max(1.0, math.ceil(self.expected_wait()))
+
+    async def _acquire(self):
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            _record_rejection("queue_full")
+            raise OverloadedError(f"Too many queued requests for {self.name}", self._retry_after())
+        if self.expected_wait() > self.target_wait:
+            _record_rejection("queue_latency")
+            raise OverloadedError(f"Queue wait for {self.name} is over target", self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._set_depth()
+        try:
+            await asyncio.wait({waiter}, timeout=self.target_wait)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            self._abandon(waiter)
+            _record_rejection("queue_timeout")
+            raise OverloadedError(f"Timed out waiting for {self.name}", self._retry_after())
+
+    def _abandon(self, waiter: asyncio.Future):
+        """Leave the queue; hand the slot on if it was granted meanwhile"""
+        if waiter.done() and not waiter.cancelled():
+            self._release()
+        else:
+            waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+        self._set_depth()
+
+    def _release(self):
+        self.active -= 1
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+                break
+        self._set_depth()
+
+    def _set_depth(self):
+        if settings.METRICS_ENABLED:
+            INFERENCE_QUEUE_DEPTH.labels(self.name).set(len(self._waiters))
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for the duration of the block"""
+        await self._acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._avg_duration = elapsed if not self._avg_duration else 0.8 * self._avg_duration + 0.2 * elapsed
+            self._release()
+
+
+class AdmissionControlledMLService(MLInferenceService):
+    """Delegates to another MLInferenceService through a per-model ConcurrencyGate"""
+
+    def __init__(self, service: MLInferenceService):
+        """
+        Args:
+            service: The inference service to wrap
+        """
+        self.service = service
+        self.gates: Dict[str, ConcurrencyGate] = {}
+
+    def __getattr__(self, name):
+        # Expose wrapped service attributes (client, models, device, ...)
+        return getattr(self.service, name)
+
+    @property
+    def embedding_model(self) -> str:
+        return self.service.embedding_model
+
+    def gate(self, model: str) -> ConcurrencyGate:
+        gate = self.gates.get(model)
+        if gate is None:
+            gate = self.gates.setdefault(model, ConcurrencyGate(
+                model,
+                settings.MODEL_MAX_CONCURRENCY,
+                settings.MODEL_MAX_QUEUE,
+                settings.MODEL_QUEUE_TARGET_MS / 1000
+            ))
+        return gate
+
+    @asynccontextmanager
+    async def _translation_slots(self, source_lang: str, target_lang: str):
+        """
+        Hold a slot on the gate of every model a translation runs through.
+
+        A pivot route (a+b) competes with direct traffic on both models
+        rather than getting a gate of its own. Gates are taken in name order
+        so two pivot routes never wait on each other's half.
+        """
+        models = sorted({hop.model for hop in translation_router.route(source_lang, target_lang)})
+        async with AsyncExitStack() as stack:
+            for model in models:
+                await stack.enter_async_context(self.gate(model).slot())
+            yield
+
+    async def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str
+    ) -> Dict[str, Any]:
+        async with self._translation_slots(source_lang, target_lang):
+            return await self.service.translate(text, source_lang, target_lang)
+
+    async def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        async with self._translation_slots(source_lang, target_lang):
+            return await self.service.translate_batch(texts, source_lang, target_lang, concurrency)
+
+    async def embed(
+        self,
+        texts: List[str],
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        async with self.gate(settings.TEXT_MODEL).slot():
+            return await self.service.embed(texts, concurrency)
+
+    async def transcribe_audio(
+        self,
+        audio_path: str,
+        language: str = "en"
+    ) -> Dict[str, Any]:
+        async with self.gate(settings.WHISPER_MODEL).slot():
+            return await self.service.transcribe_audio(audio_path, language)
+
+    async def analyze_text(
+        self,
+        text: str,
+        task: str = "sentiment"
+    ) -> Dict[str, Any]:
+        async with self.gate(f"analyze_text:{task}").slot():
+            return await self.service.analyze_text(text, task)
+
+
+rate_limiter = RateLimiter(
+    settings.RATE_LIMIT_PER_MINUTE,
+    settings.RATE_LIMIT_BURST,
+    settings.RATE_LIMIT_ENDPOINTS,
+    settings.RATE_LIMIT_MAX_KEYS
+)
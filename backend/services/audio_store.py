@@ -0,0 +1,110 @@
+"""
+Audio file resolution and content hashing.
+
+Audio is addressed by its path relative to UPLOAD_DIR. Public URLs carry
+a short content hash (?v=...) so clients and CDNs can cache them forever;
+when a file changes its hash, and therefore its URL, changes too.
+"""
+import hashlib
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from config import settings
+
+MEDIA_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".m4a": "audio/mp4",
+    ".ogg": "audio/ogg",
+    ".wav": "audio/wav",
+}
+
+HASH_LENGTH = 16
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class AudioStore:
+    """Resolves audio paths under a root directory and caches their content hashes"""
+
+    def __init__(self, root: str, allowed_formats=None):
+        """
+        Initialize audio store.
+
+        Args:
+            root: Directory holding the audio files
+            allowed_formats: File extensions that may be served
+        """
+        self.root = Path(root).resolve()
+        self.allowed_formats = {ext.lower() for ext in (allowed_formats or MEDIA_TYPES)}
+        # path -> ((size, mtime_ns), hash); recomputed only when the file changes
+        self._hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._lock = Lock()
+
+    def resolve(self, relative_path: str) -> Optional[Path]:
+        """
+        Map a relative path to a file under the root.
+
+        Returns:
+            Absolute path, or None if it escapes the root, has a
+            disallowed extension or does not exist
+        """
+        path = (self.root / relative_path).resolve()
+        if not path.is_relative_to(self.root) or path.suffix.lower() not in self.allowed_formats:
+            return None
+        return path if path.is_file() else None
+
+    def media_type(self, path: Path) -> str:
+        return MEDIA_TYPES.get(path.suffix.lower(), "application/octet-stream")
+
+    def content_hash(self, path: Path, stat_result: Optional[os.stat_result] = None) -> str:
+        """
+        Get the content hash of a file.
+
+        Hashes are cached by (size, mtime), so each file is read in full
+        once per modification rather than once per request.
+        """
+        stat_result = stat_result or path.stat()
+        version = (stat_result.st_size, stat_result.st_mtime_ns)
+        key = str(path)
+        cached = self._hashes.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(_HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()[:HASH_LENGTH]
+
+        with self._lock:
+            self._hashes[key] = (version, content_hash)
+        return content_hash
+
+    def public_url(self, audio_url: Optional[str]) -> Optional[str]:
+        """
+        Turn a stored audio reference into a cacheable URL.
+
+        Relative paths of existing files become hashed endpoint URLs;
+        absolute URLs and unknown files are returned unchanged. This
+        stats and may hash the file: call it when an index is built or a
+        file is stored, not per request (see url()).
+        """
+        if not audio_url or "://" in audio_url or audio_url.startswith("/"):
+            return audio_url
+        path = self.resolve(audio_url)
+        if path is None:
+            return audio_url
+        relative = path.relative_to(self.root).as_posix()
+        return self.url(relative, self.content_hash(path))
+
+    def url(self, relative_path: str, content_hash: Optional[str] = None) -> str:
+        """
+        Endpoint URL for a path relative to the root, without touching the file.
+
+        Without a precomputed hash the URL is served uncached (revalidated by ETag).
+        """
+        url = f"{settings.API_V1_PREFIX}/audio/{relative_path}"
+        return f"{url}?v={content_hash}" if content_hash else url
+
+
+audio_store = AudioStore(settings.UPLOAD_DIR, settings.ALLOWED_AUDIO_FORMATS)
@@ -0,0 +1,263 @@
+"""
+Chapter-scale translation.
+
+Splits text into sentences, translates each distinct sentence once (in
+batches, skipping sentences already cached in memory or in the
+sentence_translations table) and reassembles the result with offsets
+aligning every source sentence to its translation.
+"""
+import asyncio
+import hashlib
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from models.database import SentenceTranslation
+from services.ml_base import MLInferenceService
+from services.translation_cache import TranslationCache
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sentence-ending punctuation, optional closing quotes/brackets, then whitespace
+_SENTENCE_END = re.compile(r"([.!?…]+[\"'”’»)\]]*)(\s+)")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_LAST_WORD = re.compile(r"(\S+)$")
+_PREVIOUS_WORD = re.compile(r"(\S+)\s+$")
+_NEXT_WORD = re.compile(r"[\"'“‘(]*([^\s\"'”’)]+)")
+_SOFT_BREAK = re.compile(r"[;:,—]\s|\s")
+
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "vs", "etc",
+    "e.g", "i.e", "vol", "ch", "fig", "p", "pp", "ca", "cf",
+}
+# Abbreviations that only precede a number ("No. 5")
+NUMBER_ABBREVIATIONS = {"no", "nos"}
+# Capitalised words that usually start a sentence rather than follow an initial
+SENTENCE_STARTERS = {
+    "a", "an", "and", "as", "at", "but", "he", "her", "his", "i", "if", "in", "it", "its", "my", "no",
+    "on", "our", "she", "so", "that", "the", "then", "there", "these", "they", "this", "we", "what",
+    "when", "yes", "you",
+}
+
+Span = Tuple[int, int]
+
+sentence_cache = TranslationCache(max_size=settings.SENTENCE_CACHE_SIZE)
+
+
+def _trim(text: str, start: int, end: int) -> Span:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _is_abbreviation(text: str, start: int, punct_start: int, next_start: int) -> bool:
+    """
+    Whether the word before a period is an abbreviation or an initial.
+
+    "No." counts only before a number. A single letter counts only when
+    uppercase and followed by another initial ("J. R. Tolkien") or a
+    capitalised surname ("J. Smith"), so "Plan A. Plan B." still splits.
+    """
+    match = _LAST_WORD.search(text, start, punct_start)
+    if not match:
+        return False
+    word = match.group(1).lstrip("(\"'“‘")
+    following = _NEXT_WORD.match(text, next_start)
+    next_word = following.group(1) if following else ""
+
+    if word.lower() in ABBREVIATIONS:
+        return True
+    if word.lower() in NUMBER_ABBREVIATIONS:
+        return next_word[:1].isdigit()
+    if len(word) == 1 and word.isalpha() and word.isupper():
+        if len(next_word) == 2 and next_word[0].isupper() and next_word[1] == ".":
+            return True
+        previous = _PREVIOUS_WORD.search(text, start, match.start())
+        return (
+            next_word[:1].isupper()
+            and next_word.rstrip(".,;:!?").lower() not in SENTENCE_STARTERS
+            and (previous is None or previous.group(1) != next_word)
+        )
+    return False
+
+
+def _split_long(text: str, start: int, end: int, max_chars: int) -> List[Span]:
+    """Split a span longer than max_chars at clause breaks, then whitespace"""
+    spans = []
+    while end - start > max_chars:
+        cut = None
+        for match in _SOFT_BREAK.finditer(text, start + max_chars // 2, start + max_chars):
+            cut = match.end()
+        cut = cut or start + max_chars
+        spans.append(_trim(text, start, cut))
+        start = cut
+    spans.append(_trim(text, start, end))
+    return [span for span in spans if span[0] < span[1]]
+
+
+def segment_sentences(text: str, max_chars: int = 400) -> List[Span]:
+    """
+    Split text into sentence spans.
+
+    Paragraph breaks always end a sentence. Periods after abbreviations
+    (Mr., e.g.) and initials do not. Sentences over max_chars are split
+    further so each segment fits the model's input limit.
+
+    Returns:
+        (start, end) character offsets, without surrounding whitespace
+    """
+    spans = []
+    paragraph_start = 0
+    breaks = [(m.start(), m.end()) for m in _PARAGRAPH_BREAK.finditer(text)] + [(len(text), len(text))]
+    for paragraph_end, next_start in breaks:
+        start = paragraph_start
+        for match in _SENTENCE_END.finditer(text, paragraph_start, paragraph_end):
+            punctuation = match.group(1)
+            if punctuation.startswith(".") and len(punctuation.rstrip("\"'”’»)]")) == 1 \
+                    and _is_abbreviation(text, start, match.start(1), match.end()):
+                continue
+            spans.append(_trim(text, start, match.end(1)))
+            start = match.end()
+        spans.append(_trim(text, start, paragraph_end))
+        paragraph_start = next_start
+
+    segments = []
+    for start, end in spans:
+        if start < end:
+            segments.extend(_split_long(text, start, end, max_chars))
+    return segments
+
+
+def sentence_hash(sentence: str, source_lang: str, target_lang: str) -> str:
+    return hashlib.sha256(f"{source_lang}\0{target_lang}\0{sentence}".encode()).hexdigest()
+
+
+class DocumentTranslationService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _load_cached(self, sentences: List[str], source_lang: str, target_lang: str) -> Dict[str, str]:
+        """Find stored translations, checking memory before the database"""
+        found = {}
+        missing = {}
+        for sentence in sentences:
+            cached = sentence_cache.get(sentence, source_lang, target_lang)
+            if cached is not None:
+                found[sentence] = cached["translated_text"]
+            else:
+                missing[sentence_hash(sentence, source_lang, target_lang)] = sentence
+
+        hashes = list(missing)
+        for i in range(0, len(hashes), 500):  # Stay under SQLite's bound-parameter limit
+            rows = self.db.query(SentenceTranslation.source_hash, SentenceTranslation.translated_text).filter(
+                SentenceTranslation.source_hash.in_(hashes[i:i + 500])
+            )
+            for source_hash, translated_text in rows:
+                sentence = missing[source_hash]
+                found[sentence] = translated_text
+                sentence_cache.set(sentence, source_lang, target_lang, {"translated_text": translated_text})
+        return found
+
+    def _store(self, translations: Dict[str, str], source_lang: str, target_lang: str, model: str):
+        """
+        Save new sentence translations.
+
+        Sentences a concurrent request stored first are skipped row by row
+        (ON CONFLICT DO NOTHING); the rest of the batch is still saved.
+        """
+        if not translations:
+            return
+        rows = []
+        for sentence, translated_text in translations.items():
+            rows.append({
+                "source_hash": sentence_hash(sentence, source_lang, target_lang),
+                "source_lang": source_lang,
+                "target_lang": target_lang,
+                "source_text": sentence,
+                "translated_text": translated_text,
+                "model": model,
+                "created_at": datetime.utcnow(),
+            })
+            sentence_cache.set(sentence, source_lang, target_lang, {"translated_text": translated_text})
+        self.db.execute(insert(SentenceTranslation).on_conflict_do_nothing(index_elements=["source_hash"]), rows)
+        self.db.commit()
+
+    async def translate(
+        self,
+        text: str,
+        ml_service: MLInferenceService,
+        source_lang: str,
+        target_lang: str
+    ) -> Dict[str, Any]:
+        """
+        Translate a chapter sentence by sentence.
+
+        Each batch is stored as soon as it is translated, so a failed or
+        repeated request never redoes finished sentences. Database work
+        runs in worker threads so the event loop is never blocked.
+
+        Returns:
+            Translated text with per-sentence alignment offsets
+        """
+        spans = segment_sentences(text, settings.DOC_MAX_SENTENCE_CHARS)
+        sentences = [text[start:end] for start, end in spans]
+        unique = list(dict.fromkeys(sentences))
+
+        translations = await asyncio.to_thread(self._load_cached, unique, source_lang, target_lang)
+        cached = set(translations)
+        pending = [sentence for sentence in unique if sentence not in cached]
+
+        model = None
+        batch_size = max(settings.DOC_TRANSLATION_BATCH_SIZE, 1)
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
+            result = await ml_service.translate_batch(
+                batch, source_lang, target_lang, settings.DOC_TRANSLATION_CONCURRENCY
+            )
+            model = result["model"]
+            translated = dict(zip(batch, result["translated_texts"]))
+            await asyncio.to_thread(self._store, translated, source_lang, target_lang, model)
+            translations.update(translated)
+
+        logger.info(
+            f"Translated chapter: {len(sentences)} sentences, {len(unique)} unique, "
+            f"{len(pending)} sent to the model"
+        )
+
+        # Reassemble, keeping the original whitespace between sentences
+        parts = []
+        segments = []
+        position = 0
+        length = 0
+        for (start, end), sentence in zip(spans, sentences):
+            separator = text[position:start]
+            translated_text = translations[sentence]
+            parts.append(separator)
+            length += len(separator)
+            segments.append({
+                "source_start": start,
+                "source_end": end,
+                "target_start": length,
+                "target_end": length + len(translated_text),
+                "cached": sentence in cached,
+            })
+            parts.append(translated_text)
+            length += len(translated_text)
+            position = end
+        parts.append(text[position:])
+
+        return {
+            "translated_text": "".join(parts),
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "model": model,
+            "segments": segments,
+            "sentences": len(sentences),
+            "unique_sentences": len(unique),
+            "translated_sentences": len(pending),
+        }
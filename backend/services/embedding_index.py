@@ -0,0 +1,485 @@
+"""
+Semantic search over lesson content and vocabulary example sentences.
+
+Lesson content is split into passages of about EMBEDDING_PASSAGE_CHARS;
+each passage and each example sentence is embedded with TEXT_MODEL
+(mean-pooled, L2-normalized). Vectors live in a memory-mapped float32
+matrix on disk, so worker processes share one copy through the page
+cache instead of each holding it in memory.
+
+Files in EMBEDDING_INDEX_DIR:
+    vectors.f32    Raw float32 matrix (rows x dim), append-only
+    meta.npy       Per-row source (kind, id), passage offsets, version, live flag
+    ivf.npz        Optional approximate index (cluster centroids + row assignments)
+    manifest.json  Model, dimension and committed row count; written last
+
+Refreshes are incremental: only new or changed lessons (by updated_at)
+and example sentences (by text) are embedded. Rows of changed or
+removed sources are marked dead and dropped when the file is compacted.
+One process refreshes at a time (file lock); others reload the manifest.
+"""
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+from models.database import Lesson, VocabularyItem
+from services.document_translation import segment_sentences
+from services.ml_base import MLInferenceService
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("lesson", "vocabulary")
+KIND_LESSON, KIND_VOCABULARY = 0, 1
+META_DTYPE = [
+    ("kind", "i1"),
+    ("source_id", "i8"),
+    ("start", "i4"),  # Passage offsets into lesson_text() / the example sentence
+    ("end", "i4"),
+    ("version", "u8"),  # Hash of the source's updated_at or text when embedded
+    ("live", "?"),
+]
+LESSON_CHUNK = 100  # Lessons loaded and embedded per step during a refresh
+COMPACT_MIN_DEAD = 1000  # Rewrite the matrix once dead rows exceed this and the live rows
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+
+Span = Tuple[int, int]
+SourceKey = Tuple[int, int]  # (kind, source_id)
+
+
+def _content_strings(value: Any) -> Iterator[str]:
+    """Text in structured lesson content, in document order"""
+    if isinstance(value, str):
+        if value.strip():
+            yield value.strip()
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key != "type":
+                yield from _content_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _content_strings(item)
+
+
+def lesson_text(title: str, description: Optional[str], content: Any) -> str:
+    """Searchable text of a lesson: title, description and content, one paragraph each"""
+    return "\n\n".join([title, *([description] if description else []), *_content_strings(content)])
+
+
+def split_passages(text: str, max_chars: int = 600) -> List[Span]:
+    """Group consecutive sentences into passages of at most max_chars"""
+    passages = []
+    for start, end in segment_sentences(text, max_chars):
+        if passages and end - passages[-1][0] <= max_chars:
+            passages[-1] = (passages[-1][0], end)
+        else:
+            passages.append((start, end))
+    return passages
+
+
+def source_version(value: Any) -> int:
+    """Version of a source as stored with its rows: hash of a lesson's updated_at or an example sentence"""
+    return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "little")
+
+
+class _IVF(NamedTuple):
+    """Inverted file index: rows grouped by nearest centroid"""
+    centroids: Any  # float32[lists, dim], normalized
+    assignments: Any  # int32[rows], cluster of each row
+    order: Any  # int64[rows], row numbers sorted by cluster
+    offsets: Any  # int64[lists + 1], order[offsets[c]:offsets[c + 1]] are cluster c's rows
+    trained_rows: int
+
+
+class _Snapshot(NamedTuple):
+    vectors: Any  # float32[rows, dim], memory-mapped
+    meta: Any  # META_DTYPE[rows]
+    ivf: Optional[_IVF]
+    model: Optional[str]
+    dim: int
+
+
+def _with_order(centroids, assignments, trained_rows: int) -> _IVF:
+    import numpy as np
+
+    order = np.argsort(assignments, kind="stable")
+    offsets = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+    return _IVF(centroids, assignments, order, offsets, trained_rows)
+
+
+def _normalize(vectors):
+    import numpy as np
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingIndex:
+    """Memory-mapped embedding matrix with exact or IVF top-k search"""
+
+    def __init__(self, directory: str, passage_chars: int = 600):
+        """
+        Initialize embedding index.
+
+        Args:
+            directory: Where the index files are stored
+            passage_chars: Target passage size for lesson content
+        """
+        self.directory = directory
+        self.passage_chars = passage_chars
+        self._snapshot: Optional[_Snapshot] = None
+        self._manifest_mtime = None
+        self._lock = Lock()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @property
+    def is_built(self) -> bool:
+        snapshot = self._snapshot
+        return snapshot is not None and len(snapshot.meta) > 0
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return int(snapshot.meta["live"].sum()) if snapshot is not None else 0
+
+    # ===== Loading =====
+
+    def load(self):
+        """Open the committed index files (again, if another process changed them)"""
+        import numpy as np
+
+        try:
+            mtime = os.stat(self._path("manifest.json")).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+
+        with open(self._path("manifest.json")) as f:
+            manifest = json.load(f)
+        rows, dim = manifest["rows"], manifest["dim"]
+        meta = np.load(self._path("meta.npy"))[:rows]
+        if rows:
+            vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r", shape=(rows, dim))
+        else:
+            vectors = np.zeros((0, dim), dtype=np.float32)
+
+        ivf = None
+        if os.path.exists(self._path("ivf.npz")):
+            with np.load(self._path("ivf.npz")) as stored:
+                ivf = _with_order(stored["centroids"], stored["assignments"][:rows], int(stored["trained_rows"]))
+
+        with self._lock:
+            self._snapshot = _Snapshot(vectors, meta, ivf, manifest["model"], dim)
+            self._manifest_mtime = mtime
+        logger.info(f"Loaded embedding index: {rows} rows ({int(meta['live'].sum())} live), dim {dim}")
+
+    # ===== Search =====
+
+    def search(
+        self,
+        query,
+        limit: int = 10,
+        kind: Optional[int] = None,
+        exclude: Optional[SourceKey] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Top passages by cosine similarity to a query embedding.
+
+        Scans every row with one matrix-vector product, or only the
+        EMBEDDING_ANN_PROBES nearest clusters when the IVF index exists.
+
+        Args:
+            query: Query embedding (dim,)
+            limit: Max results
+            kind: Only return rows of this kind (KIND_LESSON, KIND_VOCABULARY)
+            exclude: A (kind, source_id) whose own rows are skipped
+        """
+        import numpy as np
+
+        snapshot = self._snapshot
+        if snapshot is None or not len(snapshot.meta):
+            return []
+        query = _normalize(query)
+        if query.shape != (snapshot.dim,):
+            raise ValueError(f"Query embedding has shape {query.shape}, index dimension is {snapshot.dim}")
+
+        if snapshot.ivf is not None:
+            ivf = snapshot.ivf
+            probes = np.argsort(-(ivf.centroids @ query))[:max(settings.EMBEDDING_ANN_PROBES, 1)]
+            rows = np.concatenate([ivf.order[ivf.offsets[c]:ivf.offsets[c + 1]] for c in probes])
+            rows.sort()  # Sequential reads from the memory map
+            scores = snapshot.vectors[rows] @ query
+        else:
+            rows = np.arange(len(snapshot.meta))
+            scores = snapshot.vectors @ query
+
+        meta = snapshot.meta[rows]
+        keep = meta["live"].copy()
+        if kind is not None:
+            keep &= meta["kind"] == kind
+        if exclude is not None:
+            keep &= ~((meta["kind"] == exclude[0]) & (meta["source_id"] == exclude[1]))
+        candidates = np.flatnonzero(keep)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            {
+                "kind": KINDS[meta["kind"][i]],
+                "source_id": int(meta["source_id"][i]),
+                "start": int(meta["start"][i]),
+                "end": int(meta["end"][i]),
+                "version": int(meta["version"][i]),
+                "score": round(float(scores[i]), 4),
+            }
+            for i in candidates
+        ]
+
+    def source_vector(self, kind: int, source_id: int):
+        """Mean embedding of a source's live rows (e.g. a whole lesson), or None"""
+        import numpy as np
+
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        meta = snapshot.meta
+        rows = np.flatnonzero(meta["live"] & (meta["kind"] == kind) & (meta["source_id"] == source_id))
+        if not len(rows):
+            return None
+        return snapshot.vectors[rows].mean(axis=0)
+
+    # ===== Refresh =====
+
+    @contextmanager
+    def _writer_lock(self):
+        """Exclusive lock across processes; yields False if another process holds it"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(".lock"), "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _wanted_versions(self, db: Session) -> Dict[SourceKey, int]:
+        """Current version of every source that should be in the index"""
+        wanted = {}
+        for lesson_id, updated_at in db.query(Lesson.id, Lesson.updated_at).filter(Lesson.is_active.is_(True)):
+            wanted[(KIND_LESSON, lesson_id)] = source_version(updated_at)
+        sentences = db.query(VocabularyItem.id, VocabularyItem.example_sentence).filter(
+            VocabularyItem.example_sentence.isnot(None),
+            VocabularyItem.example_sentence != ""
+        )
+        for item_id, sentence in sentences:
+            wanted[(KIND_VOCABULARY, item_id)] = source_version(sentence)
+        return wanted
+
+    def _load_texts(self, db: Session, keys: List[SourceKey]) -> List[Tuple[SourceKey, int, str]]:
+        """(key, version, text) for sources to embed; versions are re-read with the text"""
+        lesson_ids = [source_id for kind, source_id in keys if kind == KIND_LESSON]
+        item_ids = [source_id for kind, source_id in keys if kind == KIND_VOCABULARY]
+        texts = []
+        if lesson_ids:
+            rows = db.query(
+                Lesson.id, Lesson.title, Lesson.description, Lesson.content, Lesson.updated_at
+            ).filter(Lesson.id.in_(lesson_ids))
+            for lesson_id, title, description, content, updated_at in rows:
+                texts.append(((KIND_LESSON, lesson_id), source_version(updated_at), lesson_text(title, description, content)))
+        if item_ids:
+            rows = db.query(VocabularyItem.id, VocabularyItem.example_sentence).filter(VocabularyItem.id.in_(item_ids))
+            for item_id, sentence in rows:
+                if sentence:
+                    texts.append(((KIND_VOCABULARY, item_id), source_version(sentence), sentence))
+        return texts
+
+    async def refresh(self, db: Session, ml_service: MLInferenceService) -> Dict[str, int]:
+        """
+        Embed new and changed sources and retire removed ones.
+
+        Returns:
+            Counts of embedded passages, sources updated and sources removed
+        """
+        import numpy as np
+
+        with self._writer_lock() as acquired:
+            if not acquired:
+                # Another worker is refreshing; pick up its last commit
+                await asyncio.to_thread(self.load)
+                return {"embedded": 0, "updated": 0, "removed": 0}
+
+            start = time.perf_counter()
+            await asyncio.to_thread(self.load)
+            snapshot = self._snapshot
+            model = ml_service.embedding_model
+            if snapshot is not None and snapshot.model != model:
+                logger.info(f"Text model changed from {snapshot.model} to {model}, rebuilding the embedding index")
+                snapshot = None
+
+            meta = snapshot.meta.copy() if snapshot is not None else np.zeros(0, dtype=META_DTYPE)
+            dim = snapshot.dim if snapshot is not None else 0
+            current = {
+                (int(kind), int(source_id)): int(version)
+                for kind, source_id, version in zip(
+                    meta["kind"][meta["live"]], meta["source_id"][meta["live"]], meta["version"][meta["live"]]
+                )
+            }
+            wanted = await asyncio.to_thread(self._wanted_versions, db)
+            stale = {key for key, version in current.items() if wanted.get(key) != version}
+            todo = [key for key, version in wanted.items() if current.get(key) != version]
+
+            if stale:
+                keys = np.array(sorted(stale), dtype=np.int64).reshape(-1, 2)
+                for kind in (KIND_LESSON, KIND_VOCABULARY):
+                    ids = keys[keys[:, 0] == kind, 1]
+                    meta["live"] &= ~((meta["kind"] == kind) & np.isin(meta["source_id"], ids))
+
+            vectors_path = self._path("vectors.f32")
+            if snapshot is None:
+                # Start a new file; readers keep mapping the old one until the manifest changes
+                if os.path.exists(self._path("manifest.json")):
+                    os.remove(self._path("manifest.json"))
+                open(vectors_path + ".tmp", "wb").close()
+                os.replace(vectors_path + ".tmp", vectors_path)
+            else:
+                # Drop rows appended by an interrupted refresh
+                os.truncate(vectors_path, len(meta) * dim * 4)
+
+            embedded = 0
+            batch_size = max(settings.EMBEDDING_BATCH_SIZE, 1)
+            for i in range(0, len(todo), LESSON_CHUNK):
+                passages = []  # (key, version, start, end, text)
+                for key, version, text in await asyncio.to_thread(self._load_texts, db, todo[i:i + LESSON_CHUNK]):
+                    spans = split_passages(text, self.passage_chars) if key[0] == KIND_LESSON else [(0, len(text))]
+                    passages.extend((key, version, s, e, text[s:e]) for s, e in spans)
+
+                for j in range(0, len(passages), batch_size):
+                    batch = passages[j:j + batch_size]
+                    result = await ml_service.embed([p[4] for p in batch], settings.EMBEDDING_CONCURRENCY)
+                    vectors = _normalize(result["embeddings"])
+                    dim = dim or vectors.shape[1]
+                    with open(vectors_path, "ab") as f:
+                        f.write(vectors.tobytes())
+                    rows = np.array(
+                        [(key[0], key[1], s, e, version, True) for key, version, s, e, _ in batch],
+                        dtype=META_DTYPE
+                    )
+                    meta = np.concatenate([meta, rows])
+                    embedded += len(batch)
+
+            if not stale and not embedded and snapshot is not None:
+                return {"embedded": 0, "updated": 0, "removed": 0}
+
+            await asyncio.to_thread(self._commit, meta, dim, snapshot, model)
+
+        removed = len(stale - set(todo))
+        logger.info(
+            f"Embedding index refreshed in {time.perf_counter() - start:.1f}s: "
+            f"{embedded} passages embedded, {len(todo)} sources updated, {removed} removed"
+        )
+        return {"embedded": embedded, "updated": len(todo), "removed": removed}
+
+    def _commit(self, meta, dim: int, previous: Optional[_Snapshot], model: str):
+        """Compact if needed, update the IVF index, then publish the new manifest"""
+        import numpy as np
+
+        vectors_path = self._path("vectors.f32")
+        ivf = previous.ivf if previous is not None else None
+        dead = int((~meta["live"]).sum())
+        if dead > COMPACT_MIN_DEAD and dead > len(meta) - dead:
+            keep = np.flatnonzero(meta["live"])
+            source = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(len(meta), dim))
+            with open(vectors_path + ".tmp", "wb") as f:
+                for i in range(0, len(keep), 65536):
+                    f.write(np.ascontiguousarray(source[keep[i:i + 65536]]).tobytes())
+            del source
+            os.replace(vectors_path + ".tmp", vectors_path)
+            meta = meta[keep]
+            ivf = None  # Retrained below on the compacted rows
+            logger.info(f"Compacted embedding index: dropped {dead} dead rows")
+
+        vectors = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(len(meta), dim)) if len(meta) \
+            else np.zeros((0, dim), dtype=np.float32)
+        live = int(meta["live"].sum())
+        if live < settings.EMBEDDING_ANN_MIN_ROWS:
+            ivf = None
+        elif ivf is None or live > 2 * ivf.trained_rows:
+            ivf = self._train_ivf(vectors, meta)
+        elif len(ivf.assignments) < len(meta):
+            ivf = self._assign_new_rows(vectors, ivf)
+
+        self._save(self._path("meta.npy"), lambda f: np.save(f, meta))
+        if ivf is not None:
+            self._save(self._path("ivf.npz"), lambda f: np.savez(
+                f, centroids=ivf.centroids, assignments=ivf.assignments, trained_rows=ivf.trained_rows
+            ))
+        elif os.path.exists(self._path("ivf.npz")):
+            os.remove(self._path("ivf.npz"))
+        manifest = {"model": model, "dim": dim, "rows": len(meta)}
+        self._save(self._path("manifest.json"), lambda f: f.write(json.dumps(manifest).encode()))
+        self.load()
+
+    def _save(self, path: str, write):
+        """Write a file atomically (temp file + rename)"""
+        with open(path + ".tmp", "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _nearest_centroids(self, vectors, centroids, rows=None):
+        """Cluster of each row, in chunks to bound memory"""
+        import numpy as np
+
+        rows = np.arange(len(vectors)) if rows is None else rows
+        assignments = np.empty(len(rows), dtype=np.int32)
+        for i in range(0, len(rows), 65536):
+            chunk = rows[i:i + 65536]
+            assignments[i:i + 65536] = np.argmax(vectors[chunk] @ centroids.T, axis=1)
+        return assignments
+
+    def _train_ivf(self, vectors, meta) -> _IVF:
+        """Spherical k-means on a sample of live rows, then assign every row"""
+        import numpy as np
+
+        live = np.flatnonzero(meta["live"])
+        lists = settings.EMBEDDING_ANN_LISTS or int(np.sqrt(len(live)))
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(live, min(len(live), lists * KMEANS_SAMPLE_PER_LIST), replace=False))
+        points = np.asarray(vectors[sample])
+        centroids = points[rng.choice(len(points), lists, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            labels = np.argmax(points @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, points)
+            empty = np.bincount(labels, minlength=lists) == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        logger.info(f"Trained IVF index: {lists} clusters over {len(live)} passages")
+        return _with_order(centroids, self._nearest_centroids(vectors, centroids), len(live))
+
+    def _assign_new_rows(self, vectors, ivf: _IVF) -> _IVF:
+        import numpy as np
+
+        new_rows = np.arange(len(ivf.assignments), len(vectors))
+        assignments = np.concatenate([ivf.assignments, self._nearest_centroids(vectors, ivf.centroids, new_rows)])
+        return _with_order(ivf.centroids, assignments, ivf.trained_rows)
+
+
+embedding_index = EmbeddingIndex(settings.EMBEDDING_INDEX_DIR, settings.EMBEDDING_PASSAGE_CHARS)
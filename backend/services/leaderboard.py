@@ -0,0 +1,193 @@
+"""
+In-memory leaderboards over the user_stats rollups.
+
+UserStats is the persisted, incrementally maintained aggregate; the
+sorted sets here are loaded from it at startup and updated after each
+committed stats change, so top-N and rank queries never touch the DB.
+"""
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from models.database import User, UserStats
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Leaderboard metric -> UserStats column
+METRICS = {
+    "score": "total_score",
+    "time_spent": "total_time_spent",
+    "words_mastered": "words_mastered",
+}
+
+
+def stats_snapshot(stats: UserStats) -> Dict[str, int]:
+    """Read leaderboard metric values from a stats row"""
+    return {metric: getattr(stats, column) or 0 for metric, column in METRICS.items()}
+
+
+class RankedSet:
+    """
+    Sorted set of (score, user_id) supporting rank queries.
+
+    Entries are kept in a list ordered by descending score, then user id.
+    Rank and top-N are O(log n) bisections; updates are a bisection plus
+    a list insert/delete (a memmove, fast well past 100k users).
+    """
+
+    def __init__(self):
+        self._items: List[Tuple[int, int]] = []  # (-score, user_id)
+        self._scores: Dict[int, int] = {}
+        self._total = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def update(self, user_id: int, score: int):
+        """Insert a user or move them to a new score"""
+        with self._lock:
+            old = self._scores.get(user_id)
+            if old == score:
+                return
+            if old is not None:
+                index = bisect_left(self._items, (-old, user_id))
+                del self._items[index]
+                self._total -= old
+            insort(self._items, (-score, user_id))
+            self._scores[user_id] = score
+            self._total += score
+
+    def remove(self, user_id: int):
+        with self._lock:
+            old = self._scores.pop(user_id, None)
+            if old is not None:
+                index = bisect_left(self._items, (-old, user_id))
+                del self._items[index]
+                self._total -= old
+
+    def score(self, user_id: int) -> Optional[int]:
+        return self._scores.get(user_id)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based rank; tied users share the best rank"""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect_left(self._items, (-score, -1)) + 1
+
+    def top(self, n: int, offset: int = 0) -> List[Tuple[int, int]]:
+        """Return up to n (user_id, score) pairs starting at offset"""
+        items = self._items[offset:offset + n]
+        return [(user_id, -neg_score) for neg_score, user_id in items]
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean and percentiles, read directly from sorted positions"""
+        items = self._items
+        count = len(items)
+        if count == 0:
+            return {"count": 0, "mean": 0.0, "min": 0, "median": 0, "p90": 0, "max": 0}
+
+        def percentile(p: float) -> int:
+            # items are descending, so the p-th percentile sits (1 - p) from the top
+            return -items[min(count - 1, int((1 - p) * count))][0]
+
+        return {
+            "count": count,
+            "mean": self._total / count,
+            "min": -items[-1][0],
+            "median": percentile(0.5),
+            "p90": percentile(0.9),
+            "max": -items[0][0],
+        }
+
+
+class Leaderboards:
+    """Global and per-cohort (User.level) ranked sets for each metric"""
+
+    def __init__(self):
+        self._boards: Dict[Tuple[str, Optional[str]], RankedSet] = {}
+        self._cohorts: Dict[int, Optional[str]] = {}
+        self._synced_at: Optional[datetime] = None
+
+    def board(self, metric: str, cohort: Optional[str] = None) -> RankedSet:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown leaderboard metric: {metric}")
+        key = (metric, cohort)
+        if key not in self._boards:
+            self._boards[key] = RankedSet()
+        return self._boards[key]
+
+    def load(self, db: Session):
+        """Rebuild all boards from user_stats"""
+        self._boards = {}
+        self._cohorts = {}
+        self._synced_at = None
+        count = self.sync(db)
+        logger.info(f"Loaded leaderboards for {count} users")
+
+    def sync(self, db: Session) -> int:
+        """
+        Apply stats rows changed since the last sync.
+
+        Keeps boards consistent across worker processes, each of which
+        only sees its own writes directly.
+
+        Returns:
+            Number of rows applied
+        """
+        query = (
+            db.query(UserStats, User.level)
+            .join(User, User.id == UserStats.user_id)
+        )
+        if self._synced_at is not None:
+            # Look back past the watermark: a row stamped before it may commit after this
+            # sync ran. Re-applying a row is a no-op.
+            overlap = timedelta(seconds=settings.SYNC_CURSOR_OVERLAP_SECONDS)
+            query = query.filter(UserStats.updated_at >= self._synced_at - overlap)
+
+        rows = query.all()
+        for stats, level in rows:
+            self.update(stats.user_id, stats_snapshot(stats), level)
+            if stats.updated_at and (self._synced_at is None or stats.updated_at > self._synced_at):
+                self._synced_at = stats.updated_at
+        return len(rows)
+
+    def update(self, user_id: int, values: Dict[str, int], cohort: Optional[str] = None):
+        """
+        Apply a user's current metric values.
+
+        Args:
+            user_id: User ID
+            values: Metric name -> value, as produced by stats_snapshot
+            cohort: User level; defaults to the last known cohort
+        """
+        if cohort is not None:
+            previous = self._cohorts.get(user_id)
+            if previous is not None and previous != cohort:
+                for metric in METRICS:
+                    self.board(metric, previous).remove(user_id)
+            self._cohorts[user_id] = cohort
+        else:
+            cohort = self._cohorts.get(user_id)
+
+        for metric, value in values.items():
+            self.board(metric).update(user_id, value)
+            if cohort is not None:
+                self.board(metric, cohort).update(user_id, value)
+
+    def record(self, db: Session, user_id: int, values: Dict[str, int]):
+        """Apply committed metric values, resolving the cohort on first sight"""
+        cohort = self._cohorts.get(user_id)
+        if cohort is None:
+            cohort = db.query(User.level).filter(User.id == user_id).scalar()
+        self.update(user_id, values, cohort)
+
+    def cohort_of(self, user_id: int) -> Optional[str]:
+        return self._cohorts.get(user_id)
+
+
+leaderboards = Leaderboards()
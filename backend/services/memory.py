@@ -0,0 +1,39 @@
+"""
+Process memory accounting.
+
+RSS over-counts memory shared between forked workers. USS (unique set
+size: private clean + private dirty pages) is what each worker really
+costs; PSS splits shared pages evenly between the processes using them.
+"""
+from typing import Dict, Optional, Union
+
+
+def read_memory(pid: Union[int, str] = "self") -> Optional[Dict[str, int]]:
+    """
+    Read RSS, PSS, USS and shared bytes for a process from /proc.
+
+    Returns:
+        {"rss": int, "pss": int, "uss": int, "shared": int} in bytes,
+        or None where /proc/<pid>/smaps_rollup is unavailable
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3 and parts[0].endswith(":"):
+                    fields[parts[0][:-1]] = int(parts[1]) * 1024  # Values are in kB
+    except (OSError, ValueError):
+        return None
+
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": private,
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+def format_bytes(value: int) -> str:
+    return f"{value / (1024 * 1024):.1f}MiB"
@@ -0,0 +1,338 @@
+"""
+Lightweight Prometheus-style metrics.
+
+Implements counters, gauges and histograms with the Prometheus text
+exposition format, without extra dependencies. Instrumentation is only
+installed when METRICS_ENABLED is set, so a disabled deployment pays
+nothing on the hot path.
+
+Each process keeps its own registry, so every sample carries a worker
+label (the serve.py worker index, or the pid outside serve.py). Scrapes
+that land on different workers behind a shared port then update
+separate series instead of making counters jump backwards; aggregate
+with sum without (worker) in queries.
+"""
+import os
+import resource
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from config import settings
+from services.memory import read_memory
+
+# Latency buckets in seconds, from sub-millisecond DB calls to slow model inference
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+_worker = str(os.getpid())
+
+
+def set_worker(worker) -> None:
+    """Label this process's samples; called by serve.py in each forked worker"""
+    global _worker, _start_time
+    _worker = str(worker)
+    _start_time = time.time()
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'worker="{_escape(_worker)}"']
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = Lock()
+
+    def labels(self, *values: str):
+        """Get the child metric for a set of label values"""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            yield f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            callback: Optional function evaluated at scrape time (unlabelled gauges only)
+        """
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def samples(self):
+        if self.callback is not None:
+            yield f"{self.name}{_format_labels((), ())} {_format_value(self.callback())}"
+            return
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            cumulative = 0
+            bounds = list(child.upper_bounds) + [float("inf")]
+            for bound, count in zip(bounds, child.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    """Collection of metrics exposed together"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def expose(self) -> str:
+        return "\n".join(metric.expose() for metric in self._metrics) + "\n"
+
+
+def _resident_memory_bytes() -> float:
+    """Current RSS from /proc, falling back to peak RSS where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+_start_time = time.time()
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"]
+))
+REQUESTS_IN_PROGRESS = registry.register(Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served"
+))
+INFERENCE_LATENCY = registry.register(Histogram(
+    "ml_inference_duration_seconds", "ML inference latency by operation and model",
+    ["operation", "model", "outcome"]
+))
+INFERENCE_IN_PROGRESS = registry.register(Gauge(
+    "ml_inference_in_progress", "ML inference calls in flight (queue depth) by operation",
+    ["operation"]
+))
+INFERENCE_QUEUE_DEPTH = registry.register(Gauge(
+    "ml_inference_queued", "ML inference calls waiting for a concurrency slot by model",
+    ["model"]
+))
+ADMISSION_REJECTED = registry.register(Counter(
+    "admission_rejected", "Requests rejected by rate limiting or load shedding",
+    ["reason"]
+))
+MODEL_LOAD_SECONDS = registry.register(Histogram(
+    "ml_model_load_duration_seconds", "Time to load a local model pipeline",
+    ["task", "model"], buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+))
+DB_QUERY_LATENCY = registry.register(Histogram(
+    "db_query_duration_seconds", "Database query latency by statement type",
+    ["statement"]
+))
+DB_QUERY_ERRORS = registry.register(Counter(
+    "db_query_errors", "Database queries that raised an error", ["statement"]
+))
+registry.register(Gauge(
+    "process_resident_memory_bytes", "Resident memory size in bytes",
+    callback=_resident_memory_bytes
+))
+registry.register(Gauge(
+    "process_unique_memory_bytes", "Memory private to this process (USS); excludes pages shared with other workers",
+    callback=lambda: (read_memory() or {}).get("uss", 0)
+))
+registry.register(Gauge(
+    "process_proportional_memory_bytes", "Proportional set size (PSS): private memory plus a share of shared pages",
+    callback=lambda: (read_memory() or {}).get("pss", 0)
+))
+registry.register(Gauge(
+    "process_start_time_seconds", "Start time of the process since unix epoch",
+    callback=lambda: _start_time
+))
+
+
+def observe_model_load(task: str, model: str, seconds: float):
+    """Record a model load time (no-op when metrics are disabled)"""
+    if settings.METRICS_ENABLED:
+        MODEL_LOAD_SECONDS.labels(task, model).observe(seconds)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency.
+
+    Uses the matched route template (e.g. /api/v1/lessons/{lesson_id})
+    as the label so cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        REQUESTS_IN_PROGRESS.labels().inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_PROGRESS.labels().dec()
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code
+            ).observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine):
+    """Attach SQLAlchemy event listeners timing every query"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        DB_QUERY_LATENCY.labels(_statement_type(statement)).observe(time.perf_counter() - start)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        starts = context.connection.info.get("query_start") if context.connection else None
+        if starts:
+            starts.pop()
+        DB_QUERY_ERRORS.labels(_statement_type(context.statement or "")).inc()
+
+
+def _statement_type(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
@@ -3,10 +3,9 @@ Hugging Face Inference API implementation.
 Uses Hugging Face's hosted API for model inference.
 """
 import asyncio
-from typing import Dict, Any, Optional
-import aiohttp
-from huggingface_hub import InferenceClient
+from typing import Dict, Any, List, Optional
 from services.ml_base import MLInferenceService
+from services.translation_router import translation_router
 from config import settings
 import logging
 
@@ -23,6 +22,8 @@ class HuggingFaceAPIService(MLInferenceService):
         Args:
             api_token: HF API token (optional for public models)
         """
+        from huggingface_hub import InferenceClient
+
         self.api_token = api_token
         self.client = InferenceClient(token=api_token)
         logger.info("Initialized Hugging Face API client")
@@ -33,19 +34,21 @@ class HuggingFaceAPIService(MLInferenceService):
         source_lang: str,
         target_lang: str
     ) -> Dict[str, Any]:
-        """Translate text using Helsinki-NLP models via API"""
+        """Translate text with the model(s) chosen by the translation router"""
         try:
-            # Helsinki-NLP translation models
-            model_name = f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}"
-
-            # Use async inference
-            result = await asyncio.to_thread(
-                self.client.translation,
-                text,
-                model=model_name
-            )
+            hops = translation_router.route(source_lang, target_lang)
 
-            translated_text = result.translation_text if hasattr(result, 'translation_text') else result
+            translated_text = text
+            for hop in hops:
+                kwargs = {"src_lang": hop.source_lang, "tgt_lang": hop.target_lang} if hop.multilingual else {}
+                # Use async inference
+                result = await asyncio.to_thread(
+                    self.client.translation,
+                    translated_text,
+                    model=hop.model,
+                    **kwargs
+                )
+                translated_text = result.translation_text if hasattr(result, 'translation_text') else result
 
             logger.info(f"Translated '{text[:50]}...' from {source_lang} to {target_lang}")
 
@@ -53,12 +56,41 @@ class HuggingFaceAPIService(MLInferenceService):
                 "translated_text": translated_text,
                 "source_lang": source_lang,
                 "target_lang": target_lang,
-                "model": model_name
+                "model": "+".join(hop.model for hop in hops) if hops else "identity"
             }
         except Exception as e:
             logger.error(f"Translation error: {str(e)}")
             raise
 
+    async def embed(
+        self,
+        texts: List[str],
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """Embed texts with the text model via the feature-extraction API, one call per text"""
+        import numpy as np
+
+        model_name = settings.TEXT_MODEL
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def embed_one(text: str):
+            async with semaphore:
+                features = await asyncio.to_thread(self.client.feature_extraction, text, model=model_name)
+            # Token embeddings (1, tokens, dim) -> mean-pooled (dim,)
+            features = np.asarray(features, dtype=np.float32)
+            return features.reshape(-1, features.shape[-1]).mean(axis=0)
+
+        try:
+            embeddings = await asyncio.gather(*(embed_one(text) for text in texts))
+            logger.info(f"Embedded {len(texts)} texts")
+            return {
+                "embeddings": np.stack(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32),
+                "model": model_name
+            }
+        except Exception as e:
+            logger.error(f"Embedding error: {str(e)}")
+            raise
+
     async def transcribe_audio(
         self,
         audio_path: str,
@@ -2,20 +2,33 @@
 Base classes for ML inference services.
 Supports both API-based and local model inference.
 """
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from enum import Enum
+from config import settings
 
 
 class InferenceMode(Enum):
     """Mode for ML inference"""
     API = "api"  # Use Hugging Face Inference API
     LOCAL = "local"  # Use local models
+    STUB = "stub"  # Canned results with simulated latency (load tests)
 
 
 class MLInferenceService(ABC):
     """Abstract base class for ML inference services"""
 
+    @property
+    def embedding_model(self) -> str:
+        """
+        Label of the vectors embed() returns.
+
+        Stored with the embedding index; an index built under another
+        label is rebuilt rather than mixed with these vectors.
+        """
+        return settings.TEXT_MODEL
+
     @abstractmethod
     async def translate(
         self,
@@ -41,6 +54,62 @@ class MLInferenceService(ABC):
         """
         pass
 
+    async def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """
+        Translate several texts at once.
+
+        The default runs translate() concurrently, at most `concurrency`
+        calls at a time; backends that can batch natively override it.
+
+        Returns:
+            {
+                "translated_texts": List[str],  # Same order as texts
+                "source_lang": str,
+                "target_lang": str,
+                "model": str
+            }
+        """
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def translate_one(text: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.translate(text, source_lang, target_lang)
+
+        results = await asyncio.gather(*(translate_one(text) for text in texts))
+        return {
+            "translated_texts": [result["translated_text"] for result in results],
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "model": results[0]["model"] if results else "identity"
+        }
+
+    @abstractmethod
+    async def embed(
+        self,
+        texts: List[str],
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """
+        Compute sentence/passage embeddings with the text model.
+
+        Args:
+            texts: Texts to embed
+            concurrency: Max concurrent calls, for backends without native batching
+
+        Returns:
+            {
+                "embeddings": numpy float32 array (len(texts), dim), mean-pooled, not normalized
+                "model": str
+            }
+        """
+        pass
+
     @abstractmethod
     async def transcribe_audio(
         self,
@@ -1,9 +1,10 @@
 """
 Factory for creating ML inference services.
 Automatically selects API or local based on configuration.
+Backends are imported on first use to keep their dependencies off the startup path.
 """
+from threading import Lock
 from services.ml_base import MLInferenceService, InferenceMode
-from services.ml_api import HuggingFaceAPIService
 from config import settings
 import logging
 
@@ -14,6 +15,7 @@ class MLServiceFactory:
     """Factory for creating ML inference services"""
 
     _instance: MLInferenceService = None
+    _lock = Lock()  # The warm-up thread and the first requests may race to create it
 
     @classmethod
     def get_service(
@@ -25,28 +27,64 @@ class MLServiceFactory:
         Get or create ML inference service.
 
         Args:
-            mode: Inference mode (API or LOCAL)
+            mode: Inference mode (API, LOCAL or STUB)
             api_token: Hugging Face API token (for API mode)
 
         Returns:
             MLInferenceService instance
         """
-        if cls._instance is None:
+        if cls._instance is not None:
+            return cls._instance
+
+        with cls._lock:
+            if cls._instance is not None:
+                return cls._instance
+
             if mode == InferenceMode.API:
                 logger.info("Creating Hugging Face API service")
-                cls._instance = HuggingFaceAPIService(api_token=api_token)
+                from services.ml_api import HuggingFaceAPIService
+                service = HuggingFaceAPIService(api_token=api_token)
             elif mode == InferenceMode.LOCAL:
                 logger.info("Creating local model service")
                 from services.ml_local import LocalModelService
-                cls._instance = LocalModelService(
-                    cache_dir=settings.HF_HOME
+                service = LocalModelService(
+                    cache_dir=settings.HF_HOME,
+                    max_translation_models=settings.MAX_LOADED_TRANSLATION_MODELS
                 )
+            elif mode == InferenceMode.STUB:
+                logger.info("Creating stub ML service")
+                from services.ml_stub import StubMLService
+                service = StubMLService(latency_ms=settings.STUB_LATENCY_MS)
             else:
                 raise ValueError(f"Unknown inference mode: {mode}")
 
-        return cls._instance
+            if settings.METRICS_ENABLED or settings.TRACING_ENABLED:
+                from services.ml_instrumented import InstrumentedMLService
+                service = InstrumentedMLService(service)
+
+            # Outermost, so queued calls are not counted as in-flight inference
+            if settings.ADMISSION_CONTROL_ENABLED:
+                from services.admission import AdmissionControlledMLService
+                service = AdmissionControlledMLService(service)
+
+            # Published only once fully wrapped; a failed attempt leaves nothing behind
+            cls._instance = service
+            return service
 
     @classmethod
     def reset(cls):
         """Reset the singleton instance (useful for testing)"""
         cls._instance = None
+
+
+def get_ml_service() -> MLInferenceService:
+    """
+    Get the ML inference service configured in settings.
+
+    The first call may import heavy backends; call it from a thread
+    (FastAPI runs this dependency in its threadpool), not the event loop.
+    """
+    return MLServiceFactory.get_service(
+        mode=InferenceMode(settings.INFERENCE_MODE),
+        api_token=settings.HF_API_TOKEN
+    )
@@ -0,0 +1,108 @@
+"""
+Metrics wrapper for ML inference services.
+Records per-model latency and in-flight calls for any MLInferenceService,
+plus an inference span on the current request trace.
+"""
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List
+from services.ml_base import MLInferenceService
+from services.metrics import INFERENCE_LATENCY, INFERENCE_IN_PROGRESS
+from services.tracing import record_span
+
+
+class InstrumentedMLService(MLInferenceService):
+    """Delegates to another MLInferenceService and times each call"""
+
+    def __init__(self, service: MLInferenceService):
+        """
+        Args:
+            service: The inference service to wrap
+        """
+        self.service = service
+
+    def __getattr__(self, name):
+        # Expose wrapped service attributes (client, models, device, ...)
+        return getattr(self.service, name)
+
+    @property
+    def embedding_model(self) -> str:
+        return self.service.embedding_model
+
+    @asynccontextmanager
+    async def _track(self, operation: str, outcome: Dict[str, Any]):
+        in_progress = INFERENCE_IN_PROGRESS.labels(operation)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            outcome["status"] = "error"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            INFERENCE_LATENCY.labels(
+                operation,
+                outcome.get("model", "unknown"),
+                outcome.get("status", "success")
+            ).observe(elapsed)
+            record_span("inference", elapsed)
+
+    async def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str
+    ) -> Dict[str, Any]:
+        outcome = {"model": f"{source_lang}-{target_lang}"}
+        async with self._track("translate", outcome):
+            result = await self.service.translate(text, source_lang, target_lang)
+            outcome["model"] = result.get("model", outcome["model"])
+        return result
+
+    async def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        outcome = {"model": f"{source_lang}-{target_lang}"}
+        async with self._track("translate_batch", outcome):
+            result = await self.service.translate_batch(texts, source_lang, target_lang, concurrency)
+            outcome["model"] = result.get("model", outcome["model"])
+        return result
+
+    async def embed(
+        self,
+        texts: List[str],
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        outcome = {}
+        async with self._track("embed", outcome):
+            result = await self.service.embed(texts, concurrency)
+            outcome["model"] = result.get("model", "unknown")
+        return result
+
+    async def transcribe_audio(
+        self,
+        audio_path: str,
+        language: str = "en"
+    ) -> Dict[str, Any]:
+        outcome = {}
+        async with self._track("transcribe_audio", outcome):
+            result = await self.service.transcribe_audio(audio_path, language)
+            outcome["model"] = result.get("model", "unknown")
+        return result
+
+    async def analyze_text(
+        self,
+        text: str,
+        task: str = "sentiment"
+    ) -> Dict[str, Any]:
+        outcome = {}
+        async with self._track(f"analyze_text:{task}", outcome):
+            result = await self.service.analyze_text(text, task)
+            outcome["model"] = result.get("model", "unknown")
+        return result
@@ -2,9 +2,24 @@
 Local model inference implementation.
 Uses locally downloaded models for inference.
 Requires: transformers, torch, librosa (install with: uv sync --extra local)
+
+Pipelines run in worker threads (asyncio.to_thread), so model loads and
+inference never block the event loop serving other requests. Each model
+loads under its own lock, so a cold load only delays callers of that
+model, and each pipeline runs one call at a time: HF pipelines and fast
+tokenizers are not thread-safe.
 """
-from typing import Dict, Any, Optional
+import asyncio
+import time
+from contextlib import contextmanager
+from threading import Lock
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
 from services.ml_base import MLInferenceService
+from services.metrics import observe_model_load
+from services.tracing import record_span
+from services.translation_router import translation_router
+from config import settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,12 +33,13 @@ class LocalModelService(MLInferenceService):
         uv sync --extra local
     """
 
-    def __init__(self, cache_dir: str = "./data/models"):
+    def __init__(self, cache_dir: str = "./data/models", max_translation_models: int = 4):
         """
         Initialize local model service.
 
         Args:
             cache_dir: Directory to cache downloaded models
+            max_translation_models: Translation pipelines kept loaded at once
         """
         try:
             from transformers import pipeline
@@ -36,23 +52,74 @@ class LocalModelService(MLInferenceService):
 
         self.cache_dir = cache_dir
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.models = {}
+        self.max_translation_models = max_translation_models
+        self.models = OrderedDict()  # Least recently used first
+        self._models_lock = Lock()  # Guards the dicts below and eviction, never held during a load
+        self._load_locks: Dict[str, Lock] = {}  # Per pipeline key: one load at a time
+        self._run_locks: Dict[str, Lock] = {}  # Per pipeline key: one call at a time
         logger.info(f"Initialized local model service (device: {self.device})")
 
     def _get_pipeline(self, task: str, model: str):
-        """Get or create a pipeline for a task"""
-        from transformers import pipeline
-
+        """Get or create a pipeline for a task, loading each model once"""
         key = f"{task}:{model}"
-        if key not in self.models:
+        loaded = self.models.get(key)
+        if loaded is not None:
+            self._touch(key)
+            return loaded
+
+        with self._models_lock:
+            load_lock = self._load_locks.setdefault(key, Lock())
+        with load_lock:
+            loaded = self.models.get(key)
+            if loaded is not None:
+                return loaded
+
+            from transformers import pipeline
+
             logger.info(f"Loading model: {model}")
-            self.models[key] = pipeline(
+            start = time.perf_counter()
+            loaded = pipeline(
                 task,
                 model=model,
                 device=self.device,
                 cache_dir=self.cache_dir
             )
-        return self.models[key]
+            elapsed = time.perf_counter() - start
+            observe_model_load(task, model, elapsed)
+            record_span("model_load", elapsed)
+            logger.info(f"Loaded model {model} in {elapsed:.1f}s")
+
+            with self._models_lock:
+                self._run_locks.setdefault(key, Lock())
+                self.models[key] = loaded
+                if task == "translation":
+                    self._evict_translation_models()
+            return loaded
+
+    def _touch(self, key: str):
+        """Mark a pipeline as recently used"""
+        try:
+            self.models.move_to_end(key)
+        except KeyError:
+            pass  # Evicted meanwhile; the caller still holds a reference
+
+    @contextmanager
+    def _pipeline(self, task: str, model: str):
+        """A pipeline held for exclusive use until the block exits (blocking)"""
+        loaded = self._get_pipeline(task, model)
+        with self._run_locks[f"{task}:{model}"]:
+            yield loaded
+
+    def _evict_translation_models(self):
+        """Unload least recently used translation pipelines beyond the cap"""
+        loaded = [key for key in self.models if key.startswith("translation:")]
+        for key in loaded[:max(len(loaded) - self.max_translation_models, 0)]:
+            del self.models[key]
+            logger.info(f"Unloaded model {key.split(':', 1)[1]} (translation model cap reached)")
+
+    def preload(self, task: str, model: str):
+        """Load a pipeline ahead of the first request (e.g. before forking workers)"""
+        self._get_pipeline(task, model)
 
     async def translate(
         self,
@@ -60,12 +127,9 @@ class LocalModelService(MLInferenceService):
         source_lang: str,
         target_lang: str
     ) -> Dict[str, Any]:
-        """Translate text using local Helsinki-NLP models"""
-        model_name = f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}"
-        translator = self._get_pipeline("translation", model_name)
-
-        result = translator(text)[0]
-        translated_text = result['translation_text']
+        """Translate text with the model(s) chosen by the translation router"""
+        hops = translation_router.route(source_lang, target_lang)
+        translated_text = (await asyncio.to_thread(self._translate_hops, [text], hops))[0]
 
         logger.info(f"Translated '{text[:50]}...' from {source_lang} to {target_lang}")
 
@@ -73,6 +137,64 @@ class LocalModelService(MLInferenceService):
             "translated_text": translated_text,
             "source_lang": source_lang,
             "target_lang": target_lang,
+            "model": "+".join(hop.model for hop in hops) if hops else "identity"
+        }
+
+    async def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """Translate texts in one pipeline call per hop"""
+        hops = translation_router.route(source_lang, target_lang)
+        translated_texts = await asyncio.to_thread(self._translate_hops, list(texts), hops)
+
+        logger.info(f"Translated batch of {len(texts)} texts from {source_lang} to {target_lang}")
+
+        return {
+            "translated_texts": translated_texts,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "model": "+".join(hop.model for hop in hops) if hops else "identity"
+        }
+
+    def _translate_hops(self, texts: List[str], hops) -> List[str]:
+        """Run texts through each hop's pipeline in turn (blocking)"""
+        for hop in hops:
+            kwargs = {"src_lang": hop.source_lang, "tgt_lang": hop.target_lang} if hop.multilingual else {}
+            with self._pipeline("translation", hop.model) as translator:
+                outputs = translator(texts, batch_size=len(texts), **kwargs)
+            texts = [output['translation_text'] for output in outputs]
+        return texts
+
+    async def embed(
+        self,
+        texts: List[str],
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """Embed texts in one feature-extraction pipeline call"""
+        import numpy as np
+
+        model_name = settings.TEXT_MODEL
+
+        def extract():
+            with self._pipeline("feature-extraction", model_name) as extractor:
+                return extractor(texts, batch_size=len(texts), truncation=True)
+
+        outputs = await asyncio.to_thread(extract)
+
+        embeddings = []
+        for features in outputs:
+            # Token embeddings (1, tokens, dim) -> mean-pooled (dim,)
+            features = np.asarray(features, dtype=np.float32)
+            embeddings.append(features.reshape(-1, features.shape[-1]).mean(axis=0))
+
+        logger.info(f"Embedded {len(texts)} texts")
+
+        return {
+            "embeddings": np.stack(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32),
             "model": model_name
         }
 
@@ -83,9 +205,12 @@ class LocalModelService(MLInferenceService):
     ) -> Dict[str, Any]:
         """Transcribe audio using local Whisper model"""
         model_name = "openai/whisper-base"
-        transcriber = self._get_pipeline("automatic-speech-recognition", model_name)
 
-        result = transcriber(audio_path)
+        def transcribe():
+            with self._pipeline("automatic-speech-recognition", model_name) as transcriber:
+                return transcriber(audio_path)
+
+        result = await asyncio.to_thread(transcribe)
         text = result['text']
 
         logger.info(f"Transcribed audio from {audio_path}")
@@ -105,8 +230,12 @@ class LocalModelService(MLInferenceService):
         """Analyze text using local NLP models"""
         if task == "sentiment":
             model_name = "distilbert-base-uncased-finetuned-sst-2-english"
-            classifier = self._get_pipeline("text-classification", model_name)
-            result = classifier(text)
+
+            def classify():
+                with self._pipeline("text-classification", model_name) as classifier:
+                    return classifier(text)
+
+            result = await asyncio.to_thread(classify)
         else:
             raise ValueError(f"Unsupported task: {task}")
 
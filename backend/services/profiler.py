@@ -0,0 +1,123 @@
+"""
+Low-overhead sampling profiler.
+
+A background thread periodically snapshots the stacks of all other
+threads via sys._current_frames() and counts identical stacks. Output
+is in the collapsed ("folded") format understood by flamegraph.pl,
+speedscope and inferno. The profiled code is never instrumented, so
+overhead is bounded by the sampling interval.
+
+State is per process: under serve.py each worker has its own profiler,
+and a run samples only the worker that received the start request.
+status() reports the worker's pid so later calls can be matched to it.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cap on distinct stacks kept, so a long run cannot grow memory unbounded
+MAX_STACKS = 50000
+MAX_DEPTH = 128
+
+
+class SamplingProfiler:
+    """Samples all thread stacks at a fixed interval until stopped or timed out"""
+
+    def __init__(self):
+        self._stacks: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.interval = 0.01
+        self.samples = 0
+        self.dropped = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float = 0.01, duration: float = 30.0):
+        """
+        Start sampling, discarding any previous profile.
+
+        Args:
+            interval: Seconds between samples
+            duration: Seconds after which sampling stops automatically
+        """
+        with self._lock:
+            if self.running:
+                raise RuntimeError("Profiler is already running")
+            self._stacks = Counter()
+            self.samples = 0
+            self.dropped = 0
+            self.interval = interval
+            self.started_at = time.time()
+            self.stopped_at = None
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(duration,), name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+        logger.info(f"Sampling profiler started (interval={interval}s, duration={duration}s)")
+
+    def stop(self):
+        """Stop sampling; the collected profile stays available"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self, duration: float):
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + duration
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._collapse(frame)
+                if stack in self._stacks or len(self._stacks) < MAX_STACKS:
+                    self._stacks[stack] += 1
+                else:
+                    self.dropped += 1
+            self.samples += 1
+        self.stopped_at = time.time()
+        logger.info(f"Sampling profiler stopped after {self.samples} samples")
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None and len(names) < MAX_DEPTH:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            names.append(f"{module}:{code.co_name}")
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(names)
+
+    def collapsed(self) -> str:
+        """Profile in collapsed stack format: one 'frame;frame;... count' per line"""
+        stacks = list(self._stacks.items())
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "worker_pid": os.getpid(),
+            "running": self.running,
+            "interval": self.interval,
+            "samples": self.samples,
+            "distinct_stacks": len(self._stacks),
+            "dropped_samples": self.dropped,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+        }
+
+
+profiler = SamplingProfiler()
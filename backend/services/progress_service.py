@@ -0,0 +1,206 @@
+"""
+Reading progress business logic.
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+from models.database import Lesson, UserProgress, UserStats
+from models.schemas import OfflineProgressUpdate, UserProgressCreate
+from services.leaderboard import leaderboards, stats_snapshot
+from services.recommender import recommender
+from services.stats_service import UserStatsService, empty_stats
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Convert a client timestamp to naive UTC, matching stored datetimes"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class ProgressService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.stats = UserStatsService(db)
+
+    def get_current_progress(self, user_id: int) -> Optional[UserProgress]:
+        """
+        Get the book user is currently reading.
+
+        Returns the most recently accessed in-progress book.
+        """
+        return (
+            self.db.query(UserProgress)
+            .filter(
+                UserProgress.user_id == user_id,
+                UserProgress.status == "in_progress"
+            )
+            .order_by(UserProgress.last_accessed.desc())
+            .first()
+        )
+
+    def upsert_progress(self, progress_data: UserProgressCreate) -> UserProgress:
+        """
+        Create or update user progress (upsert).
+
+        The user's rollups are updated in the same transaction.
+        """
+        progress = (
+            self.db.query(UserProgress)
+            .filter(
+                UserProgress.user_id == progress_data.user_id,
+                UserProgress.lesson_id == progress_data.lesson_id
+            )
+            .first()
+        )
+        now = datetime.utcnow()
+        progress, stats = self._apply_progress(progress_data, progress, now, now)
+        snapshot = stats_snapshot(stats)
+
+        self.db.commit()
+        self.db.refresh(progress)
+        leaderboards.record(self.db, progress.user_id, snapshot)
+        recommender.invalidate(progress.user_id)
+        return progress
+
+    def upload_offline_progress(
+        self,
+        user_id: int,
+        updates: List[OfflineProgressUpdate]
+    ) -> Tuple[List[UserProgress], List[int]]:
+        """
+        Apply a batch of progress changes made while offline.
+
+        Conflicts are resolved last-writer-wins on the time each change was
+        made: an update older than the change the server last applied for
+        that lesson is skipped, whatever order devices upload in. Only the
+        latest update per lesson is applied. The batch is one transaction.
+
+        Returns:
+            (applied progress rows, lesson ids skipped as stale)
+        """
+        latest: Dict[int, OfflineProgressUpdate] = {}
+        for update in updates:
+            current = latest.get(update.lesson_id)
+            if current is None or _as_utc(update.updated_at) >= _as_utc(current.updated_at):
+                latest[update.lesson_id] = update
+
+        existing = {
+            progress.lesson_id: progress
+            for progress in self.db.query(UserProgress).filter(
+                UserProgress.user_id == user_id,
+                UserProgress.lesson_id.in_(latest)
+            )
+        }
+
+        now = datetime.utcnow()
+        applied, skipped, stats = [], [], None
+        for lesson_id, update in latest.items():
+            progress = existing.get(lesson_id)
+            made_at = _as_utc(update.updated_at)
+            # Rows written before client_updated_at existed fall back to the server write time
+            current = progress and (progress.client_updated_at or progress.last_accessed)
+            if current and current > made_at:
+                skipped.append(lesson_id)
+                continue
+            progress_data = UserProgressCreate(
+                user_id=user_id,
+                **update.model_dump(exclude_none=True, exclude={"updated_at"})
+            )
+            progress, stats = self._apply_progress(progress_data, progress, now, made_at)
+            applied.append(progress)
+
+        if stats is None:
+            return [], skipped
+
+        snapshot = stats_snapshot(stats)
+        self.db.commit()
+        for progress in applied:
+            self.db.refresh(progress)
+        leaderboards.record(self.db, user_id, snapshot)
+        recommender.invalidate(user_id)
+        return applied, skipped
+
+    def _apply_progress(
+        self,
+        progress_data: UserProgressCreate,
+        progress: Optional[UserProgress],
+        now: datetime,
+        made_at: datetime
+    ) -> Tuple[UserProgress, UserStats]:
+        """
+        Apply an upsert and its rollup deltas to the session without committing.
+
+        last_accessed is the server time (incremental sync filters on it);
+        made_at, when the change was made, is kept for conflict resolution.
+        """
+        if progress:
+            old_status = progress.status
+            old_time_spent = progress.time_spent or 0
+            old_score = progress.score or 0
+            for key, value in progress_data.model_dump(exclude_unset=True).items():
+                setattr(progress, key, value)
+            progress.last_accessed = now
+            progress.client_updated_at = made_at
+        else:
+            old_status = None
+            old_time_spent = 0
+            old_score = 0
+            progress = UserProgress(**progress_data.model_dump(), last_accessed=now, client_updated_at=made_at)
+            self.db.add(progress)
+
+        if progress.status in ("in_progress", "completed") and not progress.started_at:
+            progress.started_at = now
+        if progress.status == "completed" and not progress.completed_at:
+            progress.completed_at = now
+
+        stats = self.stats.record_progress(
+            progress.user_id,
+            old_status,
+            progress.status,
+            (progress.time_spent or 0) - old_time_spent,
+            (progress.score or 0) - old_score
+        )
+        return progress, stats
+
+    def get_summary(self, user_id: int) -> UserStats:
+        """
+        Get the user's precomputed progress rollups.
+
+        A user with no activity yet gets an empty summary; reads never
+        write, the row is created by the first progress or practice write.
+        """
+        stats = self.db.get(UserStats, user_id)
+        if stats is None:
+            stats = UserStats(user_id=user_id, **empty_stats())  # Transient, not added to the session
+        return stats
+
+    def get_library(
+        self,
+        user_id: int,
+        level: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Tuple[Lesson, Optional[UserProgress]]]:
+        """
+        Retrieve active lessons together with the user's progress on each.
+
+        Uses a single LEFT OUTER JOIN so the library needs one query.
+        """
+        query = (
+            self.db.query(Lesson, UserProgress)
+            .outerjoin(
+                UserProgress,
+                and_(
+                    UserProgress.lesson_id == Lesson.id,
+                    UserProgress.user_id == user_id
+                )
+            )
+            .filter(Lesson.is_active.is_(True))
+        )
+
+        if level:
+            query = query.filter(Lesson.level == level)
+
+        return query.order_by(Lesson.created_at.desc()).limit(limit).offset(offset).all()
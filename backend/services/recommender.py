@@ -0,0 +1,283 @@
+"""
+Book recommendations from vocabulary overlap.
+
+Keeps a sparse book x word incidence matrix of every active lesson's
+vocabulary (COO arrays sorted by book). A learner's known-word vector
+weights each word by mastery_level / 5, so one weighted bincount over the
+matrix gives, for every book at once, how much of its vocabulary the
+learner already knows. Books whose coverage is closest to
+RECOMMEND_TARGET_COVERAGE are the right difficulty: mostly familiar,
+with enough new words to learn from.
+
+The matrix is built during warm-up and rebuilt by a background task
+when lessons or vocabulary change; requests keep using the current
+matrix meanwhile and never rebuild it themselves.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.database import Lesson, User, UserProgress, VocabularyItem, VocabularyPractice
+from services.vocabulary_index import normalize_word
+from config import settings
+
+MAX_MASTERY = 5
+LEVEL_MATCH_BONUS = 0.1  # Tie-breaker favouring books at the learner's level
+LEVELS = ("beginner", "intermediate", "advanced")
+
+
+class _BookMatrix(NamedTuple):
+    lesson_ids: Any  # int64[n_books], row -> lesson id
+    levels: Any  # int8[n_books], index into LEVELS (-1 unknown)
+    titles: Dict[int, str]
+    rows: Any  # int32[nnz], book row of each non-zero
+    cols: Any  # int32[nnz], word column of each non-zero
+    sizes: Any  # float64[n_books], distinct words per book
+    item_cols: Any  # int32[max item id + 1], vocabulary item id -> word column (-1 none)
+    n_words: int
+    row_of: Dict[int, int]  # lesson id -> row
+
+
+class _UserEntry:
+    """Cached known-word vector and results for one user"""
+    __slots__ = ("created", "known_cols", "known_weights", "results")
+
+    def __init__(self, created: float, known_cols, known_weights):
+        self.created = created
+        self.known_cols = known_cols
+        self.known_weights = known_weights
+        self.results: Dict[Tuple[Optional[str], int], List[Dict[str, Any]]] = {}
+
+
+class Recommender:
+    """Scores every book for a learner with vectorized sparse operations"""
+
+    def __init__(self, target_coverage: float = 0.7, cache_size: int = 10000, cache_seconds: float = 300):
+        """
+        Initialize recommender.
+
+        Args:
+            target_coverage: Share of a book's vocabulary the learner should already know
+            cache_size: Max users with cached recommendations
+            cache_seconds: Max age of cached recommendations
+        """
+        self.target_coverage = target_coverage
+        self.cache_size = cache_size
+        self.cache_seconds = cache_seconds
+        self._matrix: Optional[_BookMatrix] = None
+        self._signature = None
+        self._cache: "OrderedDict[int, _UserEntry]" = OrderedDict()
+        self._lock = Lock()
+        self._build_lock = Lock()  # One build at a time
+
+    @property
+    def is_built(self) -> bool:
+        return self._matrix is not None
+
+    def _current_signature(self, db: Session):
+        """Cheap fingerprint of the data the matrix is built from"""
+        vocabulary = db.query(
+            func.count(VocabularyItem.id), func.max(VocabularyItem.id), func.max(VocabularyItem.updated_at)
+        ).one()
+        lessons = db.query(func.count(Lesson.id), func.max(Lesson.updated_at)).one()
+        return tuple(vocabulary) + tuple(lessons)
+
+    def build(self, db: Session):
+        """Build the book x word matrix from all active lessons"""
+        with self._build_lock:
+            self._build(db)
+
+    def refresh(self, db: Session) -> bool:
+        """
+        Rebuild if lessons or vocabulary changed.
+
+        Returns immediately (False) while another build is running.
+        """
+        if not self._build_lock.acquire(blocking=False):
+            return False
+        try:
+            if self._matrix is not None and self._current_signature(db) == self._signature:
+                return False
+            self._build(db)
+            return True
+        finally:
+            self._build_lock.release()
+
+    def _build(self, db: Session):
+        import numpy as np
+
+        signature = self._current_signature(db)
+        lessons = (
+            db.query(Lesson.id, Lesson.title, Lesson.level)
+            .filter(Lesson.is_active.is_(True))
+            .order_by(Lesson.id)
+            .all()
+        )
+        row_of = {lesson_id: row for row, (lesson_id, _, _) in enumerate(lessons)}
+
+        # Normalize each distinct spelling once; most words repeat across books
+        word_cols: Dict[str, int] = {}
+        spelling_cols: Dict[str, int] = {}
+        ids, rows, cols = [], [], []
+        for item_id, word, lesson_id in db.query(VocabularyItem.id, VocabularyItem.word, VocabularyItem.lesson_id):
+            col = spelling_cols.get(word)
+            if col is None:
+                col = spelling_cols[word] = word_cols.setdefault(normalize_word(word), len(word_cols))
+            ids.append(item_id)
+            rows.append(row_of.get(lesson_id, -1))
+            cols.append(col)
+
+        n_words = max(len(word_cols), 1)
+        ids = np.array(ids, dtype=np.int64)
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        # One non-zero per distinct (book, word); np.unique also sorts them by book
+        in_book = rows >= 0
+        keys = np.unique(rows[in_book] * n_words + cols[in_book])
+        item_cols = np.full(int(ids.max(initial=0)) + 1, -1, dtype=np.int32)
+        item_cols[ids] = cols
+
+        level_codes = {level: code for code, level in enumerate(LEVELS)}
+        matrix = _BookMatrix(
+            lesson_ids=np.array([lesson_id for lesson_id, _, _ in lessons], dtype=np.int64),
+            levels=np.array([level_codes.get(level, -1) for _, _, level in lessons], dtype=np.int8),
+            titles={lesson_id: title for lesson_id, title, _ in lessons},
+            rows=(keys // n_words).astype(np.int32),
+            cols=(keys % n_words).astype(np.int32),
+            sizes=np.bincount(keys // n_words, minlength=len(lessons)).astype(np.float64),
+            item_cols=item_cols,
+            n_words=len(word_cols),
+            row_of=row_of,
+        )
+
+        with self._lock:
+            self._matrix = matrix
+            self._signature = signature
+            self._cache.clear()
+
+    def invalidate(self, user_id: int):
+        """Drop a user's cached vector and recommendations (after practice or progress updates)"""
+        with self._lock:
+            self._cache.pop(user_id, None)
+
+    def _known_words(self, db: Session, matrix: _BookMatrix, user_id: int):
+        """
+        Sparse known-word vector: word columns and weights in (0, 1].
+
+        A word's weight is its best mastery_level / 5 over the vocabulary
+        items spelling it. Kept sparse so cached users cost memory in
+        proportion to their practice, not to the vocabulary size.
+        """
+        import numpy as np
+
+        practice = db.query(VocabularyPractice.vocabulary_id, VocabularyPractice.mastery_level).filter(
+            VocabularyPractice.user_id == user_id
+        ).all()
+        item_ids = np.array([item_id for item_id, _ in practice], dtype=np.int64)
+        levels = np.array([level or 0 for _, level in practice], dtype=np.float64)
+
+        in_range = item_ids < len(matrix.item_cols)
+        cols = matrix.item_cols[item_ids[in_range]]
+        levels = levels[in_range]
+        mapped = cols >= 0
+        known = np.zeros(matrix.n_words, dtype=np.float64)
+        np.maximum.at(known, cols[mapped], np.clip(levels[mapped], 0, MAX_MASTERY) / MAX_MASTERY)
+        known_cols = np.flatnonzero(known).astype(np.int32)
+        return known_cols, known[known_cols]
+
+    def recommend(
+        self,
+        db: Session,
+        user_id: int,
+        limit: int = 10,
+        level: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recommend the next books for a learner.
+
+        Completed books and books without vocabulary are skipped. The
+        user's known-word vector and results are cached until their
+        practice or progress changes, the matrix is rebuilt, or
+        RECOMMEND_CACHE_SECONDS pass.
+        """
+        import numpy as np
+
+        if self._matrix is None:
+            # Only before warm-up has built it; concurrent callers wait for one build
+            with self._build_lock:
+                if self._matrix is None:
+                    self._build(db)
+        now = time.monotonic()
+        key = (level, limit)
+        with self._lock:
+            matrix = self._matrix
+            entry = self._cache.get(user_id)
+            if entry is not None and now - entry.created < self.cache_seconds:
+                self._cache.move_to_end(user_id)
+                if key in entry.results:
+                    return entry.results[key]
+            else:
+                entry = None
+
+        if entry is None:
+            entry = _UserEntry(now, *self._known_words(db, matrix, user_id))
+        known = np.zeros(matrix.n_words, dtype=np.float64)
+        known[entry.known_cols] = entry.known_weights
+        # Sparse book x word matrix times the known vector, for every book at once
+        known_per_book = np.bincount(matrix.rows, weights=known[matrix.cols], minlength=len(matrix.lesson_ids))
+        sizes = matrix.sizes
+        coverage = np.divide(known_per_book, sizes, out=np.zeros_like(known_per_book), where=sizes > 0)
+
+        score = 1.0 - np.abs(coverage - self.target_coverage)
+        user_level = db.query(User.level).filter(User.id == user_id).scalar()
+        if user_level in LEVELS:
+            score += LEVEL_MATCH_BONUS * (matrix.levels == LEVELS.index(user_level))
+
+        score[sizes == 0] = -np.inf
+        if level is not None:
+            score[matrix.levels != LEVELS.index(level)] = -np.inf
+        completed = [
+            matrix.row_of[lesson_id]
+            for (lesson_id,) in db.query(UserProgress.lesson_id).filter(
+                UserProgress.user_id == user_id,
+                UserProgress.status == "completed"
+            )
+            if lesson_id in matrix.row_of
+        ]
+        score[completed] = -np.inf
+
+        candidates = np.flatnonzero(np.isfinite(score))
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-score[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-score[candidates], kind="stable")]
+
+        results = [
+            {
+                "lesson_id": int(matrix.lesson_ids[row]),
+                "title": matrix.titles[int(matrix.lesson_ids[row])],
+                "level": LEVELS[matrix.levels[row]] if matrix.levels[row] >= 0 else None,
+                "score": round(float(score[row]), 4),
+                "coverage": round(float(coverage[row]), 4),
+                "total_words": int(sizes[row]),
+                "new_words": int(round(sizes[row] - known_per_book[row])),
+            }
+            for row in candidates
+        ]
+
+        with self._lock:
+            if self._matrix is matrix:
+                entry.results[key] = results
+                self._cache[user_id] = entry
+                self._cache.move_to_end(user_id)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return results
+
+
+recommender = Recommender(
+    target_coverage=settings.RECOMMEND_TARGET_COVERAGE,
+    cache_size=settings.RECOMMEND_CACHE_SIZE,
+    cache_seconds=settings.RECOMMEND_CACHE_SECONDS
+)
@@ -0,0 +1,485 @@
+"""
+Tiered storage for pronunciation recordings.
+
+Uploads are written under UPLOAD_DIR/recordings/ with random 128-bit
+names sharded by their first four hex digits (recordings/3f/a2/3fa2...),
+so no directory grows past a few hundred files and paths are stable
+relative to UPLOAD_DIR, where the /audio endpoint serves them.
+
+Each recording moves through these tiers, tracked in RecordingStorage:
+    hot     As uploaded, for recent recordings that are played back often
+    cold    Re-encoded as mono Opus at RECORDING_COLD_BITRATE after
+            RECORDING_COLD_AFTER_DAYS (typically a tenth of a WAV upload)
+    purged  Audio deleted after RECORDING_RETENTION_DAYS; the recording
+            row keeps its transcription, score and feedback
+    missing File not found where the row says; looked for again on
+            every cycle and never treated as purged
+
+Each storage row keeps the content hash of its current file, so audio
+URLs are versioned without touching the file on the request path.
+
+Maintenance (adopting unsharded legacy files, purging and transcoding)
+works through indexed queries on RecordingStorage rather than directory
+scans, in batches of RECORDING_MAINTENANCE_BATCH. One process maintains
+at a time (file lock). Transcoding needs ffmpeg and is skipped without it.
+"""
+import fcntl
+import os
+import shutil
+import subprocess
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.database import PronunciationRecording, RecordingStorage
+from services.audio_store import audio_store
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+TIER_HOT = "hot"
+TIER_COLD = "cold"
+TIER_PURGED = "purged"
+TIER_MISSING = "missing"
+TIERS = (TIER_HOT, TIER_COLD, TIER_PURGED, TIER_MISSING)
+
+RECORDINGS_DIR = "recordings"
+COLD_FORMAT = ".ogg"
+TRANSCODE_TIMEOUT_SECONDS = 120
+MAX_TRANSCODE_ATTEMPTS = 3
+
+
+class RecordingStore:
+    """Writes recordings into sharded directories and moves them between storage tiers"""
+
+    def __init__(self, root: str, allowed_formats=None):
+        """
+        Initialize recording store.
+
+        Args:
+            root: Directory holding the audio files (UPLOAD_DIR)
+            allowed_formats: File extensions accepted for uploads
+        """
+        self.root = Path(root).resolve()
+        self.allowed_formats = {ext.lower() for ext in (allowed_formats or [COLD_FORMAT])}
+        self._ffmpeg_warned = False
+
+    def _new_path(self, extension: str) -> str:
+        """Fresh sharded path relative to the root"""
+        name = uuid.uuid4().hex
+        return f"{RECORDINGS_DIR}/{name[:2]}/{name[2:4]}/{name}{extension}"
+
+    def _resolve(self, relative_path: str) -> Optional[Path]:
+        """Absolute path of an existing file under the root, or None"""
+        path = (self.root / relative_path).resolve()
+        if not path.is_relative_to(self.root):
+            return None
+        return path if path.is_file() else None
+
+    def incoming_path(self) -> Path:
+        """
+        Temporary file for an upload in progress.
+
+        It is on the same filesystem as the shards, so save() moves it
+        into place with an atomic rename.
+        """
+        incoming = self.root / RECORDINGS_DIR / ".incoming"
+        incoming.mkdir(parents=True, exist_ok=True)
+        return incoming / f"{uuid.uuid4().hex}.part"
+
+    def save(
+        self,
+        db: Session,
+        user_id: int,
+        upload: Path,
+        extension: str,
+        vocabulary_id: Optional[int] = None
+    ) -> PronunciationRecording:
+        """
+        Store a completed upload as a new hot recording.
+
+        Args:
+            db: Database session
+            user_id: Owner of the recording
+            upload: Temporary file from incoming_path()
+            extension: File extension matching the audio format, e.g. ".wav"
+            vocabulary_id: Word the recording is a pronunciation of
+
+        Returns:
+            The committed recording, with its storage row
+        """
+        relative = self._new_path(extension)
+        target = self.root / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(upload, target)
+        size = target.stat().st_size
+        content_hash = audio_store.content_hash(target)
+
+        now = datetime.utcnow()
+        recording = PronunciationRecording(
+            user_id=user_id,
+            vocabulary_id=vocabulary_id,
+            audio_path=relative,
+            created_at=now
+        )
+        recording.storage = RecordingStorage(
+            user_id=user_id,
+            tier=TIER_HOT,
+            size_bytes=size,
+            original_size_bytes=size,
+            content_hash=content_hash,
+            stored_at=now
+        )
+        db.add(recording)
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            target.unlink(missing_ok=True)
+            raise
+        db.refresh(recording)
+        return recording
+
+    @contextmanager
+    def _maintenance_lock(self):
+        """Exclusive lock across processes; yields False if another process holds it"""
+        directory = self.root / RECORDINGS_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / ".maintenance.lock", "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def maintain(self, db: Session) -> Dict[str, int]:
+        """
+        Run one maintenance cycle: adopt, purge, then transcode.
+
+        Each step handles at most RECORDING_MAINTENANCE_BATCH recordings,
+        oldest first, so a backlog is worked off over several cycles.
+
+        Returns:
+            Counts of recordings adopted (or found again), transcoded and purged,
+            and bytes freed
+        """
+        counts = {"adopted": 0, "transcoded": 0, "purged": 0, "bytes_freed": 0}
+        with self._maintenance_lock() as acquired:
+            if not acquired:
+                return counts
+
+            start = time.perf_counter()
+            now = datetime.utcnow()
+            batch = settings.RECORDING_MAINTENANCE_BATCH
+            self._clean_incoming()
+            counts["adopted"] = self._adopt(db, batch)
+            self._hash_unversioned(db, batch)
+            if settings.RECORDING_RETENTION_DAYS > 0:
+                purged, freed = self._purge(db, now - timedelta(days=settings.RECORDING_RETENTION_DAYS), batch)
+                counts["purged"] = purged
+                counts["bytes_freed"] += freed
+            if settings.RECORDING_COLD_AFTER_DAYS > 0 and self._ffmpeg():
+                transcoded, freed = self._transcode_batch(
+                    db, now - timedelta(days=settings.RECORDING_COLD_AFTER_DAYS), batch
+                )
+                counts["transcoded"] = transcoded
+                counts["bytes_freed"] += freed
+
+        if counts["adopted"] or counts["transcoded"] or counts["purged"]:
+            logger.info(
+                f"Recording maintenance: {counts['adopted']} adopted, {counts['transcoded']} transcoded, "
+                f"{counts['purged']} purged, {counts['bytes_freed'] / 1e6:.1f}MB freed "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+        return counts
+
+    def _clean_incoming(self):
+        """Remove partial uploads left behind by crashed or dropped requests"""
+        cutoff = time.time() - 3600
+        for partial in (self.root / RECORDINGS_DIR / ".incoming").glob("*.part"):
+            try:
+                if partial.stat().st_mtime < cutoff:
+                    partial.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _adopt(self, db: Session, batch: int) -> int:
+        """
+        Start tracking recordings from before tiered storage and look again for missing files.
+
+        Files that are not found (outside UPLOAD_DIR, stored relative to an
+        old working directory, on an unmounted volume) are marked missing,
+        not purged, and rechecked on later cycles, least recently checked first.
+        """
+        legacy = (
+            db.query(PronunciationRecording)
+            .outerjoin(RecordingStorage)
+            .filter(RecordingStorage.recording_id.is_(None))
+            .order_by(PronunciationRecording.id)
+            .limit(batch)
+            .all()
+        )
+        missing = (
+            db.query(RecordingStorage, PronunciationRecording)
+            .join(PronunciationRecording)
+            .filter(RecordingStorage.tier == TIER_MISSING)
+            .order_by(RecordingStorage.checked_at)
+            .limit(batch)
+            .all()
+        )
+
+        adopted = 0
+        now = datetime.utcnow()
+        for recording, storage in [(recording, None) for recording in legacy] + [(r, s) for s, r in missing]:
+            if storage is None:
+                storage = recording.storage = RecordingStorage(
+                    user_id=recording.user_id, tier=TIER_MISSING, stored_at=recording.created_at or now
+                )
+            source = self._resolve(recording.audio_path)
+            if source is None:
+                if storage.checked_at is None:
+                    logger.warning(f"Recording {recording.id}: {recording.audio_path} not found under UPLOAD_DIR, will retry")
+                storage.tier = TIER_MISSING
+                storage.size_bytes = 0
+                storage.content_hash = None
+                storage.checked_at = now
+                continue
+
+            if not source.relative_to(self.root).as_posix().startswith(f"{RECORDINGS_DIR}/"):
+                relative = self._new_path(source.suffix.lower())
+                target = self.root / relative
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(source, target)
+                recording.audio_path = relative
+                source = target
+            size = source.stat().st_size
+            storage.tier = TIER_COLD if storage.transcoded_at else TIER_HOT
+            storage.size_bytes = size
+            storage.content_hash = audio_store.content_hash(source)
+            storage.original_size_bytes = storage.original_size_bytes or size
+            storage.checked_at = None
+            adopted += 1
+            # Commit per file: it has already moved
+            db.commit()
+        db.commit()
+        return adopted
+
+    def _hash_unversioned(self, db: Session, batch: int):
+        """Store content hashes for files tracked before hashes were recorded"""
+        rows = (
+            db.query(RecordingStorage, PronunciationRecording.audio_path)
+            .join(PronunciationRecording)
+            .filter(RecordingStorage.tier.in_((TIER_HOT, TIER_COLD)), RecordingStorage.content_hash.is_(None))
+            .limit(batch)
+            .all()
+        )
+        for storage, relative in rows:
+            path = self._resolve(relative)
+            if path is None:
+                storage.tier = TIER_MISSING
+                storage.size_bytes = 0
+                storage.checked_at = datetime.utcnow()
+                continue
+            storage.content_hash = audio_store.content_hash(path)
+        db.commit()
+
+    def _purge(self, db: Session, cutoff: datetime, batch: int):
+        """Delete the audio of recordings stored before the cutoff; rows are kept"""
+        expired = (
+            db.query(RecordingStorage, PronunciationRecording.audio_path)
+            .join(PronunciationRecording)
+            .filter(RecordingStorage.tier.in_((TIER_HOT, TIER_COLD)), RecordingStorage.stored_at < cutoff)
+            .order_by(RecordingStorage.stored_at)
+            .limit(batch)
+            .all()
+        )
+        freed = 0
+        now = datetime.utcnow()
+        for storage, _ in expired:
+            freed += storage.size_bytes
+            storage.tier = TIER_PURGED
+            storage.size_bytes = 0
+            storage.content_hash = None
+            storage.purged_at = now
+        db.commit()
+
+        # Files go after the commit: a crash in between leaves an orphan file, never a row pointing nowhere
+        for _, relative in expired:
+            path = self._resolve(relative)
+            if path is not None:
+                path.unlink(missing_ok=True)
+        return len(expired), freed
+
+    def _transcode_batch(self, db: Session, cutoff: datetime, batch: int):
+        """
+        Re-encode hot recordings stored before the cutoff.
+
+        A recording becomes cold only once the smaller copy has replaced
+        the original. Failed attempts are counted and retried on later
+        cycles up to MAX_TRANSCODE_ATTEMPTS; an output that is not smaller
+        is not retried.
+        """
+        candidates = (
+            db.query(RecordingStorage, PronunciationRecording)
+            .join(PronunciationRecording)
+            .filter(
+                RecordingStorage.tier == TIER_HOT,
+                RecordingStorage.stored_at < cutoff,
+                RecordingStorage.transcode_attempts < MAX_TRANSCODE_ATTEMPTS
+            )
+            .order_by(RecordingStorage.transcode_attempts, RecordingStorage.stored_at)
+            .limit(batch)
+            .all()
+        )
+        replaced: List[Path] = []
+        transcoded = 0
+        freed = 0
+        for storage, recording in candidates:
+            source = self._resolve(recording.audio_path)
+            if source is None:
+                # Rechecked by _adopt on later cycles
+                logger.warning(f"Recording {recording.id}: {recording.audio_path} is missing, will retry")
+                storage.tier = TIER_MISSING
+                storage.size_bytes = 0
+                storage.content_hash = None
+                storage.checked_at = datetime.utcnow()
+                continue
+
+            relative = self._new_path(COLD_FORMAT)
+            target = self.root / relative
+            error = self._transcode(source, target)
+            if error is not None:
+                storage.transcode_attempts += 1
+                storage.transcode_error = error[:200]
+                continue
+            size = target.stat().st_size
+            if size >= storage.size_bytes:
+                # Already compact (e.g. a low-bitrate upload); retrying would give the same result
+                target.unlink()
+                storage.transcode_attempts = MAX_TRANSCODE_ATTEMPTS
+                storage.transcode_error = f"Output ({size} bytes) not smaller than the original"
+                continue
+
+            freed += storage.size_bytes - size
+            storage.tier = TIER_COLD
+            storage.size_bytes = size
+            storage.content_hash = audio_store.content_hash(target)
+            storage.transcoded_at = datetime.utcnow()
+            storage.transcode_error = None
+            recording.audio_path = relative
+            replaced.append(source)
+            transcoded += 1
+        db.commit()
+
+        for path in replaced:
+            path.unlink(missing_ok=True)
+        return transcoded, freed
+
+    def _ffmpeg(self) -> Optional[str]:
+        """Path of the ffmpeg binary, or None (logged once)"""
+        ffmpeg = shutil.which(settings.FFMPEG_PATH)
+        if ffmpeg is None or COLD_FORMAT not in self.allowed_formats:
+            if not self._ffmpeg_warned:
+                reason = f"{settings.FFMPEG_PATH} not found" if ffmpeg is None else f"{COLD_FORMAT} files are not allowed"
+                logger.warning(f"Recording transcoding disabled: {reason}")
+                self._ffmpeg_warned = True
+            return None
+        return ffmpeg
+
+    def _transcode(self, source: Path, target: Path) -> Optional[str]:
+        """
+        Encode source as mono Opus in Ogg; the target appears only when complete.
+
+        Returns:
+            None on success, otherwise the error
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".part")
+        command = [
+            self._ffmpeg(), "-nostdin", "-loglevel", "error", "-y", "-threads", "1",
+            "-i", str(source),
+            "-vn", "-ac", "1", "-c:a", "libopus", "-b:a", settings.RECORDING_COLD_BITRATE, "-application", "voip",
+            "-f", "ogg", str(partial),
+        ]
+        try:
+            subprocess.run(command, check=True, capture_output=True, timeout=TRANSCODE_TIMEOUT_SECONDS)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+            stderr = getattr(e, "stderr", None)
+            detail = stderr.decode(errors="replace").strip() if stderr else str(e)
+            logger.warning(f"Transcoding {source.name} failed: {detail}")
+            partial.unlink(missing_ok=True)
+            return detail or type(e).__name__
+        os.replace(partial, target)
+        return None
+
+    def usage(self, db: Session, user_id: int) -> Dict[str, Any]:
+        """Recording count and bytes per tier for one user"""
+        rows = (
+            db.query(
+                RecordingStorage.tier,
+                func.count(),
+                func.coalesce(func.sum(RecordingStorage.size_bytes), 0),
+                func.coalesce(func.sum(RecordingStorage.original_size_bytes), 0)
+            )
+            .filter(RecordingStorage.user_id == user_id)
+            .group_by(RecordingStorage.tier)
+            .all()
+        )
+        return _summarize(rows)
+
+    def totals(self, db: Session, limit: int = 20) -> Dict[str, Any]:
+        """Usage across all users, with the users storing the most bytes"""
+        rows = (
+            db.query(
+                RecordingStorage.tier,
+                func.count(),
+                func.coalesce(func.sum(RecordingStorage.size_bytes), 0),
+                func.coalesce(func.sum(RecordingStorage.original_size_bytes), 0)
+            )
+            .group_by(RecordingStorage.tier)
+            .all()
+        )
+        stored = func.sum(RecordingStorage.size_bytes).label("stored_bytes")
+        top_users = (
+            db.query(RecordingStorage.user_id, func.count(), stored)
+            .group_by(RecordingStorage.user_id)
+            .order_by(stored.desc())
+            .limit(limit)
+            .all()
+        )
+        return {
+            **_summarize(rows),
+            "top_users": [
+                {"user_id": user_id, "recordings": count, "stored_bytes": int(stored_bytes or 0)}
+                for user_id, count, stored_bytes in top_users
+            ],
+        }
+
+
+def _summarize(rows) -> Dict[str, Any]:
+    """Fold (tier, count, bytes, original bytes) rows into per-tier and overall totals"""
+    tiers = {tier: {"recordings": 0, "bytes": 0} for tier in TIERS}
+    original = 0
+    for tier, count, size, original_size in rows:
+        tiers.setdefault(tier, {"recordings": 0, "bytes": 0})
+        tiers[tier]["recordings"] = count
+        tiers[tier]["bytes"] = int(size)
+        original += int(original_size)
+    return {
+        "recordings": sum(tier["recordings"] for tier in tiers.values()),
+        "stored_bytes": sum(tier["bytes"] for tier in tiers.values()),
+        "uploaded_bytes": original,
+        "tiers": tiers,
+    }
+
+
+recording_store = RecordingStore(settings.UPLOAD_DIR, settings.ALLOWED_AUDIO_FORMATS)
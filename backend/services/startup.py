@@ -0,0 +1,129 @@
+"""
+Startup-time reporting.
+
+Records how long the app takes to import, to start, to warm up and to
+serve its first request. Set STARTUP_IMPORT_TIMING=1 to also time each
+module import (similar to python -X importtime, but queryable at runtime).
+
+Only depends on the standard library so it can be imported first.
+"""
+import os
+import sys
+import time
+from importlib.abc import Loader, MetaPathFinder
+from typing import Any, Dict, List, Optional, Tuple
+
+_process_start = time.perf_counter()
+
+
+class _TimedLoader(Loader):
+    """Wraps a module loader and records cumulative exec time"""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.timings[module.__name__] = time.perf_counter() - start
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportTimer(MetaPathFinder):
+    """Meta path finder recording cumulative import time per module"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+class StartupReport:
+    """Collects startup phase timings"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.warmup_steps: Dict[str, float] = {}
+        self.first_request: Optional[Tuple[str, float]] = None
+        self.warm = False
+        self.import_timer: Optional[ImportTimer] = None
+
+    def mark(self, phase: str):
+        """Record seconds elapsed since this module was first imported"""
+        self.phases[phase] = time.perf_counter() - _process_start
+
+    def record_step(self, name: str, seconds: float):
+        self.warmup_steps[name] = seconds
+
+    def slowest_imports(self, limit: int = 25) -> List[Dict[str, Any]]:
+        if self.import_timer is None:
+            return []
+        timings = sorted(self.import_timer.timings.items(), key=lambda item: item[1], reverse=True)
+        return [
+            {"module": name, "cumulative_ms": round(seconds * 1000, 2)}
+            for name, seconds in timings[:limit]
+        ]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "warm": self.warm,
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()},
+            "warmup_steps_ms": {name: round(seconds * 1000, 2) for name, seconds in self.warmup_steps.items()},
+            "first_request": {
+                "path": self.first_request[0],
+                "latency_ms": round(self.first_request[1] * 1000, 2),
+            } if self.first_request else None,
+            "slowest_imports": self.slowest_imports(),
+        }
+
+
+class FirstRequestMiddleware:
+    """ASGI middleware recording the latency of the first HTTP request"""
+
+    def __init__(self, app, report: StartupReport):
+        self.app = app
+        self.report = report
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.report.first_request is not None:
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if self.report.first_request is None:
+                self.report.first_request = (scope["path"], time.perf_counter() - start)
+                self.report.mark("first_request_done")
+
+
+startup_report = StartupReport()
+
+if os.environ.get("STARTUP_IMPORT_TIMING", "").lower() in ("1", "true"):
+    startup_report.import_timer = ImportTimer()
+    startup_report.import_timer.install()
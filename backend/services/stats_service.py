@@ -0,0 +1,183 @@
+"""
+Incrementally maintained per-user progress rollups.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from models.database import UserStats, UserProgress, VocabularyPractice
+
+# Mastery level at which a word counts as mastered
+MASTERED_LEVEL = 4
+
+
+def empty_stats() -> dict:
+    """Column values of a user with no activity yet"""
+    return {
+        "books_started": 0,
+        "books_completed": 0,
+        "total_time_spent": 0,
+        "total_score": 0,
+        "words_practiced": 0,
+        "words_mastered": 0,
+        "mastery_counts": [0] * 6,
+        "current_streak": 0,
+        "longest_streak": 0,
+    }
+
+
+class UserStatsService:
+    """
+    Applies deltas to UserStats rows.
+
+    Callers own the transaction: changes are added to the session and
+    committed together with the progress or practice write that caused them.
+    Counters are updated in SQL (SET x = x + delta) so concurrent writes
+    from other workers are not lost.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_or_create(self, user_id: int) -> UserStats:
+        """Get the stats row for a user, creating an empty one if missing"""
+        stats = self.db.get(UserStats, user_id)
+        if stats is None:
+            # Another worker may be creating the same row
+            self.db.execute(
+                insert(UserStats)
+                .values(user_id=user_id, **empty_stats())
+                .on_conflict_do_nothing(index_elements=["user_id"])
+            )
+            stats = self.db.get(UserStats, user_id)
+        return stats
+
+    def _increment(self, stats: UserStats, **deltas):
+        """Add deltas to counters in SQL; the new values load on next access"""
+        for name, delta in deltas.items():
+            if delta:
+                setattr(stats, name, getattr(UserStats, name) + delta)
+
+    def record_activity(self, stats: UserStats, when: Optional[datetime] = None):
+        """Advance the daily streak for activity at the given time"""
+        today = (when or datetime.utcnow()).date()
+        last = stats.last_active_date
+        if last == today:
+            return
+        if last == today - timedelta(days=1):
+            stats.current_streak += 1
+        else:
+            stats.current_streak = 1
+        stats.longest_streak = max(stats.longest_streak, stats.current_streak)
+        stats.last_active_date = today
+
+    def record_progress(
+        self,
+        user_id: int,
+        old_status: Optional[str],
+        new_status: str,
+        time_delta: int,
+        score_delta: int = 0
+    ) -> UserStats:
+        """
+        Apply a progress change for one book.
+
+        Args:
+            user_id: User ID
+            old_status: Previous status, or None if the progress row is new
+            new_status: Status after the write
+            time_delta: Change in time_spent (seconds)
+            score_delta: Change in score
+        """
+        stats = self.get_or_create(user_id)
+
+        was_started = old_status in ("in_progress", "completed")
+        is_started = new_status in ("in_progress", "completed")
+        self._increment(
+            stats,
+            books_started=int(is_started) - int(was_started),
+            books_completed=int(new_status == "completed") - int(old_status == "completed"),
+            total_time_spent=time_delta,
+            total_score=score_delta,
+        )
+
+        self.record_activity(stats)
+        self.db.flush([stats])
+        return stats
+
+    def record_mastery(
+        self,
+        user_id: int,
+        old_level: Optional[int],
+        new_level: int
+    ) -> UserStats:
+        """
+        Apply a mastery level change for one word.
+
+        Args:
+            user_id: User ID
+            old_level: Previous mastery level, or None for a first practice
+            new_level: Mastery level after the write
+        """
+        stats = self.get_or_create(user_id)
+
+        if old_level != new_level:
+            # Shift one word between mastery_counts slots in place
+            counts = UserStats.mastery_counts
+            changes = [] if old_level is None else [(old_level, -1)]
+            changes.append((new_level, 1))
+            for level, delta in changes:
+                path = f"$[{level}]"
+                counts = func.json_set(counts, path, func.json_extract(UserStats.mastery_counts, path) + delta)
+            stats.mastery_counts = counts
+
+        was_mastered = old_level is not None and old_level >= MASTERED_LEVEL
+        self._increment(
+            stats,
+            words_practiced=int(old_level is None),
+            words_mastered=int(new_level >= MASTERED_LEVEL) - int(was_mastered),
+        )
+
+        self.record_activity(stats)
+        self.db.flush([stats])
+        return stats
+
+    def rebuild(self, user_id: int) -> UserStats:
+        """
+        Recompute a user's counters from UserProgress and VocabularyPractice.
+
+        Streaks cannot be reconstructed from current rows and are kept.
+        """
+        stats = self.get_or_create(user_id)
+
+        progress = (
+            self.db.query(
+                func.count(UserProgress.id).filter(UserProgress.status.in_(("in_progress", "completed"))),
+                func.count(UserProgress.id).filter(UserProgress.status == "completed"),
+                func.coalesce(func.sum(UserProgress.time_spent), 0),
+                func.coalesce(func.sum(UserProgress.score), 0),
+            )
+            .filter(UserProgress.user_id == user_id)
+            .one()
+        )
+        (
+            stats.books_started,
+            stats.books_completed,
+            stats.total_time_spent,
+            stats.total_score,
+        ) = progress
+
+        counts = [0] * 6
+        rows = (
+            self.db.query(VocabularyPractice.mastery_level, func.count(VocabularyPractice.id))
+            .filter(VocabularyPractice.user_id == user_id)
+            .group_by(VocabularyPractice.mastery_level)
+            .all()
+        )
+        for level, count in rows:
+            counts[level or 0] += count
+        stats.mastery_counts = counts
+        stats.words_practiced = sum(counts)
+        stats.words_mastered = sum(counts[MASTERED_LEVEL:])
+        return stats
@@ -0,0 +1,142 @@
+"""
+Delta sync for offline-capable clients.
+
+A sync returns only the rows changed since the client's cursor, using the
+indexed change timestamps (Lesson.updated_at, VocabularyItem.updated_at,
+UserProgress.last_accessed, VocabularyPractice.last_practiced).
+Deactivated lessons are returned as tombstones so clients can drop them.
+
+Responses are paged: each carries at most SYNC_PAGE_SIZE rows per kind,
+newest ID first. While has_more is set, the cursor points at the next
+page of the same sync; after the last page it is a timestamp cursor for
+the next delta, so rows changed while paging are sent then.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, NamedTuple, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from models.database import Lesson, UserProgress, VocabularyItem, VocabularyPractice
+from config import settings
+
+
+class SyncPosition(NamedTuple):
+    since: Optional[datetime]  # None for a full sync
+    started: Optional[datetime]  # Start of a paged sync, shared by its pages
+    after: Dict[str, int]  # Last ID sent per kind
+
+
+def encode_cursor(timestamp: datetime) -> str:
+    return base64.urlsafe_b64encode(timestamp.isoformat().encode()).decode()
+
+
+def _encode_page_cursor(position: SyncPosition) -> str:
+    state = {
+        "since": position.since.isoformat() if position.since else None,
+        "started": position.started.isoformat(),
+        "after": position.after,
+    }
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> SyncPosition:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        if not raw.startswith("{"):
+            return SyncPosition(datetime.fromisoformat(raw), None, {})
+        state = json.loads(raw)
+        return SyncPosition(
+            datetime.fromisoformat(state["since"]) if state["since"] else None,
+            datetime.fromisoformat(state["started"]),
+            {kind: int(last_id) for kind, last_id in state["after"].items()}
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError(f"Invalid sync cursor: {cursor}")
+
+
+class SyncService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def changes(self, user_id: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Collect one page of everything that changed for a user since a cursor.
+
+        The final cursor lags the sync start by SYNC_CURSOR_OVERLAP_SECONDS,
+        so rows committed by transactions still in flight during this sync
+        are picked up next time. Rows in the overlap may be sent twice;
+        clients apply them idempotently.
+
+        Raises:
+            ValueError: If the cursor cannot be decoded
+        """
+        position = decode_cursor(cursor) if cursor else SyncPosition(None, None, {})
+        since = position.since
+        started = position.started or datetime.utcnow()
+
+        queries = {
+            "lessons": (Lesson.id, self.db.query(Lesson)),
+            "vocabulary": (VocabularyItem.id, (
+                self.db.query(VocabularyItem)
+                .outerjoin(Lesson, VocabularyItem.lesson_id == Lesson.id)
+                .filter(or_(VocabularyItem.lesson_id.is_(None), Lesson.is_active.is_(True)))
+            )),
+            "progress": (UserProgress.id, self.db.query(UserProgress).filter(UserProgress.user_id == user_id)),
+            "practice": (VocabularyPractice.id, (
+                self.db.query(VocabularyPractice).filter(VocabularyPractice.user_id == user_id)
+            )),
+        }
+        if since is None:
+            queries["lessons"] = (Lesson.id, queries["lessons"][1].filter(Lesson.is_active.is_(True)))
+        else:
+            filters = {
+                "lessons": Lesson.updated_at >= since,
+                "vocabulary": VocabularyItem.updated_at >= since,
+                "progress": UserProgress.last_accessed >= since,
+                "practice": VocabularyPractice.last_practiced >= since,
+            }
+            queries = {kind: (id_column, query.filter(filters[kind])) for kind, (id_column, query) in queries.items()}
+
+        # Keyset pagination on ID, newest first
+        page_size = settings.SYNC_PAGE_SIZE
+        after = dict(position.after)
+        rows = {}
+        has_more = False
+        for kind, (id_column, query) in queries.items():
+            if kind in after:
+                query = query.filter(id_column < after[kind])
+            page = query.order_by(id_column.desc()).limit(page_size + 1).all()
+            if len(page) > page_size:
+                page = page[:page_size]
+                has_more = True
+            if page:
+                after[kind] = page[-1].id
+            rows[kind] = page
+
+        if since is None:
+            lessons = rows["lessons"]
+            deleted_lesson_ids = []
+        else:
+            lessons = [lesson for lesson in rows["lessons"] if lesson.is_active]
+            deleted_lesson_ids = [lesson.id for lesson in rows["lessons"] if not lesson.is_active]
+
+        if has_more:
+            next_cursor = _encode_page_cursor(SyncPosition(since, started, after))
+        else:
+            next_timestamp = started - timedelta(seconds=settings.SYNC_CURSOR_OVERLAP_SECONDS)
+            if since is not None:
+                next_timestamp = max(next_timestamp, since)
+            next_cursor = encode_cursor(next_timestamp)
+
+        return {
+            "cursor": next_cursor,
+            "full": since is None and not position.after,
+            "has_more": has_more,
+            "lessons": lessons,
+            "deleted_lesson_ids": deleted_lesson_ids,
+            "vocabulary": rows["vocabulary"],
+            "progress": rows["progress"],
+            "practice": rows["practice"],
+        }
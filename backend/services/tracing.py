@@ -0,0 +1,132 @@
+"""
+Per-request span timing and slow-request tracing.
+
+A trace is attached to the request context; DB, inference and
+serialization code record spans into it. Requests slower than
+SLOW_REQUEST_THRESHOLD_MS are logged as structured JSON.
+"""
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+from fastapi.responses import JSONResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+
+class Trace:
+    """Accumulated span durations for one request"""
+    __slots__ = ("spans",)
+
+    def __init__(self):
+        self.spans: Dict[str, list] = {}  # name -> [seconds, count]
+
+    def add(self, name: str, seconds: float):
+        span = self.spans.get(name)
+        if span is None:
+            self.spans[name] = [seconds, 1]
+        else:
+            span[0] += seconds
+            span[1] += 1
+
+
+def record_span(name: str, seconds: float):
+    """Add a span to the current request's trace, if one is active"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+@contextmanager
+def span(name: str):
+    """Time a block as a span of the current request's trace"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start)
+
+
+class TracedJSONResponse(JSONResponse):
+    """JSONResponse that records its rendering time as a serialization span"""
+
+    def render(self, content) -> bytes:
+        with span("serialization"):
+            return super().render(content)
+
+
+class TracingMiddleware:
+    """ASGI middleware that logs span breakdowns for slow requests"""
+
+    def __init__(self, app, threshold_ms: float = 500):
+        self.app = app
+        self.threshold = threshold_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        trace = Trace()
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            _current_trace.reset(token)
+            if duration >= self.threshold:
+                self._log(scope, status_code, duration, trace)
+
+    def _log(self, scope, status_code: int, duration: float, trace: Trace):
+        accounted = sum(seconds for seconds, _ in trace.spans.values())
+        route = scope.get("route")
+        logger.warning(json.dumps({
+            "event": "slow_request",
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "spans": {
+                name: {"duration_ms": round(seconds * 1000, 2), "count": count}
+                for name, (seconds, count) in trace.spans.items()
+            },
+            "other_ms": round(max(0.0, duration - accounted) * 1000, 2),
+        }))
+
+
+def instrument_engine(engine):
+    """Attach SQLAlchemy event listeners recording DB spans"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("trace_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["trace_query_start"].pop()
+        record_span("db", time.perf_counter() - start)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        starts = context.connection.info.get("trace_query_start") if context.connection else None
+        if starts:
+            record_span("db", time.perf_counter() - starts.pop())
@@ -0,0 +1,59 @@
+"""
+In-process LRU cache for translation results.
+Avoids repeated ML inference for the same text and language pair.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Any, Optional, Tuple
+from config import settings
+
+
+class TranslationCache:
+    """Bounded LRU cache keyed by (text, source_lang, target_lang)"""
+
+    def __init__(self, max_size: int = 10000):
+        """
+        Initialize translation cache.
+
+        Args:
+            max_size: Maximum number of cached translations
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str, source_lang: str, target_lang: str) -> Optional[Dict[str, Any]]:
+        """Return a cached translation result, or None on miss"""
+        key = (text, source_lang, target_lang)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def set(self, text: str, source_lang: str, target_lang: str, result: Dict[str, Any]):
+        """Store a translation result, evicting the least recently used entry if full"""
+        key = (text, source_lang, target_lang)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+translation_cache = TranslationCache(max_size=settings.TRANSLATION_CACHE_SIZE)
@@ -0,0 +1,106 @@
+"""
+Translation model routing.
+
+Chooses the model(s) for a language pair instead of assuming a
+Helsinki-NLP opus-mt model exists for every pair:
+    1. A direct model from TRANSLATION_DIRECT_PAIRS
+    2. The multilingual model, if configured and it covers both languages
+    3. Two hops through the pivot language (e.g. pl -> en -> uk)
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence
+from config import settings
+
+
+class UnsupportedLanguagePairError(ValueError):
+    """Raised when no model or pivot route covers a language pair"""
+
+
+class TranslationHop(NamedTuple):
+    model: str
+    source_lang: str
+    target_lang: str
+    multilingual: bool  # Model needs src_lang/tgt_lang arguments
+
+
+class TranslationRouter:
+    """Maps language pairs to a sequence of translation hops"""
+
+    def __init__(
+        self,
+        direct_pairs: Sequence[str],
+        model_prefix: str,
+        pivot_lang: str = "en",
+        model_overrides: Optional[Dict[str, str]] = None,
+        multilingual_model: Optional[str] = None,
+        multilingual_langs: Sequence[str] = ()
+    ):
+        """
+        Initialize translation router.
+
+        Args:
+            direct_pairs: "src-tgt" pairs with a dedicated model
+            model_prefix: Prefix for dedicated model names ({prefix}-{src}-{tgt})
+            pivot_lang: Language to pivot through when no direct model exists
+            model_overrides: "src-tgt" -> model name for models not following the prefix scheme
+            multilingual_model: Optional model serving many pairs (e.g. facebook/m2m100_418M)
+            multilingual_langs: Languages the multilingual model covers; empty means all
+        """
+        self.model_prefix = model_prefix
+        self.pivot_lang = pivot_lang
+        self.models: Dict[str, str] = {pair: f"{model_prefix}-{pair}" for pair in direct_pairs}
+        self.models.update(model_overrides or {})
+        self.multilingual_model = multilingual_model
+        self.multilingual_langs = set(multilingual_langs)
+
+    def _direct(self, source_lang: str, target_lang: str) -> Optional[TranslationHop]:
+        model = self.models.get(f"{source_lang}-{target_lang}")
+        return TranslationHop(model, source_lang, target_lang, False) if model else None
+
+    def _covered_by_multilingual(self, *langs: str) -> bool:
+        return bool(self.multilingual_model) and (
+            not self.multilingual_langs or all(lang in self.multilingual_langs for lang in langs)
+        )
+
+    def route(self, source_lang: str, target_lang: str) -> List[TranslationHop]:
+        """
+        Get the hops translating source_lang to target_lang.
+
+        Returns:
+            Hops to apply in order; empty when the languages are the same
+
+        Raises:
+            UnsupportedLanguagePairError: If no route exists
+        """
+        if source_lang == target_lang:
+            return []
+
+        direct = self._direct(source_lang, target_lang)
+        if direct:
+            return [direct]
+
+        if self._covered_by_multilingual(source_lang, target_lang):
+            return [TranslationHop(self.multilingual_model, source_lang, target_lang, True)]
+
+        to_pivot = self._direct(source_lang, self.pivot_lang)
+        from_pivot = self._direct(self.pivot_lang, target_lang)
+        if to_pivot and from_pivot:
+            return [to_pivot, from_pivot]
+
+        raise UnsupportedLanguagePairError(
+            f"No translation model for {source_lang} -> {target_lang}"
+        )
+
+    def route_label(self, source_lang: str, target_lang: str) -> str:
+        """Name of the model(s) used for a pair, e.g. for metrics"""
+        hops = self.route(source_lang, target_lang)
+        return "+".join(hop.model for hop in hops) if hops else "identity"
+
+
+translation_router = TranslationRouter(
+    settings.TRANSLATION_DIRECT_PAIRS,
+    settings.TRANSLATION_MODEL_PREFIX,
+    settings.TRANSLATION_PIVOT_LANG,
+    settings.TRANSLATION_MODEL_OVERRIDES,
+    settings.TRANSLATION_MULTILINGUAL_MODEL,
+    settings.TRANSLATION_MULTILINGUAL_LANGS
+)
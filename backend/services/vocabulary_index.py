@@ -0,0 +1,216 @@
+"""
+In-memory vocabulary index for tap-to-translate lookups.
+Built from VocabularyItem at startup and refreshed incrementally:
+rows changed since the last refresh (by updated_at) are reloaded, and
+deleted rows are dropped.
+"""
+import re
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.database import VocabularyItem
+from services.audio_store import audio_store
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_EDGE_PUNCTUATION = re.compile(r"^[^\w]+|[^\w]+$", re.UNICODE)
+_VOWELS = set("aeiou")
+
+
+class VocabularyEntry(NamedTuple):
+    """Compact, immutable view of a VocabularyItem row"""
+    id: int
+    word: str
+    translation: str
+    pronunciation: Optional[str]
+    part_of_speech: Optional[str]
+    audio_url: Optional[str]  # Public URL, content-hashed when the entry was loaded
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase a word and strip surrounding punctuation and whitespace"""
+    word = word.strip().lower().replace("’", "'")
+    word = _EDGE_PUNCTUATION.sub("", word)
+    return " ".join(word.split())
+
+
+def candidate_forms(word: str) -> Iterator[str]:
+    """
+    Yield lookup keys for a word: the normalized form first, then
+    likely base forms obtained by stripping common English inflections.
+
+    This is a lightweight heuristic (no dictionary), so some candidates
+    are not real words; they simply miss the index.
+    """
+    base = normalize_word(word)
+    if not base:
+        return
+    yield base
+
+    if base.endswith("'s") or base.endswith("s'"):
+        yield base[:-2]
+
+    if len(base) <= 3 or " " in base:
+        return
+
+    if base.endswith("ies"):
+        yield base[:-3] + "y"
+    if base.endswith("es"):
+        yield base[:-2]
+    if base.endswith("s") and not base.endswith("ss"):
+        yield base[:-1]
+
+    for suffix in ("ing", "ed", "er", "est"):
+        if base.endswith(suffix) and len(base) - len(suffix) >= 2:
+            stem = base[:-len(suffix)]
+            yield stem
+            yield stem + "e"
+            # Doubled final consonant: stopped -> stop, running -> run
+            if len(stem) >= 3 and stem[-1] == stem[-2] and stem[-1] not in _VOWELS:
+                yield stem[:-1]
+            # y -> i: studied -> study, happier -> happy
+            if stem.endswith("i"):
+                yield stem[:-1] + "y"
+
+
+class VocabularyIndex:
+    """
+    Hash index from normalized word to vocabulary entries.
+
+    Lookups are a handful of dict probes (microseconds) and never touch
+    the database. Writers replace whole tuples under a lock, so readers
+    can run without locking.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[VocabularyEntry, ...]] = {}
+        self._keys: Dict[int, str] = {}  # Item id -> key it is indexed under
+        self._id_sum = 0  # Sum of indexed ids, compared with the table to detect deletes
+        self._synced_at: Optional[datetime] = None  # Newest updated_at loaded
+        self._last_refresh = 0.0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def is_built(self) -> bool:
+        return self._last_refresh > 0.0
+
+    def add(self, entry: VocabularyEntry):
+        """Insert or replace a single entry, moving it if its word changed"""
+        key = normalize_word(entry.word)
+        with self._lock:
+            self._discard(entry.id)
+            # Tracked even without a key, so the delete check counts every row
+            self._keys[entry.id] = key
+            self._id_sum += entry.id
+            if key:
+                existing = tuple(e for e in self._entries.get(key, ()) if e.id != entry.id)
+                self._entries[key] = existing + (entry,)
+
+    def remove(self, item_id: int):
+        """Drop an entry, e.g. for a deleted item"""
+        with self._lock:
+            self._discard(item_id)
+
+    def _discard(self, item_id: int):
+        """Remove an entry by id; caller holds the lock"""
+        key = self._keys.pop(item_id, None)
+        if key is None:
+            return
+        self._id_sum -= item_id
+        if not key:
+            return
+        remaining = tuple(e for e in self._entries.get(key, ()) if e.id != item_id)
+        if remaining:
+            self._entries[key] = remaining
+        else:
+            self._entries.pop(key, None)
+
+    def add_item(self, item: VocabularyItem):
+        """Insert or replace an entry from an ORM VocabularyItem"""
+        self.add(VocabularyEntry(
+            item.id, item.word, item.translation,
+            item.pronunciation, item.part_of_speech, audio_store.public_url(item.audio_url)
+        ))
+
+    def build(self, db: Session):
+        """Rebuild the index from scratch"""
+        with self._lock:
+            self._entries = {}
+            self._keys = {}
+            self._id_sum = 0
+            self._synced_at = None
+        count = self.refresh(db)
+        logger.info(f"Built vocabulary index with {count} items ({len(self._entries)} keys)")
+
+    def refresh(self, db: Session) -> int:
+        """
+        Load vocabulary items added or edited since the last refresh and drop deleted ones.
+
+        Edits are found by updated_at, looking back SYNC_CURSOR_OVERLAP_SECONDS
+        past the newest row loaded so rows committed late are not missed.
+        Deletes are detected by comparing the row count and id sum with the
+        index, so the full id list is only read when something was deleted.
+
+        Returns:
+            Number of items loaded or removed
+        """
+        query = db.query(
+            VocabularyItem.id,
+            VocabularyItem.word,
+            VocabularyItem.translation,
+            VocabularyItem.pronunciation,
+            VocabularyItem.part_of_speech,
+            VocabularyItem.audio_url,
+            VocabularyItem.updated_at,
+        )
+        if self._synced_at is not None:
+            overlap = timedelta(seconds=settings.SYNC_CURSOR_OVERLAP_SECONDS)
+            query = query.filter(VocabularyItem.updated_at >= self._synced_at - overlap)
+        rows = query.order_by(VocabularyItem.id).all()
+        for *fields, audio_url, updated_at in rows:
+            # Hash audio now so lookups never stat or read the file
+            self.add(VocabularyEntry(*fields, audio_store.public_url(audio_url)))
+            if updated_at and (self._synced_at is None or updated_at > self._synced_at):
+                self._synced_at = updated_at
+
+        removed = 0
+        count, id_sum = db.query(func.count(VocabularyItem.id), func.coalesce(func.sum(VocabularyItem.id), 0)).one()
+        if (count, id_sum) != (len(self._keys), self._id_sum):
+            present = {item_id for (item_id,) in db.query(VocabularyItem.id)}
+            for item_id in [item_id for item_id in self._keys if item_id not in present]:
+                self.remove(item_id)
+                removed += 1
+
+        self._last_refresh = time.monotonic()
+        return len(rows) + removed
+
+    def maybe_refresh(self, db: Session, min_interval: float) -> int:
+        """Refresh incrementally if at least min_interval seconds have passed"""
+        if time.monotonic() - self._last_refresh < min_interval:
+            return 0
+        return self.refresh(db)
+
+    def lookup(self, word: str) -> Tuple[Optional[str], List[VocabularyEntry]]:
+        """
+        Find entries for a word, trying inflection-stripped forms in order.
+
+        Returns:
+            (matched key, entries), or (None, []) on miss
+        """
+        entries = self._entries
+        for key in candidate_forms(word):
+            found = entries.get(key)
+            if found:
+                return key, list(found)
+        return None, []
+
+
+vocabulary_index = VocabularyIndex()
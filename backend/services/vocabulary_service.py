@@ -0,0 +1,139 @@
+"""
+Vocabulary business logic.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Any
+from sqlalchemy.orm import Session
+from models.database import VocabularyPractice
+from models.schemas import VocabularyPracticeCreate
+from services.leaderboard import leaderboards, stats_snapshot
+from services.ml_base import MLInferenceService
+from services.recommender import recommender
+from services.stats_service import UserStatsService
+from services.translation_cache import translation_cache
+from services.vocabulary_index import vocabulary_index, normalize_word
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class VocabularyService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def lookup(
+        self,
+        word: str,
+        ml_service: MLInferenceService,
+        source_lang: str = settings.VOCABULARY_SOURCE_LANG,
+        target_lang: str = settings.VOCABULARY_TRANSLATION_LANG
+    ) -> Dict[str, Any]:
+        """
+        Look up a tapped word for instant translation.
+
+        Resolution order:
+            1. In-memory vocabulary index (includes inflected forms)
+            2. Translation cache
+            3. ML translation service (result is cached)
+
+        Returns:
+            Lookup result with a "source" field: index, cache or model
+        """
+        normalized = normalize_word(word)
+
+        # The index only holds VOCABULARY_SOURCE_LANG words translated to VOCABULARY_TRANSLATION_LANG
+        if source_lang == settings.VOCABULARY_SOURCE_LANG and target_lang == settings.VOCABULARY_TRANSLATION_LANG:
+            key, entries = vocabulary_index.lookup(normalized)
+            if not entries and await asyncio.to_thread(
+                vocabulary_index.maybe_refresh, self.db, settings.VOCAB_INDEX_REFRESH_SECONDS
+            ):
+                key, entries = vocabulary_index.lookup(normalized)
+
+            if entries:
+                entry = entries[0]
+                return {
+                    "word": word,
+                    "lemma": key,
+                    "translation": entry.translation,
+                    "pronunciation": entry.pronunciation,
+                    "part_of_speech": entry.part_of_speech,
+                    "audio_url": entry.audio_url,
+                    "vocabulary_id": entry.id,
+                    "source": "index",
+                }
+
+        source = "cache"
+        result = translation_cache.get(normalized, source_lang, target_lang)
+        if result is None:
+            source = "model"
+            result = await ml_service.translate(normalized, source_lang, target_lang)
+            translation_cache.set(normalized, source_lang, target_lang, result)
+
+        return {
+            "word": word,
+            "lemma": normalized,
+            "translation": result["translated_text"],
+            "pronunciation": None,
+            "part_of_speech": None,
+            "audio_url": None,
+            "vocabulary_id": None,
+            "source": source,
+        }
+
+    def record_practice(self, practice_data: VocabularyPracticeCreate) -> VocabularyPractice:
+        """
+        Record a practice attempt and schedule the next review.
+
+        Without an explicit mastery_level, a correct answer raises mastery
+        by one and an incorrect answer lowers it by one. The user's rollups
+        are updated in the same transaction.
+        """
+        now = datetime.utcnow()
+        practice = (
+            self.db.query(VocabularyPractice)
+            .filter(
+                VocabularyPractice.user_id == practice_data.user_id,
+                VocabularyPractice.vocabulary_id == practice_data.vocabulary_id
+            )
+            .first()
+        )
+
+        if practice:
+            old_level = practice.mastery_level or 0
+        else:
+            old_level = None
+            practice = VocabularyPractice(
+                user_id=practice_data.user_id,
+                vocabulary_id=practice_data.vocabulary_id,
+                correct_count=0,
+                incorrect_count=0,
+                mastery_level=0
+            )
+            self.db.add(practice)
+
+        if practice_data.correct:
+            practice.correct_count += 1
+        else:
+            practice.incorrect_count += 1
+
+        if practice_data.mastery_level is not None:
+            new_level = practice_data.mastery_level
+        elif practice_data.correct:
+            new_level = min(5, (old_level or 0) + 1)
+        else:
+            new_level = max(0, (old_level or 0) - 1)
+
+        practice.mastery_level = new_level
+        practice.last_practiced = now
+        practice.next_review = now + timedelta(days=2 ** new_level)
+
+        stats = UserStatsService(self.db).record_mastery(practice_data.user_id, old_level, new_level)
+        snapshot = stats_snapshot(stats)
+
+        self.db.commit()
+        self.db.refresh(practice)
+        leaderboards.record(self.db, practice_data.user_id, snapshot)
+        recommender.invalidate(practice_data.user_id)
+        return practice
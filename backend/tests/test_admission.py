@@ -0,0 +1,34 @@
+"""
+Admission control for ML inference.
+"""
+import asyncio
+from services import admission
+from services.admission import AdmissionControlledMLService
+from services.ml_stub import StubMLService
+from services.translation_router import TranslationHop
+
+
+def test_pivot_translation_holds_a_slot_on_each_model(monkeypatch):
+    hops = {
+        ("de", "fr"): [TranslationHop("opus-de-en", "de", "en", False), TranslationHop("opus-en-fr", "en", "fr", False)],
+    }
+    monkeypatch.setattr(admission.translation_router, "route", lambda source, target: hops[(source, target)])
+    service = AdmissionControlledMLService(StubMLService(latency_ms=0))
+    active = {}
+
+    async def translate(text, source_lang, target_lang):
+        active.update({name: gate.active for name, gate in service.gates.items()})
+        return {"translated_text": text}
+
+    service.service.translate = translate
+    asyncio.run(service.translate("Hallo", "de", "fr"))
+
+    assert active == {"opus-de-en": 1, "opus-en-fr": 1}
+    assert {name: gate.active for name, gate in service.gates.items()} == {"opus-de-en": 0, "opus-en-fr": 0}
+
+
+def test_endpoint_limited_to_zero_is_always_rejected():
+    limiter = admission.RateLimiter(60, 20, {"translate": 0})
+
+    assert limiter.check("translate", "10.0.0.1") == admission.BLOCKED_RETRY_AFTER
+    assert limiter.check("vocabulary_lookup", "10.0.0.1") == 0
@@ -0,0 +1,40 @@
+"""
+Sentence segmentation for chapter translation.
+"""
+import pytest
+from services.document_translation import segment_sentences
+
+
+def sentences(text):
+    return [text[start:end] for start, end in segment_sentences(text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("She said no. He left.", ["She said no.", "He left."]),
+    ("Page no. 5 is missing. Fine.", ["Page no. 5 is missing.", "Fine."]),
+    ("Plan A. Plan B.", ["Plan A.", "Plan B."]),
+    ("Plan A. Then we left.", ["Plan A.", "Then we left."]),
+    ("Choose option a. Next step.", ["Choose option a.", "Next step."]),
+    ("J. R. R. Tolkien wrote it. He died.", ["J. R. R. Tolkien wrote it.", "He died."]),
+    ("I met J. Smith today. It rained.", ["I met J. Smith today.", "It rained."]),
+    ("Mr. Brown came, e.g. on Monday. Dr. Who left.", ["Mr. Brown came, e.g. on Monday.", "Dr. Who left."]),
+])
+def test_segment_sentences(text, expected):
+    assert sentences(text) == expected
+
+
+def test_paragraph_break_ends_sentence():
+    assert sentences("No full stop\n\nNext paragraph") == ["No full stop", "Next paragraph"]
+
+
+def test_store_skips_only_conflicting_sentences(db):
+    from models.database import SentenceTranslation
+    from services.document_translation import DocumentTranslationService
+
+    service = DocumentTranslationService(db)
+    service._store({"Hello.": "Cześć."}, "en", "pl", "m")
+    # A concurrent request already stored "Hello."; "Bye." must still be saved
+    service._store({"Hello.": "Witaj.", "Bye.": "Pa."}, "en", "pl", "m")
+
+    stored = dict(db.query(SentenceTranslation.source_text, SentenceTranslation.translated_text))
+    assert stored == {"Hello.": "Cześć.", "Bye.": "Pa."}
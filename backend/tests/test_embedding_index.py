@@ -0,0 +1,52 @@
+"""
+Embedding index refresh.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from api.routes.search import _hydrate
+from models.database import Lesson
+from services.embedding_index import EmbeddingIndex, KIND_LESSON
+from services.ml_stub import StubMLService
+from config import settings
+
+
+class RealModelStub(StubMLService):
+    """Stub vectors labelled as the real text model"""
+
+    @property
+    def embedding_model(self) -> str:
+        return settings.TEXT_MODEL
+
+
+def test_index_built_in_stub_mode_is_rebuilt_for_the_real_model(db, tmp_path):
+    db.add(Lesson(id=1, title="Cats", description="About cats", level="beginner", content={"text": "Cats purr."}))
+    db.commit()
+    index = EmbeddingIndex(str(tmp_path / "index"))
+
+    counts = asyncio.run(index.refresh(db, StubMLService(latency_ms=0)))
+    assert counts["embedded"] > 0
+    manifest = json.loads((tmp_path / "index" / "manifest.json").read_text())
+    assert manifest["model"] == f"stub:{settings.TEXT_MODEL}"
+
+    # Nothing changed, but the vectors came from another model: everything is re-embedded
+    counts = asyncio.run(index.refresh(db, RealModelStub(latency_ms=0)))
+    assert counts["embedded"] > 0
+    manifest = json.loads((tmp_path / "index" / "manifest.json").read_text())
+    assert manifest["model"] == settings.TEXT_MODEL
+
+
+def test_hits_from_a_lesson_edited_since_embedding_are_dropped(db, tmp_path):
+    db.add(Lesson(id=1, title="Cats", description="About cats", level="beginner", content={"text": "Cats purr."}))
+    db.commit()
+    index = EmbeddingIndex(str(tmp_path / "index"))
+    asyncio.run(index.refresh(db, StubMLService(latency_ms=0)))
+
+    hits = index.search(index.source_vector(KIND_LESSON, 1), 5)
+    assert [match.text for match in _hydrate(db, hits)]
+
+    lesson = db.get(Lesson, 1)
+    lesson.content = {"text": "Dogs bark loudly at night."}
+    lesson.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.commit()
+    assert _hydrate(db, hits) == []
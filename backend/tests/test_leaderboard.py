@@ -0,0 +1,25 @@
+"""
+Leaderboard sync across worker processes.
+"""
+from datetime import datetime, timedelta
+from models.database import User, UserStats
+from services.leaderboard import Leaderboards
+
+
+def test_sync_sees_rows_stamped_before_the_watermark_but_committed_after(db):
+    now = datetime.utcnow()
+    db.add_all([
+        User(id=1, username="alice", native_language="es", target_language="en"),
+        User(id=2, username="bob", native_language="es", target_language="en"),
+        UserStats(user_id=1, total_score=10, updated_at=now),
+    ])
+    db.commit()
+    boards = Leaderboards()
+    boards.load(db)
+
+    # Another worker stamped this row a moment before the first row but committed it later
+    db.add(UserStats(user_id=2, total_score=20, updated_at=now - timedelta(seconds=1)))
+    db.commit()
+    boards.sync(db)
+
+    assert boards.board("score").top(2) == [(2, 20), (1, 10)]
@@ -0,0 +1,15 @@
+"""
+Prometheus exposition.
+"""
+from services import metrics
+
+
+def test_every_sample_is_labelled_with_its_worker(monkeypatch):
+    monkeypatch.setattr(metrics, "_worker", "2")
+    registry = metrics.Registry()
+    counter = registry.register(metrics.Counter("jobs", "Jobs run", ["kind"]))
+    registry.register(metrics.Gauge("depth", "Queue depth", callback=lambda: 4))
+    counter.labels("sync").inc()
+
+    samples = [line for line in registry.expose().splitlines() if not line.startswith("#")]
+    assert samples == ['jobs_total{worker="2",kind="sync"} 1.0', 'depth{worker="2"} 4']
@@ -0,0 +1,23 @@
+"""
+ML service factory.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from services.ml_base import InferenceMode
+from services.ml_factory import MLServiceFactory
+
+
+def test_racing_callers_share_one_service():
+    MLServiceFactory.reset()
+    barrier = Barrier(8)
+
+    def create(_):
+        barrier.wait()
+        return MLServiceFactory.get_service(mode=InferenceMode.STUB)
+
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            services = list(pool.map(create, range(8)))
+        assert len({id(service) for service in services}) == 1
+    finally:
+        MLServiceFactory.reset()
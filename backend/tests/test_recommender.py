@@ -0,0 +1,59 @@
+"""
+Book recommendations from vocabulary overlap.
+"""
+from models.database import Lesson, User, UserProgress, VocabularyItem, VocabularyPractice
+from services.recommender import Recommender
+
+
+def _add_book(db, lesson_id, level, words):
+    db.add(Lesson(id=lesson_id, title=f"Book {lesson_id}", level=level, content={}))
+    items = [VocabularyItem(word=word, translation=word, lesson_id=lesson_id) for word in words]
+    db.add_all(items)
+    db.flush()
+    return items
+
+
+def _library(db):
+    db.add(User(id=1, username="alice", native_language="es", target_language="en", level="beginner"))
+    known = _add_book(db, 1, "beginner", ["a", "b", "c", "d"])
+    _add_book(db, 2, "intermediate", ["A", "b", "e", "f"])
+    _add_book(db, 3, "beginner", ["a", "b", "c", "g"])
+    _add_book(db, 4, "beginner", [])
+    _add_book(db, 5, "advanced", ["x", "y"])
+    db.add_all([VocabularyPractice(user_id=1, vocabulary_id=item.id, mastery_level=5) for item in known[:3]])
+    db.add(UserProgress(user_id=1, lesson_id=3, status="completed"))
+    db.commit()
+
+
+def test_books_ranked_by_distance_from_target_coverage(db):
+    _library(db)
+    recommender = Recommender(target_coverage=0.7)
+    recommender.build(db)
+
+    results = recommender.recommend(db, 1)
+
+    # Book 3 is completed and book 4 has no vocabulary
+    assert [(r["lesson_id"], r["coverage"], r["new_words"]) for r in results] == [
+        (1, 0.75, 1),
+        (2, 0.5, 2),
+        (5, 0.0, 2),
+    ]
+    # Book 1 also gets the bonus for matching the learner's level
+    assert [r["score"] for r in results] == [1.05, 0.8, 0.3]
+    assert [r["lesson_id"] for r in recommender.recommend(db, 1, limit=2)] == [1, 2]
+    assert [r["lesson_id"] for r in recommender.recommend(db, 1, level="intermediate")] == [2]
+
+
+def test_refresh_picks_up_edited_words(db):
+    _library(db)
+    recommender = Recommender(target_coverage=0.7)
+    recommender.build(db)
+    assert not recommender.refresh(db)
+
+    item = db.query(VocabularyItem).filter(VocabularyItem.word == "e").one()
+    item.word = "c"
+    db.commit()
+
+    assert recommender.refresh(db)
+    book = next(r for r in recommender.recommend(db, 1) if r["lesson_id"] == 2)
+    assert book["coverage"] == 0.75
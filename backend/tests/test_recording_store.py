@@ -0,0 +1,87 @@
+"""
+Tiered recording storage maintenance.
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+from models.database import PronunciationRecording, User
+from services.recording_store import RecordingStore, MAX_TRANSCODE_ATTEMPTS, TIER_COLD, TIER_HOT, TIER_MISSING
+from config import settings
+
+
+def _fake_ffmpeg(tmp_path: Path, output_bytes: int, fail: bool = False) -> str:
+    """A stand-in ffmpeg writing output_bytes to its last argument"""
+    script = tmp_path / "ffmpeg"
+    body = "echo 'bad input' >&2; exit 1" if fail else f'for a; do last=$a; done; head -c {output_bytes} /dev/zero > "$last"'
+    script.write_text(f"#!/bin/sh\n{body}\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_unfound_legacy_file_is_missing_not_purged(db, tmp_path):
+    root = tmp_path / "audio"
+    root.mkdir()
+    outside = tmp_path / "elsewhere.wav"
+    outside.write_bytes(b"x" * 100)
+    db.add(User(id=1, username="learner", native_language="pl", target_language="en"))
+    db.add(PronunciationRecording(id=1, user_id=1, audio_path=str(outside)))
+    db.add(PronunciationRecording(id=2, user_id=1, audio_path="later.wav"))
+    db.commit()
+    store = RecordingStore(str(root), [".wav", ".ogg"])
+
+    store.maintain(db)
+    recordings = {r.id: r for r in db.query(PronunciationRecording)}
+    assert [recordings[i].storage.tier for i in (1, 2)] == [TIER_MISSING, TIER_MISSING]
+    assert outside.exists()
+
+    # The file turns up (e.g. the volume is mounted again) and is adopted
+    (root / "later.wav").write_bytes(b"y" * 50)
+    store.maintain(db)
+    db.expire_all()
+    storage = db.get(PronunciationRecording, 2).storage
+    assert (storage.tier, storage.size_bytes) == (TIER_HOT, 50)
+    assert (root / db.get(PronunciationRecording, 2).audio_path).is_file()
+
+
+@pytest.mark.parametrize("output_bytes, fail, tier, attempts", [
+    (100, False, TIER_COLD, 0),
+    (None, True, TIER_HOT, 1),
+    (5000, False, TIER_HOT, MAX_TRANSCODE_ATTEMPTS),
+])
+def test_tier_changes_only_after_a_successful_transcode(db, tmp_path, monkeypatch, output_bytes, fail, tier, attempts):
+    monkeypatch.setattr(settings, "FFMPEG_PATH", _fake_ffmpeg(tmp_path, output_bytes or 0, fail))
+    root = tmp_path / "audio"
+    root.mkdir()
+    upload = root / "upload.part"
+    upload.write_bytes(b"x" * 1000)
+    db.add(User(id=1, username="learner", native_language="pl", target_language="en"))
+    db.commit()
+    store = RecordingStore(str(root), [".wav", ".ogg"])
+    recording = store.save(db, 1, upload, ".wav")
+    recording.storage.stored_at = datetime.utcnow() - timedelta(days=settings.RECORDING_COLD_AFTER_DAYS + 1)
+    db.commit()
+
+    store.maintain(db)
+    db.expire_all()
+    storage = db.get(PronunciationRecording, recording.id).storage
+    assert (storage.tier, storage.transcode_attempts) == (tier, attempts)
+    assert storage.size_bytes == (output_bytes if tier == TIER_COLD else 1000)
+    assert (storage.transcode_error is None) == (tier == TIER_COLD)
+
+
+def test_audio_url_uses_the_hash_stored_at_upload(db, tmp_path):
+    from api.routes.recordings import _audio_url
+
+    root = tmp_path / "audio"
+    root.mkdir()
+    upload = root / "upload.part"
+    upload.write_bytes(b"x" * 1000)
+    db.add(User(id=1, username="learner", native_language="pl", target_language="en"))
+    db.commit()
+    store = RecordingStore(str(root), [".wav", ".ogg"])
+    recording = store.save(db, 1, upload, ".wav")
+    assert recording.storage.content_hash
+
+    # Built from the row alone: the file is not read on the request path
+    (root / recording.audio_path).unlink()
+    assert _audio_url(recording).endswith(f"/audio/{recording.audio_path}?v={recording.storage.content_hash}")
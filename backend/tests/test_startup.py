@@ -0,0 +1,75 @@
+"""
+Startup-time regression tests.
+
+Each test starts a fresh interpreter so import costs are measured cold.
+Override the budget with STARTUP_BUDGET_SECONDS on slow CI machines.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "3.0"))
+
+# Must not be imported until first use or background warm-up
+LAZY_MODULES = ["huggingface_hub", "aiohttp", "transformers", "torch", "services.ml_api", "services.ml_local"]
+
+
+def run_python(code: str, tmp_path: Path) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp_path / 'startup.db'}",
+        DEBUG="false",
+        WARMUP_ML_SERVICE="false",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture
+def import_report(tmp_path):
+    code = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+    return run_python(code, tmp_path)
+
+
+def test_import_within_budget(import_report):
+    assert import_report["seconds"] < STARTUP_BUDGET_SECONDS
+
+
+def test_heavy_dependencies_are_lazy(import_report):
+    loaded = set(import_report["modules"])
+    assert [name for name in LAZY_MODULES if name in loaded] == []
+
+
+def test_health_served_within_budget(tmp_path):
+    code = """
+import json, time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+import main
+with TestClient(main.app) as client:
+    status = client.get("/health").status_code
+    elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "status": status}))
+"""
+    report = run_python(code, tmp_path)
+    assert report["status"] == 200
+    assert report["seconds"] < STARTUP_BUDGET_SECONDS
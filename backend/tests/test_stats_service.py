@@ -0,0 +1,51 @@
+"""
+Per-user stats rollups.
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from api.routes.progress import get_progress_summary
+from models.database import User, UserStats
+from services.stats_service import UserStatsService
+
+
+def test_concurrent_counter_updates_are_not_lost(db):
+    db.add(User(id=1, username="alice", native_language="es", target_language="en"))
+    db.commit()
+    UserStatsService(db).get_or_create(1)
+    db.commit()
+
+    # Two workers load the same row, then write one after the other
+    other = Session(bind=db.get_bind())
+    try:
+        first, second = UserStatsService(db), UserStatsService(other)
+        loaded = first.get_or_create(1), second.get_or_create(1)  # Held so the sessions keep their copies
+
+        first.record_progress(1, None, "completed", time_delta=60, score_delta=80)
+        first.record_mastery(1, None, 4)
+        db.commit()
+        second.record_progress(1, None, "in_progress", time_delta=30)
+        second.record_mastery(1, 4, 5)
+        other.commit()
+    finally:
+        other.close()
+
+    stats = db.get(UserStats, 1)
+    db.refresh(stats)
+    assert (stats.books_started, stats.books_completed) == (2, 1)
+    assert (stats.total_time_spent, stats.total_score) == (90, 80)
+    assert stats.words_practiced == 1
+    assert stats.words_mastered == 1
+    assert stats.mastery_counts == [0, 0, 0, 0, 0, 1]
+
+
+def test_summary_reads_never_write(db):
+    with pytest.raises(HTTPException) as error:
+        get_progress_summary(user_id=999, db=db)
+    assert error.value.status_code == 404
+
+    db.add(User(id=1, username="alice", native_language="es", target_language="en"))
+    db.commit()
+    summary = get_progress_summary(user_id=1, db=db)["data"]
+    assert (summary["books_completed"], summary["mastery_counts"]) == (0, [0] * 6)
+    assert db.query(UserStats).count() == 0
@@ -0,0 +1,66 @@
+"""
+Offline progress upload and delta sync.
+"""
+from datetime import datetime, timedelta
+from models.database import Lesson, User, VocabularyItem
+from models.schemas import OfflineProgressUpdate
+from services.progress_service import ProgressService
+from services.sync_service import SyncService, decode_cursor, encode_cursor
+from config import settings
+
+
+def _seed(db):
+    db.add(User(id=1, username="learner", native_language="pl", target_language="en"))
+    db.add(Lesson(id=2, title="Book", level="beginner", content={"sections": []}))
+    db.commit()
+
+
+def test_out_of_order_uploads_keep_the_newest_edit(db):
+    _seed(db)
+    service = ProgressService(db)
+    now = datetime.utcnow()
+    older = OfflineProgressUpdate(lesson_id=2, status="in_progress", progress_percentage=30, updated_at=now - timedelta(minutes=10))
+    newer = OfflineProgressUpdate(lesson_id=2, status="in_progress", progress_percentage=60, updated_at=now - timedelta(minutes=5))
+
+    # Device A uploads its older edit first, then device B its newer one
+    applied, skipped = service.upload_offline_progress(1, [older])
+    assert [p.progress_percentage for p in applied] == [30] and skipped == []
+    applied, skipped = service.upload_offline_progress(1, [newer])
+    assert [p.progress_percentage for p in applied] == [60] and skipped == []
+
+    # A late re-upload of the older edit loses
+    applied, skipped = service.upload_offline_progress(1, [older])
+    assert applied == [] and skipped == [2]
+    progress = service.get_current_progress(1)
+    assert progress.progress_percentage == 60
+    assert progress.last_accessed > progress.client_updated_at
+
+
+def test_full_sync_is_paged_behind_the_cursor(db, monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_PAGE_SIZE", 2)
+    db.add_all([Lesson(id=i, title=f"Book {i}", level="beginner", content={}) for i in range(1, 6)])
+    db.commit()
+    service = SyncService(db)
+
+    pages = [service.changes(1)]
+    while pages[-1]["has_more"]:
+        pages.append(service.changes(1, pages[-1]["cursor"]))
+
+    assert [[lesson.id for lesson in page["lessons"]] for page in pages] == [[5, 4], [3, 2], [1]]
+    assert [page["full"] for page in pages] == [True, False, False]
+    # The last cursor is an ordinary delta cursor from the sync's start
+    position = decode_cursor(pages[-1]["cursor"])
+    assert position.since is not None and position.after == {}
+
+
+def test_edited_vocabulary_is_synced(db):
+    item = VocabularyItem(word="cat", translation="kot", created_at=datetime(2020, 1, 1))
+    db.add(item)
+    db.commit()
+    cursor = encode_cursor(datetime.utcnow() - timedelta(seconds=1))
+
+    item.translation = "kotek"
+    db.commit()
+
+    vocabulary = SyncService(db).changes(1, cursor)["vocabulary"]
+    assert [(v.word, v.translation) for v in vocabulary] == [("cat", "kotek")]
@@ -0,0 +1,48 @@
+"""
+Vocabulary index refresh and lookup.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from models.database import VocabularyItem
+from services import vocabulary_service
+from services.vocabulary_index import VocabularyIndex
+from services.vocabulary_service import VocabularyService
+from config import settings
+
+
+def test_refresh_picks_up_edits_and_deletes(db):
+    db.add_all([
+        VocabularyItem(id=1, word="cat", translation="kot"),
+        VocabularyItem(id=2, word="dog", translation="pies"),
+    ])
+    db.commit()
+    index = VocabularyIndex()
+    index.build(db)
+
+    cat = db.get(VocabularyItem, 1)
+    cat.word, cat.translation = "kitten", "kotek"
+    cat.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.delete(db.get(VocabularyItem, 2))
+    db.commit()
+    index.refresh(db)
+
+    assert index.lookup("cat") == (None, [])
+    assert index.lookup("dog") == (None, [])
+    key, entries = index.lookup("kitten")
+    assert (key, [entry.translation for entry in entries]) == ("kitten", ["kotek"])
+
+
+def test_lookup_uses_the_index_only_for_its_language_pair(db, monkeypatch):
+    db.add(VocabularyItem(id=1, word="gift", translation="prezent"))
+    db.commit()
+    index = VocabularyIndex()
+    index.build(db)
+    monkeypatch.setattr(vocabulary_service, "vocabulary_index", index)
+    monkeypatch.setattr(vocabulary_service.translation_cache, "get", lambda *args: {"translated_text": "poison"})
+    service = VocabularyService(db)
+
+    english = asyncio.run(service.lookup("gift", None, settings.VOCABULARY_SOURCE_LANG))
+    german = asyncio.run(service.lookup("gift", None, "de"))
+
+    assert (english["source"], english["translation"]) == ("index", "prezent")
+    assert (german["source"], german["translation"]) == ("cache", "poison")
@@ -4,9 +4,9 @@
  * Story: 1.1 Library Screen with Book Grid
  */
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
-import { Book, APIResponse } from '../types/book';
+import { Book, APIResponse, SyncResponse, SyncProgress } from '../types/book';
 
 const API_BASE_URL = 'http://localhost:8000/api/v1';
 const CURRENT_USER_ID = 1; // Hardcoded for MVP
@@ -25,51 +25,71 @@ export function useBooks(): UseBooksReturn {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<Error | null>(null);
 
+  // Synced state; refetch() only asks for changes since the cursor
+  const cursor = useRef<string | null>(null);
+  const lessons = useRef(new Map<number, Omit<Book, 'progress'>>());
+  const progress = useRef(new Map<number, SyncProgress>());
+
   const fetchBooks = async () => {
     try {
       setLoading(true);
       setError(null);
 
-      // Fetch all books
-      const booksResponse = await axios.get<APIResponse<Book[]>>(
-        `${API_BASE_URL}/lessons`
-      );
-
-      if (!booksResponse.data.success) {
-        throw new Error('Failed to fetch books');
-      }
-
-      const booksData = booksResponse.data.data;
+      // Large syncs arrive in pages; keep going until has_more is false
+      let hasMore = true;
+      let fullSync = false;
+      while (hasMore) {
+        const cursorParam = cursor.current ? `&cursor=${encodeURIComponent(cursor.current)}` : '';
+        const syncResponse = await axios.get<APIResponse<SyncResponse>>(
+          `${API_BASE_URL}/sync?user_id=${CURRENT_USER_ID}${cursorParam}`
+        );
 
-      // Fetch current reading progress
-      let currentBookId: number | null = null;
-      let progressPercentage = 0;
+        if (!syncResponse.data.success) {
+          throw new Error('Failed to fetch books');
+        }
 
-      try {
-        const progressResponse = await axios.get(
-          `${API_BASE_URL}/progress/current?user_id=${CURRENT_USER_ID}`
-        );
+        const changes = syncResponse.data.data;
 
-        if (progressResponse.data.success && progressResponse.data.data) {
-          currentBookId = progressResponse.data.data.lessonId;
-          progressPercentage = progressResponse.data.data.progressPercentage;
+        if (changes.full) {
+          lessons.current.clear();
+          progress.current.clear();
+          fullSync = true;
         }
-      } catch (progressError) {
-        // No current book in progress - not an error
-        console.log('No book in progress');
+
+        // Pages and new books come newest first: a full sync appends older
+        // pages, a delta puts new books in front
+        const added = changes.lessons.filter(lesson => !lessons.current.has(lesson.id));
+        const ordered = fullSync ? [...lessons.current.values(), ...added] : [...added, ...lessons.current.values()];
+        const merged = new Map(ordered.map(lesson => [lesson.id, lesson]));
+        changes.lessons.forEach(lesson => merged.set(lesson.id, lesson));
+        changes.deleted_lesson_ids.forEach(id => {
+          merged.delete(id);
+          progress.current.delete(id);
+        });
+        lessons.current = merged;
+
+        changes.progress.forEach(item => progress.current.set(item.lesson_id, item));
+        cursor.current = changes.cursor;
+        hasMore = changes.has_more;
       }
 
-      // Merge progress data with books
-      const booksWithProgress = booksData.map(book => ({
-        ...book,
-        progress: book.id === currentBookId ? progressPercentage : 0,
-      }));
+      // Flatten progress data onto books
+      const booksWithProgress = [...lessons.current.values()].map(book => {
+        const bookProgress = progress.current.get(book.id);
+        return {
+          ...book,
+          progress: bookProgress?.progress_percentage ?? 0,
+          lastAccessed: bookProgress?.last_accessed,
+        };
+      });
 
       setBooks(booksWithProgress);
 
-      // Set current book if exists
-      const current = booksWithProgress.find(b => b.id === currentBookId) || null;
-      setCurrentBook(current);
+      // Current book is the most recently accessed one in progress
+      const current = [...progress.current.values()]
+        .filter(item => item.status === 'in_progress' && lessons.current.has(item.lesson_id))
+        .sort((a, b) => b.last_accessed.localeCompare(a.last_accessed))[0];
+      setCurrentBook(booksWithProgress.find(b => b.id === current?.lesson_id) || null);
 
     } catch (err) {
       setError(err as Error);
@@ -42,6 +42,28 @@ export interface Filter {
   label: string;
 }
 
+// Per-book progress (GET /library, GET /sync)
+export interface BookProgress {
+  status: 'not_started' | 'in_progress' | 'completed';
+  progress_percentage: number;
+  time_spent: number;
+  last_accessed: string;
+}
+
+// Sync endpoint types (GET /sync)
+export interface SyncProgress extends BookProgress {
+  lesson_id: number;
+}
+
+export interface SyncResponse {
+  cursor: string;
+  full: boolean;
+  has_more: boolean;
+  lessons: Omit<Book, 'progress'>[];
+  deleted_lesson_ids: number[];
+  progress: SyncProgress[];
+}
+
 // API Response types
 export interface APIResponse<T> {
   success: boolean;
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Generate a large synthetic dataset for performance testing.
+
+Builds production-like volumes with realistic skew: book popularity and
+word frequency follow Zipf distributions, per-user activity is heavy
+tailed, practiced words come from the books a user reads, and books are
+long multi-chapter texts. UserStats rollups are written to match the
+generated rows, so no rebuild is needed afterwards.
+
+Rows are appended after the highest existing IDs; use a fresh
+DATABASE_URL to keep test data apart from real data.
+
+Usage:
+    DATABASE_URL=sqlite:///./data/loadtest.db python scripts/generate_dataset.py
+    python scripts/generate_dataset.py --users 500000 --books 5000 --seed 7
+"""
+import argparse
+import random
+import sys
+import time
+from bisect import bisect
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import func, insert
+from db.session import engine, init_db
+from models.database import User, Lesson, VocabularyItem, UserProgress, VocabularyPractice, UserStats
+from services.stats_service import MASTERED_LEVEL
+from config import settings
+
+LEVELS = ["beginner", "intermediate", "advanced"]
+CATEGORIES = ["fiction", "adventure", "mystery", "science", "history", "biography", "conversation", "grammar"]
+NATIVE_LANGUAGES = ["pl", "de", "es", "fr", "it", "ru", "uk", "zh"]
+PARTS_OF_SPEECH = ["noun", "verb", "adjective", "adverb", "preposition", "interjection"]
+ONSETS = ["b", "c", "d", "f", "g", "h", "l", "m", "n", "p", "r", "s", "t", "w", "br", "ch", "sh", "st", "th", "tr"]
+NUCLEI = ["a", "e", "i", "o", "u", "ea", "ee", "ai", "ou", "oo"]
+CODAS = ["", "", "n", "r", "t", "s", "d", "ll", "ng", "ck"]
+
+
+class ZipfSampler:
+    """Draws ranks 0..n-1 with probability proportional to 1 / (rank + 1) ** exponent"""
+
+    def __init__(self, n: int, exponent: float, rng: random.Random):
+        self.rng = rng
+        self.cumulative = list(accumulate(1 / (rank + 1) ** exponent for rank in range(n)))
+
+    def draw(self) -> int:
+        return bisect(self.cumulative, self.rng.random() * self.cumulative[-1])
+
+
+def make_word_pool(size: int, rng: random.Random):
+    """Distinct pronounceable pseudo-words, most frequent first"""
+    words = set()
+    while len(words) < size:
+        syllables = rng.choice((1, 1, 2, 2, 2, 3))
+        words.add("".join(rng.choice(ONSETS) + rng.choice(NUCLEI) + rng.choice(CODAS) for _ in range(syllables)))
+    return sorted(words, key=len)
+
+
+def make_sentence(words, sampler: ZipfSampler, rng: random.Random) -> str:
+    sentence = " ".join(words[sampler.draw()] for _ in range(rng.randint(6, 20)))
+    return sentence[0].upper() + sentence[1:] + rng.choice((".", ".", ".", "!", "?"))
+
+
+def heavy_tailed_count(mean: float, rng: random.Random, cap: int) -> int:
+    """Mostly small counts with a few very active users"""
+    return min(int(rng.expovariate(1 / mean)) if mean > 0 else 0, cap)
+
+
+def insert_rows(conn, model, rows, batch_size: int):
+    for i in range(0, len(rows), batch_size):
+        conn.execute(insert(model), rows[i:i + batch_size])
+
+
+def generate(args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    start = time.perf_counter()
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        first_user, first_lesson, first_item = (
+            (conn.execute(func.max(model.id)).scalar() or 0) + 1 for model in (User, Lesson, VocabularyItem)
+        )
+        existing_names = {name for (name,) in conn.execute(User.__table__.select().with_only_columns(User.username))}
+
+        # ===== Books and vocabulary =====
+        words = make_word_pool(args.word_pool, rng)
+        word_sampler = ZipfSampler(len(words), 1.1, rng)
+        lessons, items = [], []
+        book_items = []  # (first vocabulary ID, count) per book
+        item_id = first_item
+        for b in range(args.books):
+            level = LEVELS[b % len(LEVELS)]
+            chapters = [
+                {
+                    "type": "chapter",
+                    "title": f"Chapter {c + 1}",
+                    "text": "\n\n".join(
+                        " ".join(make_sentence(words, word_sampler, rng) for _ in range(rng.randint(3, 8)))
+                        for _ in range(args.paragraphs_per_chapter)
+                    )
+                }
+                for c in range(args.chapters)
+            ]
+            created = now - timedelta(days=rng.randint(0, 730))
+            lessons.append({
+                "id": first_lesson + b,
+                "title": " ".join(words[word_sampler.draw()] for _ in range(rng.randint(2, 4))).title(),
+                "description": make_sentence(words, word_sampler, rng),
+                "level": level,
+                "category": rng.choice(CATEGORIES),
+                "content": {"sections": chapters},
+                "estimated_duration": args.chapters * rng.randint(10, 30),
+                "is_active": rng.random() > 0.02,
+                "created_at": created,
+                "updated_at": created + timedelta(days=rng.randint(0, 30)),
+            })
+
+            book_words = set()
+            target = min(heavy_tailed_count(args.words_per_book, rng, 4 * args.words_per_book) + 10, len(words))
+            while len(book_words) < target:
+                book_words.add(word_sampler.draw())
+            book_items.append((item_id, len(book_words)))
+            for w in book_words:
+                items.append({
+                    "id": item_id,
+                    "word": words[w],
+                    "translation": words[(w * 7919) % len(words)],
+                    "pronunciation": f"/{words[w]}/",
+                    "part_of_speech": rng.choice(PARTS_OF_SPEECH),
+                    "difficulty_level": level,
+                    "example_sentence": make_sentence(words, word_sampler, rng),
+                    "audio_url": None,
+                    "lesson_id": first_lesson + b,
+                    "created_at": created,
+                    "updated_at": created,
+                })
+                item_id += 1
+
+            if len(lessons) >= args.batch_size // 100 or b == args.books - 1:
+                insert_rows(conn, Lesson, lessons, args.batch_size)
+                insert_rows(conn, VocabularyItem, items, args.batch_size)
+                lessons, items = [], []
+        print(f"  {args.books} books, {item_id - first_item} vocabulary items")
+
+        # ===== Users, progress, practice and stats =====
+        book_sampler = ZipfSampler(args.books, 0.9, rng)
+        users, progress_rows, practice_rows, stats_rows = [], [], [], []
+        totals = {"progress": 0, "practice": 0}
+
+        def flush():
+            insert_rows(conn, User, users, args.batch_size)
+            insert_rows(conn, UserProgress, progress_rows, args.batch_size)
+            insert_rows(conn, VocabularyPractice, practice_rows, args.batch_size)
+            insert_rows(conn, UserStats, stats_rows, args.batch_size)
+            totals["progress"] += len(progress_rows)
+            totals["practice"] += len(practice_rows)
+            for rows in (users, progress_rows, practice_rows, stats_rows):
+                rows.clear()
+
+        for u in range(args.users):
+            user_id = first_user + u
+            joined = now - timedelta(days=rng.randint(1, 730))
+            username = f"learner_{user_id}"
+            if username in existing_names:
+                username = f"learner_{user_id}_{args.seed}"
+            users.append({
+                "id": user_id,
+                "username": username,
+                "native_language": rng.choice(NATIVE_LANGUAGES),
+                "target_language": "en",
+                "level": rng.choice(LEVELS),
+                "created_at": joined,
+                "last_active": joined + (now - joined) * rng.random(),
+            })
+
+            stats = {
+                "user_id": user_id, "books_started": 0, "books_completed": 0, "total_time_spent": 0,
+                "total_score": 0, "words_practiced": 0, "words_mastered": 0, "mastery_counts": [0] * 6,
+            }
+            books = set()
+            for _ in range(heavy_tailed_count(args.books_per_user, rng, args.books)):
+                books.add(book_sampler.draw())
+            for b in books:
+                status = rng.choices(("not_started", "in_progress", "completed"), (1, 5, 4))[0]
+                started = joined + (now - joined) * rng.random()
+                accessed = started + (now - started) * rng.random()
+                completed = status == "completed"
+                percentage = 100 if completed else (rng.randint(1, 99) if status == "in_progress" else 0)
+                time_spent = percentage * rng.randint(10, 60)
+                score = rng.randint(40, 100) if completed else None
+                progress_rows.append({
+                    "user_id": user_id,
+                    "lesson_id": first_lesson + b,
+                    "status": status,
+                    "progress_percentage": percentage,
+                    "score": score,
+                    "time_spent": time_spent,
+                    "started_at": started if status != "not_started" else None,
+                    "completed_at": accessed if completed else None,
+                    "last_accessed": accessed,
+                })
+                stats["books_started"] += status != "not_started"
+                stats["books_completed"] += completed
+                stats["total_time_spent"] += time_spent
+                stats["total_score"] += score or 0
+
+            # Practiced words come from the user's books
+            practiced = set()
+            book_list = list(books)
+            target = heavy_tailed_count(args.words_per_user, rng, 20 * args.words_per_user) if book_list else 0
+            for _ in range(target):
+                first, count = book_items[rng.choice(book_list)]
+                practiced.add(first + rng.randrange(count))
+            for vocabulary_id in practiced:
+                mastery = min(int(rng.expovariate(0.6)), 5)
+                practiced_at = joined + (now - joined) * rng.random()
+                practice_rows.append({
+                    "user_id": user_id,
+                    "vocabulary_id": vocabulary_id,
+                    "correct_count": mastery + rng.randint(0, 3),
+                    "incorrect_count": rng.randint(0, 3),
+                    "last_practiced": practiced_at,
+                    "next_review": practiced_at + timedelta(days=2 ** mastery),
+                    "mastery_level": mastery,
+                    "created_at": practiced_at,
+                })
+                stats["mastery_counts"][mastery] += 1
+            stats["words_practiced"] = len(practiced)
+            stats["words_mastered"] = sum(stats["mastery_counts"][MASTERED_LEVEL:])
+
+            streak = rng.choice((0, 0, 1, 2, 3, 5, 8, 13, 30))
+            stats.update({
+                "current_streak": streak,
+                "longest_streak": streak + rng.randint(0, 20),
+                "last_active_date": (now - timedelta(days=0 if streak else rng.randint(2, 60))).date(),
+                "updated_at": now,
+            })
+            stats_rows.append(stats)
+
+            if len(progress_rows) + len(practice_rows) >= args.batch_size:
+                flush()
+            if (u + 1) % 10000 == 0:
+                print(f"  {u + 1}/{args.users} users ({time.perf_counter() - start:.0f}s)")
+        flush()
+
+    print(
+        f"✓ Generated {args.users} users, {totals['progress']} progress rows and "
+        f"{totals['practice']} practice rows in {time.perf_counter() - start:.0f}s"
+    )
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--chapters", type=int, default=20, help="Chapters per book")
+    parser.add_argument("--paragraphs-per-chapter", type=int, default=15)
+    parser.add_argument("--words-per-book", type=int, default=300, help="Mean vocabulary items per book")
+    parser.add_argument("--word-pool", type=int, default=30000, help="Distinct words across all books")
+    parser.add_argument("--books-per-user", type=float, default=6, help="Mean books with progress per user")
+    parser.add_argument("--words-per-user", type=float, default=25, help="Mean practiced words per user")
+    parser.add_argument("--batch-size", type=int, default=20000, help="Rows per insert batch")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"Generating dataset in {settings.DATABASE_URL}...")
+    init_db()
+    generate(args)
+
+
+if __name__ == "__main__":
+    main()
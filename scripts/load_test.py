@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test against a running API server.
+
+Virtual users send a weighted mix of catalog, progress, practice and
+inference requests using IDs, words and passages sampled from the
+database the server uses. Reports throughput and per-route latency
+percentiles and error rates, and exits non-zero when the error rate is
+over --max-error-rate, so it can gate a release.
+
+Run the server against a generated dataset with the stub ML backend:
+    export DATABASE_URL=sqlite:///./data/loadtest.db
+    python scripts/generate_dataset.py --users 200000
+    (cd backend && INFERENCE_MODE=stub RATE_LIMIT_ENABLED=false DEBUG=false python serve.py --workers 4)
+    python scripts/load_test.py --users 50 --duration 60
+
+429 and 503 responses (rate limiting, load shedding) are reported as
+"shed", separately from errors. The full_sync scenario (a new device
+starting to download the whole catalog) is not in the default mix; add it with
+e.g. --mix "library=15,sync=8,full_sync=1,...".
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+import requests
+from sqlalchemy import func
+from db.session import SessionLocal
+from models.database import User, Lesson, VocabularyItem
+from services.document_translation import segment_sentences
+from services.embedding_index import lesson_text
+from services.sync_service import encode_cursor
+from config import settings
+
+SCENARIOS = (
+    "library", "sync", "full_sync", "summary", "progress", "practice", "lookup",
+    "leaderboard", "recommendations", "chapter", "search",
+)
+DEFAULT_MIX = (
+    "library=15,sync=8,summary=10,progress=15,practice=25,lookup=12,"
+    "leaderboard=5,recommendations=4,chapter=3,search=3"
+)
+SAMPLE_SIZE = 2000
+LEADERBOARD_METRICS = ["score", "time_spent", "words_mastered"]
+UNKNOWN_WORDS = ["serendipity", "quixotic", "ephemeral", "labyrinthine", "mellifluous", "sonder"]
+
+
+class Workload:
+    """
+    Sampled IDs and texts, and one request builder per scenario.
+
+    Builders return (method, route, request kwargs); "path" in the
+    kwargs overrides the route for parameterized paths.
+    """
+
+    def __init__(self):
+        db = SessionLocal()
+        try:
+            self.max_user_id = db.query(func.max(User.id)).scalar() or 0
+            self.lesson_ids = [
+                lesson_id for (lesson_id,) in
+                db.query(Lesson.id).filter(Lesson.is_active.is_(True)).order_by(func.random()).limit(SAMPLE_SIZE)
+            ]
+            self.vocabulary = db.query(VocabularyItem.id, VocabularyItem.word).order_by(
+                func.random()
+            ).limit(SAMPLE_SIZE).all()
+            self.passages = []
+            for lesson in db.query(Lesson).filter(Lesson.id.in_(self.lesson_ids[:20])):
+                text = lesson_text(lesson.title, lesson.description, lesson.content)
+                spans = segment_sentences(text)
+                for i in range(0, len(spans), 5):
+                    start, end = spans[i][0], spans[min(i + 4, len(spans) - 1)][1]
+                    self.passages.append(text[start:end])
+        finally:
+            db.close()
+
+        if not self.max_user_id or not self.lesson_ids or not self.vocabulary:
+            raise SystemExit("✗ The database has no users, lessons or vocabulary; run generate_dataset.py first")
+
+    def user_id(self, rng: random.Random) -> int:
+        return rng.randint(1, self.max_user_id)
+
+    def library(self, rng: random.Random):
+        return "GET", "/library", {"params": {"user_id": self.user_id(rng), "limit": 50}}
+
+    def sync(self, rng: random.Random):
+        # Apps sync incrementally; the cursor is from their last sync up to an hour ago
+        cursor = encode_cursor(datetime.utcnow() - timedelta(seconds=rng.randint(10, 3600)))
+        return "GET", "/sync", {"params": {"user_id": self.user_id(rng), "cursor": cursor}}
+
+    def full_sync(self, rng: random.Random):
+        # First sync on a new device: the first page of the whole catalog
+        return "GET", "/sync (full)", {"path": "/sync", "params": {"user_id": self.user_id(rng)}}
+
+    def summary(self, rng: random.Random):
+        return "GET", "/progress/summary", {"params": {"user_id": self.user_id(rng)}}
+
+    def progress(self, rng: random.Random):
+        percentage = rng.randint(1, 100)
+        return "POST", "/progress", {"json": {
+            "user_id": self.user_id(rng),
+            "lesson_id": rng.choice(self.lesson_ids),
+            "status": "completed" if percentage == 100 else "in_progress",
+            "progress_percentage": percentage,
+            "time_spent": percentage * 30,
+            "score": rng.randint(50, 100) if percentage == 100 else None,
+        }}
+
+    def practice(self, rng: random.Random):
+        vocabulary_id, _ = rng.choice(self.vocabulary)
+        return "POST", "/vocabulary/practice", {"json": {
+            "user_id": self.user_id(rng),
+            "vocabulary_id": vocabulary_id,
+            "correct": rng.random() < 0.7,
+        }}
+
+    def lookup(self, rng: random.Random):
+        # Mostly indexed words; the rest go through the translation cache or model
+        word = rng.choice(UNKNOWN_WORDS) if rng.random() < 0.1 else rng.choice(self.vocabulary)[1]
+        return "GET", "/vocabulary/lookup", {"params": {"word": word, "user_id": self.user_id(rng)}}
+
+    def leaderboard(self, rng: random.Random):
+        metric = rng.choice(LEADERBOARD_METRICS)
+        return "GET", "/leaderboards/{metric}", {"path": f"/leaderboards/{metric}", "params": {"limit": 20}}
+
+    def recommendations(self, rng: random.Random):
+        return "GET", "/recommendations", {"params": {"user_id": self.user_id(rng), "limit": 10}}
+
+    def chapter(self, rng: random.Random):
+        text = rng.choice(self.passages) if self.passages else "Hello there. How are you?"
+        return "POST", "/translation/chapter", {
+            "json": {"text": text, "source_lang": "en", "target_lang": settings.VOCABULARY_TRANSLATION_LANG},
+            "params": {"user_id": self.user_id(rng)},
+        }
+
+    def search(self, rng: random.Random):
+        if rng.random() < 0.5:
+            return "GET", "/search/passages", {"params": {"lesson_id": rng.choice(self.lesson_ids), "limit": 5}}
+        _, word = rng.choice(self.vocabulary)
+        return "GET", "/search/passages", {"params": {"q": word, "user_id": self.user_id(rng), "limit": 5}}
+
+
+def parse_mix(mix: str, workload: Workload):
+    scenarios, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"✗ Unknown scenario: {name} (choose from {', '.join(SCENARIOS)})")
+        scenarios.append(getattr(workload, name))
+        weights.append(float(weight or 1))
+    return scenarios, weights
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def run_user(base_url: str, scenarios, weights, seed: int, measure_from: float, deadline: float, results):
+    """One virtual user: its own connection pool and random stream"""
+    rng = random.Random(seed)
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        method, route, kwargs = rng.choices(scenarios, weights)[0](rng)
+        path = kwargs.pop("path", route)
+        start = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, timeout=30, **kwargs)
+            response.content  # Include the full body transfer
+            status = response.status_code
+        except requests.RequestException:
+            status = 0
+        elapsed = time.perf_counter() - start
+        if start >= measure_from:
+            results.append((f"{method} {route}", status, elapsed))
+
+
+def report(results, duration: float):
+    by_route = defaultdict(list)
+    for route, status, elapsed in results:
+        by_route[route].append((status, elapsed))
+
+    rows = []
+    for route in sorted(by_route):
+        samples = by_route[route]
+        latencies = sorted(elapsed * 1000 for _, elapsed in samples)
+        errors = sum(1 for status, _ in samples if status == 0 or (status >= 400 and status not in (429, 503)))
+        shed = sum(1 for status, _ in samples if status in (429, 503))
+        rows.append({
+            "route": route,
+            "requests": len(samples),
+            "rps": round(len(samples) / duration, 1),
+            "errors": errors,
+            "error_rate": round(errors / len(samples), 4),
+            "shed": shed,
+            "p50_ms": round(percentile(latencies, 0.50), 1),
+            "p90_ms": round(percentile(latencies, 0.90), 1),
+            "p99_ms": round(percentile(latencies, 0.99), 1),
+            "max_ms": round(latencies[-1], 1),
+        })
+
+    print(f"\n{'route':32} {'reqs':>7} {'rps':>7} {'err%':>6} {'shed':>5} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for row in rows:
+        print(
+            f"{row['route']:32} {row['requests']:>7} {row['rps']:>7} {row['error_rate'] * 100:>5.1f}% {row['shed']:>5} "
+            f"{row['p50_ms']:>8} {row['p90_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}"
+        )
+
+    total = len(results)
+    errors = sum(row["errors"] for row in rows)
+    summary = {
+        "requests": total,
+        "rps": round(total / duration, 1),
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+    }
+    print(f"\nTotal: {total} requests, {summary['rps']} req/s, {summary['error_rate'] * 100:.2f}% errors")
+    return {"summary": summary, "routes": rows}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=f"http://localhost:8000{settings.API_V1_PREFIX}", help="API base URL")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds of load before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Scenario weights, e.g. library=3,practice=1")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    workload = Workload()
+    scenarios, weights = parse_mix(args.mix, workload)
+    print(f"Load testing {args.url} with {args.users} users for {args.duration:.0f}s (+{args.warmup:.0f}s warm-up)...")
+
+    start = time.perf_counter()
+    measure_from = start + args.warmup
+    deadline = measure_from + args.duration
+    per_user = [[] for _ in range(args.users)]
+    threads = [
+        threading.Thread(
+            target=run_user,
+            args=(args.url, scenarios, weights, args.seed + i, measure_from, deadline, per_user[i]),
+            daemon=True
+        )
+        for i in range(args.users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result = report([sample for samples in per_user for sample in samples], args.duration)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+        print(f"Report written to {args.json}")
+
+    if result["summary"]["error_rate"] > args.max_error_rate:
+        print(f"✗ Error rate above {args.max_error_rate * 100:.1f}%")
+        sys.exit(1)
+    print("✓ Load test passed")
+
+
+if __name__ == "__main__":
+    main()
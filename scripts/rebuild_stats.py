@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Rebuild per-user stats rollups from UserProgress and VocabularyPractice.
+Reports users whose incrementally maintained counters had drifted.
+Running servers pick up the rebuilt values on their next leaderboard
+sync (every LEADERBOARD_SYNC_SECONDS); no restart is needed.
+
+Usage:
+    python scripts/rebuild_stats.py            # check and fix
+    python scripts/rebuild_stats.py --check    # only report drift
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+from db.session import SessionLocal, init_db
+from models.database import User
+from services.stats_service import UserStatsService
+
+COUNTERS = [
+    "books_started",
+    "books_completed",
+    "total_time_spent",
+    "total_score",
+    "words_practiced",
+    "words_mastered",
+    "mastery_counts",
+]
+
+
+def rebuild_stats(check_only: bool = False) -> int:
+    """
+    Recompute rollups for every user.
+
+    Returns:
+        Number of users whose stats had drifted
+    """
+    db = SessionLocal()
+    service = UserStatsService(db)
+    drifted = 0
+
+    try:
+        user_ids = [user_id for (user_id,) in db.query(User.id).order_by(User.id)]
+        for user_id in user_ids:
+            stats = service.get_or_create(user_id)
+            before = {name: getattr(stats, name) for name in COUNTERS}
+            service.rebuild(user_id)
+            after = {name: getattr(stats, name) for name in COUNTERS}
+
+            diff = {name: (before[name], after[name]) for name in COUNTERS if before[name] != after[name]}
+            if diff:
+                drifted += 1
+                changes = ", ".join(f"{name}: {old} -> {new}" for name, (old, new) in diff.items())
+                print(f"  user {user_id}: {changes}")
+
+        if check_only:
+            db.rollback()
+        else:
+            db.commit()
+
+        print(f"✓ Checked {len(user_ids)} users, {drifted} drifted")
+        if drifted and check_only:
+            print("  Run without --check to fix")
+        return drifted
+
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Error rebuilding stats: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Report drift without writing changes")
+    args = parser.parse_args()
+
+    init_db()
+    print("Rebuilding user stats..." if not args.check else "Checking user stats...")
+    drifted = rebuild_stats(check_only=args.check)
+    sys.exit(1 if drifted and args.check else 0)
+
+
+if __name__ == "__main__":
+    main()